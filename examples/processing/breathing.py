@@ -93,10 +93,10 @@ class BreathingProcessor:
         self.hist_plot_len = int(round(processing_config.hist_plot_len * self.f))
         self.breath_hist_len = max(2000, self.hist_plot_len)
 
-        self.peak_history = np.zeros(self.peak_hist_len, dtype="complex")
-        self.movement_history = np.zeros(self.peak_hist_len, dtype="float")
-        self.breath_history = np.zeros(self.breath_hist_len, dtype="float")
-        self.pulse_history = np.zeros(self.hist_plot_len, dtype="float")
+        self.peak_history = et.utils.RingBuffer(self.peak_hist_len, dtype="complex")
+        self.movement_history = et.utils.RingBuffer(self.peak_hist_len, dtype="float")
+        self.breath_history = et.utils.RingBuffer(self.breath_hist_len, dtype="float")
+        self.pulse_history = et.utils.RingBuffer(self.hist_plot_len, dtype="float")
 
         self.breath_sos = np.concatenate(butter(2, 2 * 0.3 / self.f))
         self.breath_zi = np.zeros((1, 2))
@@ -128,7 +128,7 @@ class BreathingProcessor:
 
             peak_idx = int(round(self.lp_peak_loc))
             peak = np.mean(self.lp_sweep[peak_idx - 50 : peak_idx + 50])
-            self.push(peak, self.peak_history)
+            self.peak_history.append(peak)
 
             delta = self.lp_sweep * np.conj(self.last_lp_sweep)
 
@@ -147,17 +147,20 @@ class BreathingProcessor:
             delta_dist = np.dot(weights, np.angle(delta))
             delta_dist *= 2.5 / (2.0 * pi * sum(weights + 0.00001))
 
-            y = self.movement_history[0] + delta_dist
-            self.push(y, self.movement_history)
+            y = self.movement_history[-1] + delta_dist
+            self.movement_history.append(y)
 
             y_breath, self.breath_zi = sosfilt(self.breath_sos, np.array([y]), zi=self.breath_zi)
-            self.push(y_breath, self.breath_history)
+            self.breath_history.append(y_breath[0])
 
             y_pulse, self.pulse_zi = sosfilt(self.pulse_sos, np.array([y]), zi=self.pulse_zi)
-            self.push(y_pulse, self.pulse_history)
+            self.pulse_history.append(y_pulse[0])
 
-            maxs = self.find_peaks(self.breath_history, 100)
-            mins = self.find_peaks(-self.breath_history, 100)
+            # Newest first
+            breath_history = self.breath_history.view()[::-1]
+
+            maxs = self.find_peaks(breath_history, 100)
+            mins = self.find_peaks(-breath_history, 100)
             max_idx = 0
             min_idx = 0
             inhale_time = None
@@ -201,18 +204,19 @@ class BreathingProcessor:
             else:
                 bpm_text = None
 
-            # Make an explicit copy, otherwise flip will not return a new object
-            breath_hist_plot = self.breath_history[: self.hist_plot_len]
-            breath_hist_plot = np.array(np.flip(breath_hist_plot, axis=0))
+            breath_hist_plot = self.breath_history[self.breath_hist_len - self.hist_plot_len :]
+            breath_hist_plot = breath_hist_plot.copy()
             breath_hist_plot -= (np.max(breath_hist_plot) + np.min(breath_hist_plot)) * 0.5
 
-            zoom_hist_plot = self.pulse_history[: self.hist_plot_len // 2]
-            zoom_hist_plot = np.array(np.flip(zoom_hist_plot, axis=0))
+            zoom_hist_plot = self.pulse_history[self.hist_plot_len - self.hist_plot_len // 2 :]
+            zoom_hist_plot = zoom_hist_plot.copy()
             zoom_hist_plot -= (max(zoom_hist_plot) + min(zoom_hist_plot)) * 0.5
 
+            peak_history = self.peak_history.view()[::-1]  # Newest first
+
             out_data = {
-                "peak_hist": self.peak_history[:100],
-                "peak_std_mm": 2.5 * np.std(np.unwrap(np.angle(self.peak_history))) / (2.0 * pi),
+                "peak_hist": peak_history[:100].copy(),
+                "peak_std_mm": 2.5 * np.std(np.unwrap(np.angle(peak_history))) / (2.0 * pi),
                 "env_ampl": abs(self.lp_sweep),
                 "env_delta": self.lp_phase_weights,
                 "peak_idx": peak_idx,
@@ -228,12 +232,6 @@ class BreathingProcessor:
     def lp(self, new, state, alpha):
         return alpha * state + (1 - alpha) * new
 
-    def push(self, val, arr):
-        res = np.empty_like(arr)
-        res[0] = val
-        res[1:] = arr[:-1]
-        arr[...] = res
-
     def find_peaks(self, env, width):
         n = len(env)
         peaks = np.zeros((0, 2))
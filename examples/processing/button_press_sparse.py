@@ -167,10 +167,15 @@ class ButtonPressProcessor:
 
         self.num_depths = num_depths
         self.f = sensor_config.update_rate
-        self.signal_history = np.zeros((int(round(self.f * HISTORY_LENGTH_S)), num_depths + 1))
-        self.average_history = np.zeros((int(round(self.f * HISTORY_LENGTH_S)), num_depths + 1))
-        self.trig_history = np.zeros((int(round(self.f * HISTORY_LENGTH_S)), num_depths + 1))
-        self.cool_down_history = np.zeros((int(round(self.f * HISTORY_LENGTH_S)), num_depths + 1))
+        # One row per frame, with the value of each depth followed by the max over depths
+        history_length = int(round(self.f * HISTORY_LENGTH_S))
+        self.signal_history = et.utils.RingBuffer(history_length, (num_depths + 1,))
+        self.average_history = et.utils.RingBuffer(history_length, (num_depths + 1,))
+        self.trig_history = et.utils.RingBuffer(history_length, (num_depths + 1,))
+        self.cool_down_history = et.utils.RingBuffer(history_length, (num_depths + 1,))
+
+        # The oldest values are plotted last, where the next frame will be
+        self.plot_order = np.roll(np.arange(history_length), -1)
 
         self.detection_history = []
         self.frame_count = 0
@@ -183,21 +188,21 @@ class ButtonPressProcessor:
 
         self.calibrated = 0  # Repeated sending of calibrated signal to exptool plot thread
 
-        self.chilled = [True] * num_depths
-        self.initialized = [False] * num_depths
+        self.chilled = np.full(num_depths, True)
+        self.initialized = False
 
         # Low pass trig
-        self.lp_trig = [0.0] * num_depths
-        self.lp_trig_const = [0.0] * num_depths
+        self.lp_trig = np.zeros(num_depths)
+        self.lp_trig_const = 0.0
 
         # Low pass cool down
-        self.lp_cool_down = [0.0] * num_depths
-        self.lp_cool_down_const = [0.0] * num_depths
+        self.lp_cool_down = np.zeros(num_depths)
+        self.lp_cool_down_const = 0.0
 
         # Low pass average
-        self.lp_average_const = [LP_AVERAGE_CONST_INIT] * num_depths
+        self.lp_average_const = np.full(num_depths, LP_AVERAGE_CONST_INIT)
 
-        self.lp_average = [0.0] * num_depths
+        self.lp_average = np.zeros(num_depths)
 
         self.update_processing_config(processing_config)
 
@@ -215,9 +220,8 @@ class ButtonPressProcessor:
         self.set_double_press_speed()
 
     def set_double_press_speed(self):
-        for i in range(self.num_depths):
-            self.lp_trig_const[i] = self.double_press_speed / DOUBLE_PRESS_RATIO
-            self.lp_cool_down_const[i] = self.double_press_speed
+        self.lp_trig_const = self.double_press_speed / DOUBLE_PRESS_RATIO
+        self.lp_cool_down_const = self.double_press_speed
 
     def set_sensitivity(self):
         """
@@ -230,114 +234,80 @@ class ButtonPressProcessor:
         self.threshold_trig = int(sens)
         self.threshold_cool_down = int(self.threshold_trig / THRESHOLD_RATIO)
 
-    def lp_cool_down_filter(self, data, index):
-        ret = int(
-            self.lp_cool_down_const[index] * self.lp_cool_down[index]
-            + (1.0 - self.lp_cool_down_const[index]) * data
+    @staticmethod
+    def lp_filter(lp_const, lp_value, data):
+        # The filtered values are truncated to integers
+        return np.trunc(lp_const * lp_value + (1.0 - lp_const) * data)
+
+    def calibrate(self):
+        # Update the lp_average constants based on the noise levels.
+        # The current frame will replace the oldest rows, which are used in its place.
+        num_rows = len(self.signal_history)
+        start = max(1, num_rows - self.calibration_limit + 1)
+        rows = np.append(np.arange(start, num_rows), 0)
+        average = self.average_history[rows, :-1]
+        signal = self.signal_history[rows, :-1]
+        max_diff = np.max(np.abs(average - signal), axis=0)
+
+        with np.errstate(divide="ignore"):
+            lp_new = (self.lp_average_const * self.noise_level_target) / max_diff
+
+        self.lp_average_const = np.where(
+            lp_new < LP_AVERAGE_CONST_MAX, lp_new, self.lp_average_const
         )
-        self.lp_cool_down[index] = ret
-        return ret
 
-    def lp_trig_filter(self, data, index):
-        ret = int(
-            self.lp_trig_const[index] * self.lp_trig[index]
-            + (1.0 - self.lp_trig_const[index]) * data
-        )
-        self.lp_trig[index] = ret
-        return ret
+    def detect(self, trig_vals, cool_down_vals):
+        # The depths are checked in order, so a depth only triggers if all depths before it are
+        # chilled after being checked, and all depths from it are chilled since the last frame.
+        above_trig = trig_vals > self.threshold_trig
+        chilled = (cool_down_vals < self.threshold_cool_down) | (self.chilled & ~above_trig)
 
-    def lp_average_filter(self, data, index):
-        ret = int(
-            self.lp_average_const[index] * self.lp_average[index]
-            + (1.0 - self.lp_average_const[index]) * data
-        )
-        self.lp_average[index] = ret
-        return ret
-
-    def calibrate(self, index):
-        # Update the lp_average constant based on the noise levels.
-        max_diff = max(
-            abs(
-                self.average_history[-self.calibration_limit :, index]
-                - self.signal_history[-self.calibration_limit :, index]
-            )
-        )
+        chilled_before = np.logical_and.accumulate(np.append(True, chilled[:-1]))
+        chilled_from = np.logical_and.accumulate(self.chilled[::-1])[::-1]
 
-        lp_new = (self.lp_average_const[index] * self.noise_level_target) / max_diff
-        if lp_new < LP_AVERAGE_CONST_MAX:
-            self.lp_average_const[index] = lp_new
+        self.chilled = chilled
 
-    def detect(self, trig_val, cool_down_val, index):
-        trig = False
-
-        if trig_val > self.threshold_trig:
-            if all(self.chilled):
-                trig = True
-            self.chilled[index] = False
-        if cool_down_val < self.threshold_cool_down:
-            self.chilled[index] = True
-
-        return trig
+        return above_trig & chilled_before & chilled_from
 
     def process(self, frame, data_info):
+        signal = frame.mean(axis=0)
 
-        detections = [False] * self.num_depths
-        signal = [0.0] * self.num_depths
-
-        for i in range(frame.shape[1]):
-
-            if not self.initialized[i]:
-                self.lp_average[i] = int(np.mean(frame[:, i], axis=0))
-                self.initialized[i] = True
-
-            signal[i] = np.mean(frame[:, i], axis=0)
-            self.signal_history[-1, -1] = max(self.signal_history[-1, :-1])
-
-            lp_average = self.lp_average_filter(signal[i], i)  # Low pass to smooth the signal
-            self.average_history[-1, -1] = max(self.average_history[-1, :-1])
-
-            diff = int(abs(lp_average - signal[i]))
-
-            if diff < self.noise_level_target:
-                diff = 0  # Get back to "detect" state asap
-
-            diff_sq = (
-                diff * diff
-            )  # Squaring yields a bit simpler behaviour with regards to thresholds.
-
-            trig_val = self.lp_trig_filter(diff_sq, i)
-            cool_down_val = self.lp_cool_down_filter(diff_sq, i)
-
-            # Triggering checks if it is considered a button press.
-            # Cool down checks if we can trigger again.
-            detection = self.detect(trig_val, cool_down_val, i)
-
-            if self.frame_count % self.recalibration_frame_period == self.calibration_limit:
-                self.calibrate(i)
-                self.calibrated = 5
+        if not self.initialized:
+            self.lp_average = np.trunc(signal)
+            self.initialized = True
 
-            if self.frame_count <= self.calibration_limit:
-                detection = False
+        # Low pass to smooth the signal
+        self.lp_average = self.lp_filter(self.lp_average_const, self.lp_average, signal)
 
-            self.signal_history[-1, i] = signal[i]
+        diff = np.trunc(np.abs(self.lp_average - signal))
+        diff[diff < self.noise_level_target] = 0  # Get back to "detect" state asap
 
-            self.average_history[-1, i] = lp_average
+        # Squaring yields a bit simpler behaviour with regards to thresholds.
+        diff_sq = diff * diff
 
-            self.trig_history[-1, i] = trig_val
+        self.lp_trig = self.lp_filter(self.lp_trig_const, self.lp_trig, diff_sq)
+        self.lp_cool_down = self.lp_filter(self.lp_cool_down_const, self.lp_cool_down, diff_sq)
 
-            self.cool_down_history[-1, i] = cool_down_val
+        # Triggering checks if it is considered a button press.
+        # Cool down checks if we can trigger again.
+        detections = self.detect(self.lp_trig, self.lp_cool_down)
 
-            detections[i] = detection
+        if self.frame_count % self.recalibration_frame_period == self.calibration_limit:
+            self.calibrate()
+            self.calibrated = 5
 
-        detection = any(detections)
-        self.cool_down_history[-1, -1] = max(self.cool_down_history[-1, :-1])
+        if self.frame_count <= self.calibration_limit:
+            detections[:] = False
 
-        self.trig_history[-1, -1] = max(self.trig_history[-1, :-1])
+        detection = bool(detections.any())
 
-        self.cool_down_history = np.roll(self.cool_down_history, -1, axis=0)
-        self.trig_history = np.roll(self.trig_history, -1, axis=0)
-        self.average_history = np.roll(self.average_history, -1, axis=0)
-        self.signal_history = np.roll(self.signal_history, -1, axis=0)
+        for history, values in [
+            (self.signal_history, signal),
+            (self.average_history, self.lp_average),
+            (self.trig_history, self.lp_trig),
+            (self.cool_down_history, self.lp_cool_down),
+        ]:
+            history.append(np.append(values, values.max()))
 
         if detection:
             self.detection_history.append(self.frame_count)
@@ -349,10 +319,10 @@ class ButtonPressProcessor:
             calibrated = False
 
         out_data = {
-            "signal_history": self.signal_history[:, -1],
-            "average_history": self.average_history[:, -1],
-            "trig_history": self.trig_history[:, -1],
-            "cool_down_history": self.cool_down_history[:, -1],
+            "signal_history": self.signal_history[self.plot_order, -1],
+            "average_history": self.average_history[self.plot_order, -1],
+            "trig_history": self.trig_history[self.plot_order, -1],
+            "cool_down_history": self.cool_down_history[self.plot_order, -1],
             "threshold": self.threshold_trig,
             "detection_history": (np.array(self.detection_history) - self.frame_count) / self.f,
             "detection": detection,
@@ -1,5 +1,4 @@
 from cmath import nan
-from copy import copy
 from enum import Enum
 from operator import truediv
 
@@ -184,23 +183,7 @@ class Processor:
         self.update_sc_threshold()
 
     def calculate_cfar_threshold(self, sweep, idx_cfar_pts, alpha, one_side):
-
-        threshold = np.full(sweep.shape, np.nan)
-
-        start_idx = np.max(idx_cfar_pts)
-        if one_side:
-            rel_indexes = -idx_cfar_pts
-            end_idx = sweep.size
-        else:
-            rel_indexes = np.concatenate((-idx_cfar_pts, +idx_cfar_pts), axis=0)
-            end_idx = sweep.size - start_idx
-
-        for idx in np.arange(start_idx, end_idx):
-            threshold[int(idx)] = (
-                1.0 / (alpha + 1e-10) * np.mean(sweep[(idx + rel_indexes).astype(int)])
-            )
-
-        return threshold
+        return et.detection.cfar_threshold(sweep, idx_cfar_pts, alpha, one_side)
 
     def find_first_point_above_threshold(self, sweep, threshold):
 
@@ -215,105 +198,16 @@ class Processor:
         return np.argmax(points_above)
 
     def find_peaks(self, sweep, threshold):
-        #  Not written for optimal speed.
-
-        if threshold is None or np.all(np.isnan(threshold)):
-            return []
-
-        found_peaks = []
-
         # Note: at least 3 samples above threshold are required to form a peak
-
-        d = 1
-        N = len(sweep)
-        while d < (N - 1):
-            # Skip to when threshold starts, applicable only for CFAR
-            if np.isnan(threshold[d - 1]):
-                d += 1
-                continue
-
-            # Break when threshold ends, applicable only for CFAR
-            if np.isnan(threshold[d + 1]):
-                break
-
-            # At this point, threshold is defined (not Nan)
-
-            # If the current point is not over threshold, the next will not be a peak
-            if sweep[d] <= threshold[d]:
-                d += 2
-                continue
-
-            # Continue if previous point is not over threshold
-            if sweep[d - 1] <= threshold[d - 1]:
-                d += 1
-                continue
-
-            # Continue if this point isn't larger than the previous
-            if sweep[d - 1] >= sweep[d]:
-                d += 1
-                continue
-
-            # A peak is either a single point or a plateau consisting of several equal points,
-            # all over their threshold. The closest neighboring points on each side of the
-            # point/plateau must have a lower value and be over their threshold.
-            # Now, decide if the following point(s) are a peak:
-
-            d_upper = d + 1
-            while True:
-                if (d_upper) >= (N - 1):  # If out of range or on last point
-                    break
-
-                if np.isnan(threshold[d_upper]):
-                    break
-
-                if sweep[d_upper] <= threshold[d_upper]:
-                    break
-
-                if sweep[d_upper] > sweep[d]:
-                    break
-                elif sweep[d_upper] < sweep[d]:
-                    delta = d_upper - d
-                    found_peaks.append(d + int(np.ceil((delta - 1) / 2.0)))
-                    break
-                else:  # equal
-                    d_upper += 1
-
-            d = d_upper
-
-        return found_peaks
+        return et.detection.find_peaks(sweep, threshold)
 
     def merge_peaks(self, peak_indexes, merge_max_range):
-        merged_peaks = copy(peak_indexes)
-
-        while True:
-            num_neighbors = np.zeros(len(merged_peaks))  # number of neighbors
-            for i, p in enumerate(merged_peaks):
-                num_neighbors[i] = np.sum(np.abs(np.array(merged_peaks) - p) < merge_max_range)
-
-            # First peak with max number of neighbors
-            i_peak = np.argmax(num_neighbors)  # returns arg of first max
-
-            if num_neighbors[i_peak] <= 1:
-                break
-
-            peak = merged_peaks[i_peak]
-
-            remove_mask = np.abs(np.array(merged_peaks) - peak) < merge_max_range
-            peaks_to_remove = np.array(merged_peaks)[remove_mask]
-
-            for p in peaks_to_remove:
-                merged_peaks.remove(p)
-
-            # Add back mean peak
-            merged_peaks.append(int(round(np.mean(peaks_to_remove))))
-
-            merged_peaks.sort()
-
-        return merged_peaks
+        return et.detection.merge_peaks(peak_indexes, merge_max_range)
 
     def sort_peaks(self, peak_indexes, sweep):
-        amp = np.array([sweep[int(i)] for i in peak_indexes])
-        r = np.array([self.r[int(i)] for i in peak_indexes])
+        idxs = np.asarray(peak_indexes, dtype=int)
+        amp = sweep[idxs]
+        r = self.r[idxs]
 
         PeakSorting = ProcessingConfiguration.PeakSorting
         if self.peak_sorting_method == PeakSorting.CLOSEST:
@@ -342,6 +236,7 @@ class Processor:
         self.sweeps_since_mean += 1
 
         # Determining threshold
+        rms_threshod = False
         if self.threshold_type is ProcessingConfiguration.ThresholdType.FIXED:
             threshold = self.fixed_threshold_level * np.ones(sweep.size)
             print('threshold level', self.fixed_threshold_level)
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 
@@ -262,6 +263,71 @@ def get_processing_config():
     }
 
 
+def remap(val, x1, x2, y1, y2):
+    if x1 == x2:
+        return y1
+    m = (y2 - y1) / (x2 - x1)
+    b = y1 - m * x1
+    return val * m + b
+
+
+@functools.lru_cache(maxsize=8)
+def get_threshold_map(
+    range_interval_cm,
+    len_range,
+    fft_len,
+    min_thresh,
+    max_thresh,
+    static_distance,
+    static_dist_gradient,
+    static_freq_limit,
+    close_dist_limit,
+    close_threshold_addition,
+):
+    """
+    Threshold for every distance and FFT bin, cached as it only depends on the configuration.
+    The returned map is read-only.
+    """
+    dists = np.linspace(*range_interval_cm, len_range)[:, None]
+    freqs = np.arange(fft_len)[None, :]
+
+    thresh = remap(
+        dists,
+        static_distance - static_dist_gradient,
+        static_distance,
+        max_thresh,
+        min_thresh,
+    )
+    thresh = np.clip(thresh, min_thresh, max_thresh)
+
+    null_frequency = fft_len / 2
+    frequency_gradient = static_freq_limit
+
+    below_freqs = np.clip(freqs, null_frequency - frequency_gradient, null_frequency)
+    below_thresh = remap(
+        below_freqs, null_frequency - frequency_gradient, null_frequency, min_thresh, thresh
+    )
+    above_freqs = np.clip(freqs, null_frequency, null_frequency + frequency_gradient)
+    above_thresh = remap(
+        above_freqs, null_frequency, null_frequency + frequency_gradient, thresh, min_thresh
+    )
+    thresh = np.where(freqs <= null_frequency, below_thresh, above_thresh)
+
+    thresh_add = remap(
+        dists,
+        range_interval_cm[0],
+        range_interval_cm[0] + close_dist_limit,
+        close_threshold_addition,
+        0.0,
+    )
+
+    # With zero gradients, remap() gives scalars and the map would lack dimensions
+    thresh = thresh + np.clip(thresh_add, 0, close_threshold_addition)
+    threshold_map = np.broadcast_to(thresh, (len_range, fft_len)).copy()
+    threshold_map.flags.writeable = False
+    return threshold_map
+
+
 class ObstacleDetectionProcessor:
     def __init__(self, sensor_config, processing_config, session_info):
         self.sensor_config = sensor_config
@@ -322,9 +388,11 @@ class ObstacleDetectionProcessor:
                 }
                 self.fusion_handle.setup(fusion_params)
 
-            self.sweep_map = np.zeros((nr_sensors, len_range, self.fft_len), dtype="complex")
+            self.sweep_map = et.utils.RingBuffer(
+                self.fft_len, (nr_sensors, len_range), dtype="complex"
+            )
             self.fft_bg = np.zeros((nr_sensors, len_range, self.fft_len))
-            self.hamming_map = np.zeros((len_range, self.fft_len))
+            self.window = np.hamming(self.fft_len)
 
             self.fusion_data = {
                 "fused_y": np.full((self.fusion_history, self.fusion_max_obstacles), np.nan),
@@ -335,9 +403,6 @@ class ObstacleDetectionProcessor:
                 "right_shadow_x": np.full((self.fusion_history, self.fusion_max_shadows), np.nan),
             }
 
-            for i in range(len_range):
-                self.hamming_map[i, :] = np.hamming(self.fft_len)
-
             self.env_xs = np.linspace(*self.sensor_config.range_interval * 100, len_range)
             self.peak_prop_num = 4
             self.peak_hist = np.zeros(
@@ -345,7 +410,18 @@ class ObstacleDetectionProcessor:
             )
             self.peak_hist *= float(np.nan)
             self.mask = np.zeros((len_range, self.fft_len))
-            self.threshold_map = np.zeros((len_range, self.fft_len))
+            self.threshold_map = get_threshold_map(
+                tuple(self.sensor_config.range_interval * 100),
+                len_range,
+                self.fft_len,
+                self.threshold,
+                self.static_threshold,
+                self.static_distance,
+                self.static_dist_gradient,
+                self.static_freq_limit,
+                self.close_dist_limit,
+                self.close_threshold_addition,
+            )
 
             if self.saved_bg is not None:
                 if isinstance(self.saved_bg, dict):
@@ -376,38 +452,42 @@ class ObstacleDetectionProcessor:
                 else:
                     log.warning("Received unsupported background data!")
 
-            for dist in range(len_range):
-                for freq in range(self.fft_len):
-                    self.threshold_map[dist, freq] = self.variable_thresholding(
-                        freq, dist, self.threshold, self.static_threshold
+        self.sweep_map.append(sweep[:nr_sensors, :])
+
+        # The sweep maps have the newest sweep first, for all sensors at once
+        sweep_maps = np.moveaxis(self.sweep_map.view()[::-1], 0, -1)
+        signalFFT = fftshift(fft(sweep_maps * self.window, axis=-1), axes=-1)
+        fft_psd = np.square(np.abs(signalFFT))
+
+        do_parameterization = False
+        if self.use_bg and self.sweep_index == self.fft_len - 1:
+            np.maximum(self.bg_off * fft_psd, self.fft_bg, out=self.fft_bg)
+            self.bg_avg += 1
+            do_parameterization = self.bg_avg == self.use_bg and self.use_bg_parameterization
+
+        fft_psd_sub = fft_psd - self.fft_bg
+
+        if do_parameterization:
+            for i in range(nr_sensors):
+                self.bg_params.append(self.parameterize_bg(self.fft_bg[i, :, :]))
+                # only dump first sensor params
+                if i == 0:
+                    self.dump_bg_params_to_yaml()
+                if self.use_bg_parameterization:
+                    self.generate_background_from_pwl_params(
+                        self.fft_bg[i, :, :], self.bg_params[i]
                     )
 
-        fft_psd = np.empty((nr_sensors, len_range, self.fft_len))
+            # The background is parameterized after the last sensor's background update,
+            # so only that sensor has the parameterized background subtracted on this frame
+            fft_psd_sub[-1] = fft_psd[-1] - self.fft_bg[-1]
+
+        fft_psd_sub[fft_psd_sub < 0] = 0
+
         fused_obstacles = {}
         for s in range(nr_sensors):
-            self.push(sweep[s, :], self.sweep_map[s, :, :])
-
-            signalFFT = fftshift(fft(self.sweep_map[s, :, :] * self.hamming_map, axis=1), axes=1)
-            fft_psd[s, :, :] = np.square(np.abs(signalFFT))
             signalPSD = fft_psd[s, :, :]
-
-            if self.use_bg and self.sweep_index == self.fft_len - 1:
-                self.fft_bg[s, :, :] = np.maximum(self.bg_off * signalPSD, self.fft_bg[s, :, :])
-                if s == nr_sensors - 1:
-                    self.bg_avg += 1
-                    if self.bg_avg == self.use_bg and self.use_bg_parameterization:
-                        for i in range(nr_sensors):
-                            self.bg_params.append(self.parameterize_bg(self.fft_bg[i, :, :]))
-                            # only dump first sensor params
-                            if i == 0:
-                                self.dump_bg_params_to_yaml()
-                            if self.use_bg_parameterization:
-                                self.generate_background_from_pwl_params(
-                                    self.fft_bg[i, :, :], self.bg_params[i]
-                                )
-
-            signalPSD_sub = signalPSD - self.fft_bg[s, :, :]
-            signalPSD_sub[signalPSD_sub < 0] = 0
+            signalPSD_sub = fft_psd_sub[s, :, :]
             env = np.abs(sweep[s, :])
 
             fft_peaks, peaks_found = self.find_peaks(signalPSD_sub)
@@ -420,6 +500,9 @@ class ObstacleDetectionProcessor:
             if self.sweep_index < self.fft_len:
                 fft_peaks = None
 
+            # Distance, velocity, angle and amplitude of each peak
+            peak_props = np.full((self.nr_locals, self.peak_prop_num), np.nan)
+
             if fft_peaks is not None:
                 fft_max_env = signalPSD[:, int(fft_peaks[0, 1])]
                 zero = np.floor(self.fft_len / 2)
@@ -448,16 +531,12 @@ class ObstacleDetectionProcessor:
                                 "sensor": s,
                             }
                         )
-                    self.push_vec(distance, self.peak_hist[s, i, 0, :])
-                    self.push_vec(velocity, self.peak_hist[s, i, 1, :])
-                    self.push_vec(angle, self.peak_hist[s, i, 2, :])
-                    self.push_vec(amp, self.peak_hist[s, i, 3, :])
+                    peak_props[i, :] = [distance, velocity, angle, amp]
 
                 fft_peaks = fft_peaks[:peaks_found, :]
-            else:
-                for i in range(self.nr_locals):
-                    for j in range(self.peak_prop_num):
-                        self.push_vec(float(np.nan), self.peak_hist[s, i, j, :])
+
+            self.peak_hist[s, :, :, 1:] = self.peak_hist[s, :, :, :-1]
+            self.peak_hist[s, :, :, 0] = peak_props
             fused_obstacles["{}".format(s)] = obstacles
 
         if self.fusion_handle:
@@ -536,30 +615,11 @@ class ObstacleDetectionProcessor:
         with open(filename, "w") as f_handle:
             yaml.dump(bg_params, f_handle, default_flow_style=False)
 
-    def remap(self, val, x1, x2, y1, y2):
-        if x1 == x2:
-            return y1
-        m = (y2 - y1) / (x2 - x1)
-        b = y1 - m * x1
-        return val * m + b
-
     def clamp(self, val, a, b):
         val = max(val, a)
         val = min(val, b)
         return val
 
-    def push(self, sweep, arr):
-        res = np.empty_like(arr)
-        res[:, 0] = sweep
-        res[:, 1:] = arr[:, :-1]
-        arr[...] = res
-
-    def push_vec(self, val, vec):
-        res = np.empty_like(vec)
-        res[0] = val
-        res[1:] = vec[:-1]
-        vec[...] = res
-
     def parameterize_bg(self, fft_bg):
         dist_len = fft_bg.shape[0]
 
@@ -667,7 +727,7 @@ class ObstacleDetectionProcessor:
             x2 = float(data_length - 1)
             return [x1, x2, y1, y2]
 
-        intersection_threshold = self.remap(BACKGROUND_PLATEAU_INTERPOLATION, 0, 1, y2, y1)
+        intersection_threshold = remap(BACKGROUND_PLATEAU_INTERPOLATION, 0, 1, y2, y1)
         if intersection_threshold > y2 * BACKGROUND_PLATEAU_FACTOR:
             intersection_threshold = y2 * BACKGROUND_PLATEAU_FACTOR
 
@@ -744,7 +804,7 @@ class ObstacleDetectionProcessor:
                     y_stop = pwl_amp[segment_stop]
                 else:
                     x_stop = dist_len - 1
-            interp = self.remap(dist_index, x_start, x_stop, y_start, y_stop)
+            interp = remap(dist_index, x_start, x_stop, y_start, y_stop)
             fft_bg[dist_index, freq_index] = interp
 
     def find_peaks(self, arr):
@@ -756,9 +816,7 @@ class ObstacleDetectionProcessor:
         peak_avg = peak[1]
 
         peak_val = arr[peak[0], peak[1]]
-        thresh = self.variable_thresholding(
-            peak[1], peak[0], self.threshold, self.static_threshold
-        )
+        thresh = self.threshold_map[peak[0], peak[1]]
 
         if peak_val < thresh:
             peak = None
@@ -778,9 +836,7 @@ class ObstacleDetectionProcessor:
             for i in range(self.nr_locals - 1):
                 self.peak_masking(local_peaks[i, :])
                 p = np.asarray(unravel_index(np.argmax(self.mask), arr.shape))
-                thresh = self.variable_thresholding(
-                    p[1], p[0], self.threshold, self.static_threshold
-                )
+                thresh = self.threshold_map[p[0], p[1]]
                 peak_val = arr[p[0], p[1]]
                 if peak_val > thresh:
                     dist_edge = self.edge(arr[:, p[1]], p[0], self.edge_ratio)
@@ -859,44 +915,6 @@ class ObstacleDetectionProcessor:
 
         return peak_idx
 
-    def variable_thresholding(self, freq_index, dist_index, min_thresh, max_thresh):
-        dist = self.env_xs[dist_index]
-        distance_gradient = self.static_dist_gradient
-        thresh = self.remap(
-            dist,
-            self.static_distance - distance_gradient,
-            self.static_distance,
-            max_thresh,
-            min_thresh,
-        )
-        thresh = self.clamp(thresh, min_thresh, max_thresh)
-
-        null_frequency = self.fft_len / 2
-        frequency_gradient = self.static_freq_limit
-
-        if freq_index <= null_frequency:
-            freq = self.clamp(freq_index, null_frequency - frequency_gradient, null_frequency)
-            thresh = self.remap(
-                freq, null_frequency - frequency_gradient, null_frequency, min_thresh, thresh
-            )
-        else:
-            freq = self.clamp(freq_index, null_frequency, null_frequency + frequency_gradient)
-            thresh = self.remap(
-                freq, null_frequency, null_frequency + frequency_gradient, thresh, min_thresh
-            )
-
-        thresh_add = self.remap(
-            dist,
-            self.sensor_config.range_start * 100,
-            self.sensor_config.range_start * 100 + self.close_dist_limit,
-            self.close_threshold_addition,
-            0.0,
-        )
-
-        thresh += self.clamp(thresh_add, 0, self.close_threshold_addition)
-
-        return thresh
-
 
 class PGUpdater:
     def __init__(self, sensor_config, processing_config, session_info):
@@ -97,7 +97,7 @@ class Processor:
         self.queued_distances = []
 
         history_length = int(round(self.f * processing_config.history_length_s)) + 1
-        self.detection_history = np.zeros(history_length) * float("nan")
+        self.detection_history = et.utils.RingBuffer(history_length, fill_value=float("nan"))
         self.detection_history_t = np.linspace(-(history_length - 1) / self.f, 0, history_length)
 
     def process(self, data, data_info):
@@ -159,8 +159,7 @@ class Processor:
             and distance_max - distance_min <= self.distance_difference_limit
         )
 
-        self.detection_history = np.roll(self.detection_history, -1)
-        self.detection_history[-1] = detection
+        self.detection_history.append(detection)
 
         # Calculates limits_center used to visualize the detection criterion
         limits_center = (np.sqrt(weight_min * weight_max), (distance_min + distance_max) / 2)
@@ -174,12 +173,103 @@ class Processor:
             "queued_weights": np.array(self.queued_weights),
             "queued_distances": np.array(self.queued_distances),
             "limits_center": limits_center,
-            "detection_history": self.detection_history,
+            "detection_history": self.detection_history.copy(),
             "detection_history_t": self.detection_history_t,
         }
 
         return out_data
 
+    def process_batch(self, frames, data_infos):
+        sweeps = np.asarray(frames)
+        num_frames, num_depths = sweeps.shape
+
+        valid_leak_setup = (
+            0 <= self.leak_sample_index
+            and self.leak_sample_index < self.leak_end_index
+            and self.leak_sample_index < num_depths
+        )
+        if valid_leak_setup:
+            leak_amplitudes = np.fmin(self.leak_max_amplitude, sweeps[:, self.leak_sample_index])
+            a_leaks = np.maximum(leak_amplitudes - ENVELOPE_BACKGROUND_LEVEL, 0)
+            leak_steps = a_leaks / (self.leak_end_index - self.leak_sample_index)
+            leak_starts = self.leak_end_index * leak_steps + ENVELOPE_BACKGROUND_LEVEL
+
+            # Same as np.linspace for each frame
+            bg_steps = (ENVELOPE_BACKGROUND_LEVEL - leak_starts) / self.leak_end_index
+            bg_near = np.arange(self.leak_end_index + 1) * bg_steps[:, None] + leak_starts[:, None]
+            bg_near[:, -1] = ENVELOPE_BACKGROUND_LEVEL
+
+            bg_far_len = num_depths - (self.leak_end_index + 1)
+            if bg_far_len > 0:
+                bg_far = np.ones((num_frames, bg_far_len)) * ENVELOPE_BACKGROUND_LEVEL
+                backgrounds = np.concatenate([bg_near, bg_far], axis=1)
+            else:
+                backgrounds = bg_near[:, :num_depths]
+        else:
+            leak_amplitudes = np.full(num_frames, float("nan"))
+            backgrounds = np.ones((num_frames, num_depths)) * ENVELOPE_BACKGROUND_LEVEL
+
+        samples_above_bg = np.fmax(sweeps - backgrounds, 0)
+        weights = (
+            np.fmin(samples_above_bg / ENVELOPE_BACKGROUND_LEVEL, 1)
+            * samples_above_bg
+            * self.depths
+        )
+
+        weight_sums = np.sum(weights, axis=1)
+
+        sweep_weights = weight_sums / num_depths
+        sweep_distances = np.sum(weights * self.depths, axis=1) / weight_sums
+
+        history_length = len(self.detection_history)
+        detection_history = np.append(self.detection_history.view(), np.zeros(num_frames))
+
+        results = []
+        for i in range(num_frames):
+            if len(self.queued_weights) == self.detector_queue_target_length:
+                self.queued_weights = self.queued_weights[1:]
+                self.queued_distances = self.queued_distances[1:]
+
+            self.queued_weights.append(sweep_weights[i])
+            self.queued_distances.append(sweep_distances[i])
+
+            weight_min = min(self.queued_weights)
+            weight_max = max(self.queued_weights)
+            distance_min = min(self.queued_distances)
+            distance_max = max(self.queued_distances)
+
+            detection = (
+                len(self.queued_weights) == self.detector_queue_target_length
+                and weight_min >= self.weight_threshold
+                and weight_max / weight_min <= self.weight_ratio_limit
+                and distance_max - distance_min <= self.distance_difference_limit
+            )
+
+            detection_history[history_length + i] = detection
+
+            limits_center = (np.sqrt(weight_min * weight_max), (distance_min + distance_max) / 2)
+
+            results.append(
+                {
+                    "sweep": sweeps[i],
+                    "leak_estimate": np.array(
+                        [leak_amplitudes[i], ENVELOPE_BACKGROUND_LEVEL],
+                    ),
+                    "leak_estimate_depths": self.leak_estimate_depths,
+                    "background": backgrounds[i],
+                    "weight": weights[i],
+                    "queued_weights": np.array(self.queued_weights),
+                    "queued_distances": np.array(self.queued_distances),
+                    "limits_center": limits_center,
+                    "detection_history": detection_history[i + 1 : i + 1 + history_length],
+                    "detection_history_t": self.detection_history_t,
+                }
+            )
+
+        self.detection_history.extend(detection_history[history_length:])
+
+        return results
+
 
 class ProcessingConfiguration(et.configbase.ProcessingConfig):
 
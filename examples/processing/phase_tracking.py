@@ -70,7 +70,7 @@ class PhaseTrackingProcessor:
 
         self.lp_vel = 0
         self.last_sweep = None
-        self.hist_pos = np.zeros(num_hist_points)
+        self.hist_pos = et.utils.RingBuffer(num_hist_points)
         self.sweep_index = 0
 
     def process(self, data, data_info):
@@ -103,12 +103,12 @@ class PhaseTrackingProcessor:
             self.lp_vel = a * vel + (1 - a) * self.lp_vel
 
             dp = self.lp_vel / self.f
-            self.hist_pos = np.roll(self.hist_pos, -1)
-            self.hist_pos[-1] = self.hist_pos[-2] + dp
+            self.hist_pos.append(self.hist_pos[-1] + dp)
+            hist_pos = self.hist_pos.view()
 
-            hist_len = len(self.hist_pos)
-            plot_hist_pos = self.hist_pos - self.hist_pos.mean()
-            cut_hist_pos = self.hist_pos[hist_len // 2 :]
+            hist_len = len(hist_pos)
+            plot_hist_pos = hist_pos - hist_pos.mean()
+            cut_hist_pos = hist_pos[hist_len // 2 :]
             plot_hist_pos_zoom = cut_hist_pos - cut_hist_pos.mean()
 
             iq_val = np.exp(1j * np.angle(sweep[com_idx])) * self.lp_ampl[com_idx]
@@ -126,6 +126,76 @@ class PhaseTrackingProcessor:
         self.sweep_index += 1
         return plot_data
 
+    def process_batch(self, frames, data_infos):
+        sweeps = np.asarray(frames)
+
+        if len(sweeps) == 0:
+            return []
+
+        if self.sweep_index == 0:
+            first_result = self.process(sweeps[0], data_infos[0])
+            return [first_result] + self.process_batch(sweeps[1:], data_infos[1:])
+
+        num_sweeps, n = sweeps.shape
+        sweep_idxs = np.arange(num_sweeps)
+
+        ampls = np.abs(sweeps)
+        powers = np.square(ampls)
+        power_sums = np.sum(powers, axis=1)
+        has_power = power_sums > 1e-6
+        coms = np.zeros(num_sweeps)
+        coms[has_power] = (
+            np.sum(np.arange(n) / n * powers[has_power], axis=1) / power_sums[has_power]
+        )
+
+        a = self.alpha(0.1, self.dt)
+        lp_ampls = et.utils.exp_smooth(ampls, 1 - a, self.lp_ampl, weight=a)
+        a = self.alpha(0.25, self.dt)
+        lp_coms = et.utils.exp_smooth(coms, 1 - a, self.lp_com, weight=a)
+
+        com_idxs = (lp_coms * n).astype(int)
+        last_sweeps = np.concatenate([[self.last_sweep], sweeps[:-1]])
+        delta_angles = np.angle(
+            sweeps[sweep_idxs, com_idxs] * np.conj(last_sweeps[sweep_idxs, com_idxs])
+        )
+        vels = self.f * 2.5 * delta_angles / (2 * np.pi)
+
+        a = self.alpha(0.1, self.dt)
+        lp_vels = et.utils.exp_smooth(vels, 1 - a, self.lp_vel, weight=a)
+
+        dps = lp_vels / self.f
+        hist_len = len(self.hist_pos)
+        new_hist_pos = np.cumsum(np.append(self.hist_pos[-1], dps))[1:]
+        hist_pos = np.append(self.hist_pos.view(), new_hist_pos)
+
+        args = np.angle(sweeps)
+        iq_vals = np.exp(1j * args[sweep_idxs, com_idxs]) * lp_ampls[sweep_idxs, com_idxs]
+
+        results = []
+        for i in range(num_sweeps):
+            current_hist_pos = hist_pos[i + 1 : i + 1 + hist_len]
+            cut_hist_pos = current_hist_pos[hist_len // 2 :]
+
+            results.append(
+                {
+                    "abs": lp_ampls[i],
+                    "arg": args[i],
+                    "com": lp_coms[i],
+                    "hist_pos": current_hist_pos - current_hist_pos.mean(),
+                    "hist_pos_zoom": cut_hist_pos - cut_hist_pos.mean(),
+                    "iq_val": iq_vals[i],
+                }
+            )
+
+        self.lp_ampl = lp_ampls[-1]
+        self.lp_com = lp_coms[-1]
+        self.lp_vel = lp_vels[-1]
+        self.hist_pos.extend(new_hist_pos)
+        self.last_sweep = sweeps[-1]
+        self.sweep_index += num_sweeps
+
+        return results
+
     def alpha(self, tau, dt):
         return 1 - np.exp(-dt / tau)
 
@@ -1,6 +1,7 @@
 import numpy as np
 import pyqtgraph as pg
 from numpy import cos, pi, sqrt, square
+from scipy.ndimage import correlate1d
 from scipy.special import binom
 
 from PyQt5 import QtCore
@@ -283,7 +284,9 @@ class Processor:
         self.presence_distance_index = 0
         self.presence_distance = 0
 
-        self.presence_history = np.zeros(int(round(self.f * processing_config.history_length_s)))
+        self.presence_history = et.utils.RingBuffer(
+            int(round(self.f * processing_config.history_length_s))
+        )
         self.update_index = 0
 
         self.update_processing_config(processing_config)
@@ -341,6 +344,15 @@ class Processor:
             a = np.pad(a, pad_width, "constant")
             return np.correlate(a, b, mode="same")[pad_width:-pad_width]
 
+    def depth_filter_frames(self, a):
+        """Filters each row of ``a`` like ``depth_filter``"""
+
+        if a.shape[1] < self.depth_filter_length:
+            return np.array([self.depth_filter(row) for row in a]).reshape(a.shape)
+
+        b = np.ones(self.depth_filter_length) / self.depth_filter_length
+        return correlate1d(a, b, axis=1, mode="constant")
+
     @staticmethod
     def normalize_noise_base(noise_base):
         norm = np.sqrt(np.sum(np.square(noise_base), axis=1, keepdims=True))
@@ -439,8 +451,7 @@ class Processor:
 
         presence_detected = self.presence_score > self.threshold
 
-        self.presence_history = np.roll(self.presence_history, -1)
-        self.presence_history[-1] = self.presence_score
+        self.presence_history.append(self.presence_score)
 
         if max_depthwise_presence > self.threshold:
             self.presence_distance_index = np.argmax(depthwise_presence)
@@ -457,7 +468,7 @@ class Processor:
             "presence_score": self.presence_score,
             "presence_distance_index": self.presence_distance_index,
             "presence_distance": self.presence_distance,
-            "presence_history": self.presence_history,
+            "presence_history": self.presence_history.copy(),
             "presence_detected": presence_detected,
         }
 
@@ -465,6 +476,120 @@ class Processor:
 
         return out_data
 
+    def process_batch(self, frames, data_infos):
+        if self.num_removed_pc > 0:
+            # The noise base update depends on the previous noise base, so it can't be done
+            # for all frames at once
+            return [self.process(frame, info) for frame, info in zip(frames, data_infos)]
+
+        frames = np.asarray(frames)
+        num_frames = len(frames)
+        update_idxs = self.update_index + np.arange(num_frames)
+
+        def dynamic_sfs(static_sf):
+            return np.minimum(static_sf, 1.0 - 1.0 / (1.0 + update_idxs))
+
+        # Noise estimation
+
+        nd = self.noise_est_diff_order
+
+        noise_diffs = np.diff(frames, n=nd, axis=1)
+        noises = self.abs_dev(noise_diffs, axis=1, subtract_mean=False)
+        noises /= self.noise_norm_factor
+        lp_noises = et.utils.exp_smooth(noises, dynamic_sfs(self.noise_sf), self.lp_noise)
+
+        # Intra-frame part
+
+        mean_sweeps = frames.mean(axis=1)
+        frame_diffs = frames - mean_sweeps[:, None]
+        sweep_devs = self.abs_dev(frame_diffs, axis=1, ddof=1, subtract_mean=False)
+        lp_intra_devs = et.utils.exp_smooth(
+            sweep_devs, dynamic_sfs(self.intra_sf), self.lp_intra_dev
+        )
+
+        norm_lp_intra_devs = np.divide(
+            lp_intra_devs,
+            lp_noises,
+            out=np.zeros_like(lp_intra_devs),
+            where=(lp_noises > 1.0),
+        )
+
+        intras = self.depth_filter_frames(norm_lp_intra_devs)
+
+        # Inter-frame part
+
+        fast_lp_mean_sweeps = et.utils.exp_smooth(
+            mean_sweeps, dynamic_sfs(self.fast_sf), self.fast_lp_mean_sweep
+        )
+        slow_lp_mean_sweeps = et.utils.exp_smooth(
+            mean_sweeps, dynamic_sfs(self.slow_sf), self.slow_lp_mean_sweep
+        )
+
+        inter_devs = np.abs(fast_lp_mean_sweeps - slow_lp_mean_sweeps)
+        lp_inter_devs = et.utils.exp_smooth(
+            inter_devs, dynamic_sfs(self.inter_dev_sf), self.lp_inter_dev
+        )
+
+        norm_lp_devs = np.divide(
+            lp_inter_devs,
+            lp_noises,
+            out=np.zeros_like(lp_inter_devs),
+            where=(lp_noises > 1.0),
+        )
+
+        norm_lp_devs *= np.sqrt(self.sweeps_per_frame)
+
+        inters = self.depth_filter_frames(norm_lp_devs)
+
+        # Detector output
+
+        depthwise_presences = self.inter_weight * inters + self.intra_weight * intras
+
+        max_depthwise_presences = np.max(depthwise_presences, axis=1)
+
+        presence_scores = et.utils.exp_smooth(
+            max_depthwise_presences, dynamic_sfs(self.output_sf), self.presence_score
+        )
+
+        history_length = len(self.presence_history)
+        presence_history = np.append(self.presence_history.view(), presence_scores)
+
+        results = []
+        for i in range(num_frames):
+            if max_depthwise_presences[i] > self.threshold:
+                self.presence_distance_index = np.argmax(depthwise_presences[i])
+                self.presence_distance = self.depths[self.presence_distance_index]
+
+            results.append(
+                {
+                    "frame": frames[i],
+                    "fast": fast_lp_mean_sweeps[i],
+                    "slow": slow_lp_mean_sweeps[i],
+                    "noise": lp_noises[i],
+                    "inter": inters[i] * self.inter_weight,
+                    "intra": intras[i] * self.intra_weight,
+                    "depthwise_presence": depthwise_presences[i],
+                    "presence_score": presence_scores[i],
+                    "presence_distance_index": self.presence_distance_index,
+                    "presence_distance": self.presence_distance,
+                    "presence_history": presence_history[i + 1 : i + 1 + history_length],
+                    "presence_detected": presence_scores[i] > self.threshold,
+                }
+            )
+
+        if num_frames > 0:
+            self.lp_noise = lp_noises[-1]
+            self.lp_intra_dev = lp_intra_devs[-1]
+            self.fast_lp_mean_sweep = fast_lp_mean_sweeps[-1]
+            self.slow_lp_mean_sweep = slow_lp_mean_sweeps[-1]
+            self.lp_inter_dev = lp_inter_devs[-1]
+            self.presence_score = presence_scores[-1]
+            self.presence_history.extend(presence_scores)
+
+        self.update_index += num_frames
+
+        return results
+
 
 class PGUpdater:
     def __init__(self, sensor_config, processing_config, session_info):
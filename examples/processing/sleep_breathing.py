@@ -222,22 +222,25 @@ class Processor:
                 "init_progress": round(100 * self.sweep_index / self.sweeps_in_block),
             }
         else:
+            if self.sweep_index == self.sweeps_in_block:
+                # The block is filled, from here on only the latest sweeps are kept
+                self.data_s_d_mat = et.utils.RingBuffer.from_array(self.data_s_d_mat)
+                self.phi_vec = et.utils.RingBuffer.from_array(self.phi_vec)
+
             # Lowpass filter IQ data downsampled in distance points
-            self.data_s_d_mat = np.roll(self.data_s_d_mat, -1, axis=0)
-            self.data_s_d_mat[-1, :] = self.iq_lp_filter_time(
-                self.data_s_d_mat[-2, :], self.downsample(sweep, self.D)
+            self.data_s_d_mat.append(
+                self.iq_lp_filter_time(self.data_s_d_mat[-1, :], self.downsample(sweep, self.D))
             )
 
             # Phase unwrapping of IQ data
             temp_phi = self.unwrap_phase(
                 self.phi_vec[-1], self.data_s_d_mat[-1, :], self.data_s_d_mat[-2, :]
             )
-            self.phi_vec = np.roll(self.phi_vec, -1, axis=0)
-            self.phi_vec[-1] = temp_phi
+            self.phi_vec.append(temp_phi)
 
             if np.mod(self.sweep_index, self.new_sweeps_per_results - 1) == 0:
                 # Bandpass filter unwrapped data
-                phi_filt_vec = signal.lfilter(self.b, self.a, self.phi_vec, axis=0)
+                phi_filt_vec = signal.lfilter(self.b, self.a, self.phi_vec.view(), axis=0)
                 P, dft_est, _ = self.dft(self.downsample(phi_filt_vec, self.M))
                 f_breath_est, _, snr, _ = self.breath_freq_est(P)
 
@@ -246,7 +249,7 @@ class Processor:
                 self.snr_vec = np.append(self.snr_vec, snr)
 
                 out_data = {
-                    "phi_raw": self.phi_vec,
+                    "phi_raw": self.phi_vec.copy(),
                     "phi_filt": phi_filt_vec,
                     "power_spectrum": P,
                     "x_dft": np.linspace(self.f_low, self.f_high, self.dft_points),
@@ -97,6 +97,15 @@ class Processor:
             "abs_fft": abs_fft,
         }
 
+    def process_batch(self, frames, data_infos):
+        frames = np.asarray(frames)
+
+        zero_mean_frames = frames - frames.mean(axis=1, keepdims=True)
+        windowed = zero_mean_frames.transpose(0, 2, 1) * np.hanning(frames.shape[1])
+        abs_ffts = np.abs(np.fft.rfft(windowed, axis=2))
+
+        return [{"frame": f, "abs_fft": a} for f, a in zip(frames, abs_ffts)]
+
 
 class PGUpdater:
     def __init__(self, sensor_config, processing_config, session_info):
@@ -137,7 +137,9 @@ class Processor:
         self.num_depths = depths.size
 
         max_window_size = 2 ** ProcessingConfiguration.WINDOW_SIZE_POW_OF_2_MAX
-        self.sweep_history = np.full([max_window_size, self.num_depths], np.nan)
+        self.sweep_history = et.utils.RingBuffer(
+            max_window_size, (self.num_depths,), fill_value=np.nan
+        )
 
         self.collapsed_asd = None
         self.collapsed_asd_history = None
@@ -162,11 +164,9 @@ class Processor:
         self.rolling_history_size = int(processing_config.rolling_history_size)
 
         if invalid:
-            self.collapsed_asd_history = np.zeros(
-                [
-                    ProcessingConfiguration.ROLLING_HISTORY_SIZE_MAX,
-                    self.window_size // 2,
-                ]
+            self.collapsed_asd_history = et.utils.RingBuffer(
+                ProcessingConfiguration.ROLLING_HISTORY_SIZE_MAX,
+                (self.window_size // 2,),
             )
 
         if invalid and self.tick_idx > 0:
@@ -175,10 +175,14 @@ class Processor:
     def process(self, data, data_info):
         frame = data
 
-        mean_sweep = frame.mean(axis=0)
+        return self.update(frame.mean(axis=0))
+
+    def process_batch(self, frames, data_infos):
+        mean_sweeps = np.asarray(frames).mean(axis=1)
+        return [self.update(mean_sweep) for mean_sweep in mean_sweeps]
 
-        self.sweep_history = np.roll(self.sweep_history, -1, axis=0)
-        self.sweep_history[-1] = mean_sweep
+    def update(self, mean_sweep):
+        self.sweep_history.append(mean_sweep)
 
         outdated = (self.tick_idx - self.last_update_tick) > self.frames_between_updates
         if self.tick_idx == 0 or outdated:
@@ -198,8 +202,7 @@ class Processor:
         self.collapsed_asd = asd.sum(axis=0)
         self.dw_asd = asd
 
-        self.collapsed_asd_history = np.roll(self.collapsed_asd_history, -1, axis=0)
-        self.collapsed_asd_history[-1] = self.collapsed_asd
+        self.collapsed_asd_history.append(self.collapsed_asd)
 
         self.last_update_tick = self.tick_idx
 
@@ -211,11 +214,11 @@ class Processor:
             ts *= 1 / self.f
             fs *= 0.5 * self.f / fs[-1]
 
-        cropped_history = self.collapsed_asd_history[-self.rolling_history_size :]
+        cropped_history = self.collapsed_asd_history[-self.rolling_history_size :].copy()
 
         return {
             "ts": ts,
-            "sweep_history": self.sweep_history[-self.window_size :],
+            "sweep_history": self.sweep_history[-self.window_size :].copy(),
             "fs": fs,
             "collapsed_asd": self.collapsed_asd,
             "collapsed_asd_history": cropped_history,
@@ -267,9 +267,9 @@ class Processor:
         self.bin_vs = self.bin_fs * HALF_WAVELENGTH
 
         num_bins = self.bin_fs.size
-        self.nasd_history = np.zeros([sd_history_size, num_bins])
-        self.est_vel_history = np.full(est_vel_history_size, np.nan)
-        self.belongs_to_last_sequence = np.zeros(est_vel_history_size, dtype=bool)
+        self.nasd_history = et.utils.RingBuffer(sd_history_size, (num_bins,))
+        self.est_vel_history = et.utils.RingBuffer(est_vel_history_size, fill_value=np.nan)
+        self.belongs_to_last_sequence = et.utils.RingBuffer(est_vel_history_size, dtype=bool)
         self.noise_est = 0
         self.current_sequence_idle = self.sequence_timeout_count + 1
         self.sequence_vels = np.zeros(NUM_SAVED_SEQUENCES)
@@ -296,9 +296,121 @@ class Processor:
     def process(self, data, data_info):
         frame = data
 
-        # Basic speed estimate using Welch's method
+        asd = self.get_asds(frame[np.newaxis])[0]  # Amplitude Spectral Density
 
-        zero_mean_frame = frame - frame.mean(axis=0, keepdims=True)
+        inst_noise_est = np.mean(asd[(-self.num_noise_est_bins - 1) : -1])
+        sf = self.dynamic_sf(self.noise_est_sf)  # Smoothing factor
+        self.noise_est = sf * self.noise_est + (1.0 - sf) * inst_noise_est
+
+        nasd = asd / self.noise_est  # Normalized Amplitude Spectral Density
+
+        over = nasd > self.threshold
+        est_idx = np.where(over)[0][-1] if np.any(over) else np.nan
+
+        if est_idx > 0:  # evaluates to false if nan
+            est_vel = self.bin_vs[est_idx]
+        else:
+            est_vel = np.nan
+
+        if est_vel < self.min_speed:  # evaluates to false if nan
+            est_vel = np.nan
+
+        self.update_sequence(est_vel)
+
+        # Data for plots
+
+        self.est_vel_history.append(est_vel)
+        est_vel_history = self.est_vel_history.view()
+
+        if np.all(np.isnan(est_vel_history)):
+            output_vel = None
+        else:
+            output_vel = np.nanmax(est_vel_history)
+
+        self.nasd_history.append(nasd)
+
+        nasd_temporal_max = np.max(self.nasd_history.view(), axis=0)
+
+        temporal_max_threshold = self.threshold
+
+        self.update_idx += 1
+
+        return {
+            "frame": frame,
+            "nasd": nasd,
+            "nasd_temporal_max": nasd_temporal_max,
+            "temporal_max_threshold": temporal_max_threshold,
+            "vel_history": self.est_vel_history.copy(),
+            "vel": output_vel,
+            "sequence_vels": self.sequence_vels,
+            "belongs_to_last_sequence": self.belongs_to_last_sequence.copy(),
+        }
+
+    def process_batch(self, frames, data_infos):
+        frames = np.asarray(frames)
+        num_frames = len(frames)
+
+        asds = self.get_asds(frames)
+
+        inst_noise_ests = np.mean(asds[:, (-self.num_noise_est_bins - 1) : -1], axis=1)
+        update_idxs = self.update_idx + np.arange(num_frames)
+        sfs = np.minimum(self.noise_est_sf, 1.0 - 1.0 / (1.0 + update_idxs))
+        noise_ests = et.utils.exp_smooth(inst_noise_ests, sfs, self.noise_est)
+
+        nasds = asds / noise_ests[:, None]
+
+        # Index of the last bin over the threshold
+        over = nasds > self.threshold
+        est_idxs = over.shape[1] - 1 - np.argmax(over[:, ::-1], axis=1)
+        has_est = np.any(over, axis=1) & (est_idxs > 0)
+        est_vels = np.where(has_est, self.bin_vs[est_idxs], np.nan)
+        est_vels[est_vels < self.min_speed] = np.nan
+
+        est_vel_history_size = len(self.est_vel_history)
+        est_vel_history = np.append(self.est_vel_history.view(), est_vels)
+        nasd_history_size = len(self.nasd_history)
+        nasd_history = np.concatenate([self.nasd_history.view(), nasds])
+
+        results = []
+        for i in range(num_frames):
+            self.update_sequence(est_vels[i])
+
+            current_est_vel_history = est_vel_history[i + 1 : i + 1 + est_vel_history_size]
+
+            if np.all(np.isnan(current_est_vel_history)):
+                output_vel = None
+            else:
+                output_vel = np.nanmax(current_est_vel_history)
+
+            current_nasd_history = nasd_history[i + 1 : i + 1 + nasd_history_size]
+
+            results.append(
+                {
+                    "frame": frames[i],
+                    "nasd": nasds[i],
+                    "nasd_temporal_max": np.max(current_nasd_history, axis=0),
+                    "temporal_max_threshold": self.threshold,
+                    "vel_history": current_est_vel_history,
+                    "vel": output_vel,
+                    "sequence_vels": self.sequence_vels.copy(),  # Updated in place
+                    "belongs_to_last_sequence": self.belongs_to_last_sequence.copy(),
+                }
+            )
+
+        if num_frames > 0:
+            self.noise_est = noise_ests[-1]
+
+        self.est_vel_history.extend(est_vels)
+        self.nasd_history.extend(nasds)
+
+        self.update_idx += num_frames
+
+        return results
+
+    def get_asds(self, frames):
+        """Amplitude spectral densities of frames, using Welch's method or Bartlett's method"""
+
+        zero_mean_frames = frames - frames.mean(axis=1, keepdims=True)
         psd_length = self.fft_length // 2 + 1
 
         if self.processing_method == ProcessingConfiguration.ProcessingMethod.WELCH:
@@ -310,7 +422,7 @@ class Processor:
         window = hann(segment_length, sym=False)
         window_norm = np.sum(window ** 2)
 
-        fft_segments = np.empty((self.num_segments, psd_length, len(self.depths)))
+        fft_segments = np.empty((len(frames), self.num_segments, psd_length, len(self.depths)))
 
         for i in range(self.num_segments):
             if self.processing_method == ProcessingConfiguration.ProcessingMethod.WELCH:
@@ -318,18 +430,20 @@ class Processor:
             else:
                 offset_segment = i * segment_length
 
-            current_segment = zero_mean_frame[offset_segment : offset_segment + segment_length]
+            current_segments = zero_mean_frames[
+                :, offset_segment : offset_segment + segment_length
+            ]
 
             if self.processing_method == ProcessingConfiguration.ProcessingMethod.WELCH:
-                current_segment = current_segment * window[:, None]
+                current_segments = current_segments * window[:, None]
 
-            fft_segments[i] = (
+            fft_segments[:, i] = (
                 np.square(
                     np.abs(
                         np.fft.rfft(
-                            current_segment,
+                            current_segments,
                             self.fft_length,
-                            axis=0,
+                            axis=1,
                         )
                     )
                 )
@@ -338,78 +452,31 @@ class Processor:
 
         # Add FFTs of different segments and average to decrease FFT variance
 
-        psds = np.mean(fft_segments, axis=0)
-
-        psds[1 : psd_length - 1] *= 2  # Double frequencies except DC and Nyquist
-
-        psd = np.max(psds, axis=1)  # Power Spectral Density
-        asd = np.sqrt(psd)  # Amplitude Spectral Density
-
-        inst_noise_est = np.mean(asd[(-self.num_noise_est_bins - 1) : -1])
-        sf = self.dynamic_sf(self.noise_est_sf)  # Smoothing factor
-        self.noise_est = sf * self.noise_est + (1.0 - sf) * inst_noise_est
-
-        nasd = asd / self.noise_est  # Normalized Amplitude Spectral Density
-
-        over = nasd > self.threshold
-        est_idx = np.where(over)[0][-1] if np.any(over) else np.nan
-
-        if est_idx > 0:  # evaluates to false if nan
-            est_vel = self.bin_vs[est_idx]
-        else:
-            est_vel = np.nan
-
-        if est_vel < self.min_speed:  # evaluates to false if nan
-            est_vel = np.nan
+        psds = np.mean(fft_segments, axis=1)
 
-        # Sequence
+        psds[:, 1 : psd_length - 1] *= 2  # Double frequencies except DC and Nyquist
 
-        self.belongs_to_last_sequence = np.roll(self.belongs_to_last_sequence, -1)
+        psd = np.max(psds, axis=2)  # Power Spectral Density
+        return np.sqrt(psd)
 
+    def update_sequence(self, est_vel):
         if np.isnan(est_vel):
             self.current_sequence_idle += 1
+
+            # The oldest value wraps around, as when rolling the history
+            self.belongs_to_last_sequence.append(self.belongs_to_last_sequence[0])
         else:
             if self.current_sequence_idle > self.sequence_timeout_count:
                 self.sequence_vels = np.roll(self.sequence_vels, -1)
                 self.sequence_vels[-1] = est_vel
-                self.belongs_to_last_sequence[:] = False
+                self.belongs_to_last_sequence.fill(False)
 
             self.current_sequence_idle = 0
-            self.belongs_to_last_sequence[-1] = True
+            self.belongs_to_last_sequence.append(True)
 
             if est_vel > self.sequence_vels[-1]:
                 self.sequence_vels[-1] = est_vel
 
-        # Data for plots
-
-        self.est_vel_history = np.roll(self.est_vel_history, -1, axis=0)
-        self.est_vel_history[-1] = est_vel
-
-        if np.all(np.isnan(self.est_vel_history)):
-            output_vel = None
-        else:
-            output_vel = np.nanmax(self.est_vel_history)
-
-        self.nasd_history = np.roll(self.nasd_history, -1, axis=0)
-        self.nasd_history[-1] = nasd
-
-        nasd_temporal_max = np.max(self.nasd_history, axis=0)
-
-        temporal_max_threshold = self.threshold
-
-        self.update_idx += 1
-
-        return {
-            "frame": frame,
-            "nasd": nasd,
-            "nasd_temporal_max": nasd_temporal_max,
-            "temporal_max_threshold": temporal_max_threshold,
-            "vel_history": self.est_vel_history,
-            "vel": output_vel,
-            "sequence_vels": self.sequence_vels,
-            "belongs_to_last_sequence": self.belongs_to_last_sequence,
-        }
-
 
 class PGUpdater:
     def __init__(self, sensor_config, processing_config, session_info):
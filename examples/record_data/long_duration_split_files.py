@@ -9,6 +9,7 @@ def main():
     parser.add_argument("-o", "--output-dir", type=str, required=True)
     parser.add_argument("--file-format", type=str, default="h5")
     parser.add_argument("--frames-per-file", type=int, default=10000)
+    parser.add_argument("--seconds-per-file", type=float, default=None)
     args = parser.parse_args()
     et.utils.config_logging(args)
 
@@ -44,27 +45,24 @@ def main():
 
     os.makedirs(args.output_dir)
 
+    # Files are written in the background, so acquisition doesn't stall at each new file
+    recorder = et.recording.RotatingRecorder(
+        args.output_dir,
+        frames_per_file=args.frames_per_file,
+        seconds_per_file=args.seconds_per_file,
+        file_format=file_format,
+        sensor_config=config,
+        session_info=session_info,
+    )
+
     interrupt_handler = et.utils.ExampleInterruptHandler()
     print("Press Ctrl-C to end session")
 
     total_num_frames = 0
     while not interrupt_handler.got_signal:
-        record_count, num_frames_in_record = divmod(total_num_frames, args.frames_per_file)
-
-        if num_frames_in_record == 0:
-            recorder = et.recording.Recorder(sensor_config=config, session_info=session_info)
-
         data_info, data = client.get_next()
         recorder.sample(data_info, data)
 
-        if num_frames_in_record + 1 == args.frames_per_file:
-            record = recorder.close()
-            filename = os.path.join(
-                args.output_dir, "{:04}.{}".format(record_count + 1, file_format)
-            )
-            print("Saved", filename)
-            et.recording.save(filename, record)
-
         total_num_frames += 1
         print("Sampled {:>5}".format(total_num_frames), end="\r", flush=True)
 
@@ -73,12 +71,9 @@ def main():
     except Exception:
         pass
 
-    record_count, num_frames_in_record = divmod(total_num_frames, args.frames_per_file)
-    if num_frames_in_record > 0:
-        record = recorder.close()
-        filename = os.path.join(args.output_dir, "{:04}.{}".format(record_count + 1, file_format))
-        print("Saved", filename)
-        et.recording.save(filename, record)
+    filenames = recorder.close()
+    print("Saved {} files to {}".format(len(filenames), args.output_dir))
+    print("Writer metrics:", recorder.metrics)
 
 
 if __name__ == "__main__":
@@ -2338,6 +2338,9 @@ class Threaded_Scan(QtCore.QThread):
             except Exception:
                 pass
 
+            if record is not None:
+                record = self.radar.recorder.close()
+
             if record is not None and len(record.data) > 0:
                 self.emit("scan_data", "", record)
         elif self.params["data_source"] == "file":
@@ -3,8 +3,15 @@ __version__ = "3.16.1"
 SDK_VERSION = "2.10.0"
 
 
-from . import clients, configs, recording, utils
-from .clients import MockClient, PollingUARTClient, SocketClient, SPIClient, UARTClient
+from . import catalog, clients, configs, detection, recording, utils
+from .clients import (
+    AsyncSocketClient,
+    MockClient,
+    PollingUARTClient,
+    SocketClient,
+    SPIClient,
+    UARTClient,
+)
 from .configs import (
     EnvelopeServiceConfig,
     IQServiceConfig,
@@ -0,0 +1,286 @@
+import json
+import logging
+import sqlite3
+import zipfile
+from pathlib import Path
+from typing import Optional, Union
+
+from acconeer.exptool import recording
+
+
+log = logging.getLogger(__name__)
+
+# Errors raised when loading a file that isn't a (readable) record
+LOAD_ERRORS = (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile)
+
+COLUMNS = [
+    ("path", "TEXT PRIMARY KEY"),
+    ("mtime", "REAL"),
+    ("size", "INTEGER"),
+    ("mode", "TEXT"),
+    ("sensors", "TEXT"),  # e.g. ",1,2,", to be matched with LIKE '%,1,%'
+    ("range_start", "REAL"),
+    ("range_end", "REAL"),
+    ("update_rate", "REAL"),
+    ("num_frames", "INTEGER"),
+    ("duration", "REAL"),
+    ("module_key", "TEXT"),
+    ("note", "TEXT"),
+    ("lib_version", "TEXT"),
+    ("rss_version", "TEXT"),
+    ("timestamp", "TEXT"),
+]
+
+
+class RecordCatalog:
+    """
+    SQLite index of record files, holding the metadata of each file so that files can be
+    found without opening them::
+
+        with RecordCatalog("catalog.db") as catalog:
+            catalog.scan("recordings")
+            filenames = catalog.query(mode="sparse", sensor=2, min_duration=60)
+
+    Files are added by ``add()`` or ``scan()``, or when saved with
+    ``recording.save(..., catalog=catalog)``.
+    """
+
+    def __init__(self, filename: Union[str, Path]):
+        self.filename = str(filename)
+        self._conn = sqlite3.connect(self.filename)
+
+        column_defs = ", ".join("{} {}".format(name, kind) for name, kind in COLUMNS)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS records ({})".format(column_defs))
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def add(self, filename: Union[str, Path], record: Optional[recording.Record] = None):
+        """Adds or updates a file. The file is only opened if ``record`` isn't given."""
+
+        path = Path(filename).resolve()
+
+        if record is None:
+            record = recording.open(path)
+
+            try:
+                row = _get_row(path, record)
+            finally:
+                if isinstance(record.data, recording.LazyRecordData):
+                    record.data.close()
+        else:
+            row = _get_row(path, record)
+
+        placeholders = ", ".join("?" * len(COLUMNS))
+        self._conn.execute("INSERT OR REPLACE INTO records VALUES ({})".format(placeholders), row)
+        self._conn.commit()
+
+    def remove(self, filename: Union[str, Path]):
+        path = str(Path(filename).resolve())
+        self._conn.execute("DELETE FROM records WHERE path = ?", (path,))
+        self._conn.commit()
+
+    def scan(self, directory: Union[str, Path], prune: bool = True) -> int:
+        """
+        Adds the records in a directory and its subdirectories that are new or have changed
+        since they were added. With ``prune``, files that no longer exist are removed. Returns
+        the number of files added. Files that can't be loaded as records are skipped with a
+        warning logged.
+        """
+
+        indexed = dict(self._conn.execute("SELECT path, mtime FROM records"))
+        num_added = 0
+
+        for pattern in ["**/*.h5", "**/*.npz"]:
+            for path in sorted(Path(directory).resolve().glob(pattern)):
+                if indexed.get(str(path)) == path.stat().st_mtime:
+                    continue
+
+                try:
+                    self.add(path)
+                except LOAD_ERRORS as e:
+                    log.warning("skipped {}, could not load it as a record ({!r})".format(path, e))
+                    continue
+
+                num_added += 1
+
+        if prune:
+            for path in indexed:
+                if not Path(path).exists():
+                    self.remove(path)
+
+        return num_added
+
+    def get(self, filename: Union[str, Path]) -> Optional[dict]:
+        """Returns the metadata of a file as a dict, or None if it isn't in the catalog"""
+
+        path = str(Path(filename).resolve())
+        cursor = self._conn.execute("SELECT * FROM records WHERE path = ?", (path,))
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        info = dict(zip([name for name, _ in COLUMNS], row))
+        info["sensors"] = [int(s) for s in info["sensors"].strip(",").split(",") if s]
+        return info
+
+    def query(
+        self,
+        mode: Optional[str] = None,
+        sensor: Optional[int] = None,
+        module_key: Optional[str] = None,
+        note: Optional[str] = None,
+        min_frames: Optional[int] = None,
+        min_duration: Optional[float] = None,
+        update_rate: Optional[float] = None,
+        within_range: Optional[tuple] = None,
+        where: Optional[str] = None,
+        params: tuple = (),
+    ) -> list:
+        """
+        Returns the paths of the files matching all given conditions, sorted by path.
+
+        :param mode: Mode name, e.g. "envelope"
+        :param sensor: A sensor that must have been used
+        :param module_key: Key of the processing module
+        :param note: Text that the note must contain
+        :param min_frames: Minimum number of frames
+        :param min_duration: Minimum duration in seconds
+        :param update_rate: Update rate in Hz
+        :param within_range: (start, end) in meters that the range must be within
+        :param where: Additional SQL condition on the columns in ``COLUMNS``
+        :param params: Parameters for the placeholders in ``where``
+        """
+
+        conditions = []
+        values = []
+
+        if mode is not None:
+            conditions.append("mode = ?")
+            values.append(mode.lower())
+
+        if sensor is not None:
+            conditions.append("sensors LIKE ?")
+            values.append("%,{},%".format(int(sensor)))
+
+        if module_key is not None:
+            conditions.append("module_key = ?")
+            values.append(module_key)
+
+        if note is not None:
+            conditions.append("instr(note, ?) > 0")
+            values.append(note)
+
+        if min_frames is not None:
+            conditions.append("num_frames >= ?")
+            values.append(min_frames)
+
+        if min_duration is not None:
+            conditions.append("duration >= ?")
+            values.append(min_duration)
+
+        if update_rate is not None:
+            conditions.append("update_rate = ?")
+            values.append(update_rate)
+
+        if within_range is not None:
+            conditions.append("range_start >= ? AND range_end <= ?")
+            values.extend(within_range)
+
+        if where is not None:
+            conditions.append("({})".format(where))
+            values.extend(params)
+
+        sql = "SELECT path FROM records"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += " ORDER BY path"
+
+        return [Path(path) for (path,) in self._conn.execute(sql, values)]
+
+    def close(self):
+        self._conn.close()
+
+
+def _get_row(path, record):
+    config = record.sensor_config
+    sensors = config.sensor if isinstance(config.sensor, list) else [config.sensor]
+    range_interval = getattr(config, "range_interval", None)
+    range_start, range_end = [None, None] if range_interval is None else map(float, range_interval)
+
+    sample_times = record.sample_times
+    if sample_times is not None and len(sample_times) > 1:
+        duration = float(sample_times[-1] - sample_times[0])
+    else:
+        duration = 0.0
+
+    stat = path.stat()
+
+    return (
+        str(path),
+        stat.st_mtime,
+        stat.st_size,
+        record.mode.name.lower() if record.mode is not None else None,
+        ",{},".format(",".join(str(s) for s in sensors)),
+        range_start,
+        range_end,
+        getattr(config, "update_rate", None),
+        len(record.data),
+        duration,
+        record.module_key,
+        record.note,
+        record.lib_version,
+        record.rss_version,
+        record.timestamp,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("catalog")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    sp = subparsers.add_parser("scan")
+    sp.add_argument("directory")
+
+    sp = subparsers.add_parser("query")
+    sp.add_argument("--mode")
+    sp.add_argument("--sensor", type=int)
+    sp.add_argument("--module-key")
+    sp.add_argument("--note")
+    sp.add_argument("--min-frames", type=int)
+    sp.add_argument("--min-duration", type=float)
+    sp.add_argument("--where")
+    sp.add_argument("-v", "--verbose", action="store_true")
+
+    args = parser.parse_args()
+
+    with RecordCatalog(args.catalog) as catalog:
+        if args.command == "scan":
+            num_added = catalog.scan(args.directory)
+            print("Added {} file(s), {} in catalog".format(num_added, len(catalog)))
+        else:
+            paths = catalog.query(
+                mode=args.mode,
+                sensor=args.sensor,
+                module_key=args.module_key,
+                note=args.note,
+                min_frames=args.min_frames,
+                min_duration=args.min_duration,
+                where=args.where,
+            )
+
+            for path in paths:
+                print(json.dumps(catalog.get(path)) if args.verbose else path)
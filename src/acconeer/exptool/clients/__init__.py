@@ -1,3 +1,4 @@
+from .json.async_client import AsyncSocketClient
 from .json.client import SocketClient
 from .mock.client import MockClient
 from .reg.client import PollingUARTClient, SPIClient, UARTClient
@@ -8,5 +9,6 @@ __all__ = [
     "SPIClient",
     "PollingUARTClient",
     "SocketClient",
+    "AsyncSocketClient",
     "MockClient",
 ]
@@ -1,6 +1,8 @@
 import abc
 import logging
+from time import time
 
+import numpy as np
 from packaging import version
 
 from acconeer.exptool import SDK_VERSION, modes
@@ -9,11 +11,19 @@ from acconeer.exptool.structs import configbase
 
 log = logging.getLogger(__name__)
 
+DATA_DTYPES = {  # dtype option: (real dtype, IQ dtype)
+    "float64": ("float64", "complex128"),
+    "float32": ("float32", "complex64"),
+    "raw": ("u2", "i2"),  # IQ as (..., 2) I/Q pairs
+}
+
 
 class BaseClient(abc.ABC):
     @abc.abstractmethod
     def __init__(self, **kwargs):
         self._squeeze = kwargs.pop("squeeze", True)
+        self.dtype = kwargs.pop("dtype", "float64")
+        num_frame_buffers = kwargs.pop("num_frame_buffers", None)
 
         if kwargs:
             a_key = next(iter(kwargs.keys()))
@@ -24,6 +34,11 @@ class BaseClient(abc.ABC):
         self._streaming_started = False
         self.supported_modes = None
 
+        if num_frame_buffers is None:
+            self._frame_ring = None
+        else:
+            self._frame_ring = FrameRing(num_frame_buffers)
+
     def connect(self):
         """Initiates a connection with the device.
 
@@ -40,15 +55,7 @@ class BaseClient(abc.ABC):
             info = {}
 
         if not info.get("mock"):
-            try:
-                log.info("reported version: {}".format(info["version_str"]))
-
-                if info["strict_version"] < version.parse(SDK_VERSION):
-                    log.warning("old server version - please upgrade server")
-                elif info["strict_version"] > version.parse(SDK_VERSION):
-                    log.warning("new server version - please upgrade client")
-            except KeyError:
-                log.warning("could not read software version (might be too old)")
+            log_server_version(info)
 
         self.supported_modes = self._get_supported_modes()
 
@@ -82,6 +89,10 @@ class BaseClient(abc.ABC):
 
         session_info = self._setup_session(config)
         self._session_setup_done = True
+
+        if self._frame_ring is not None:
+            self._frame_ring.reset()
+
         return session_info
 
     def start_session(self, config=None, check_config=True):
@@ -114,10 +125,14 @@ class BaseClient(abc.ABC):
         self._streaming_started = True
         return ret
 
-    def get_next(self):
+    def get_next(self, out=None):
         """
         Retrieves the next result. Will block until the result is received.
 
+        :param out: Optional preallocated array to decode the data into, avoiding an
+                    allocation per frame. Must have the shape and type of the returned data.
+        :type out: np.ndarray, optional
+
         :return: A tuple with the result info and data.
                 The data shape and type differs between services.
 
@@ -140,16 +155,106 @@ class BaseClient(abc.ABC):
                 `Number of sensors`, `bin count` and `number of sweeps` can be explicitly set.
                 `Data length` and `number of dephts` depend on multiple configuration settings.
 
+                The client takes a parameter ``dtype`` which changes the type above.
+                ``"float64"`` (default) gives the types listed above, ``"float32"`` gives
+                float32 and complex64, and ``"raw"`` gives the wire format, uint16 or, for IQ,
+                int16 with an extra last dimension of length 2 holding the I/Q pairs.
+
                 The client takes a parameter ``squeeze``, if set to `True` the first
                 dimension (`number of sensors`) is removed when using a single sensor.
                 As default ``squeeze`` is  `True`.
 
+                If the client was created with ``num_frame_buffers``, the data is decoded
+                into one of that many preallocated buffers which are reused between frames.
+                The returned array is then owned by the caller until it's given back using
+                ``release_frame()``.
+
         :rtype: tuple[union[list, dict], np.ndarray]
         """
         if not self._streaming_started:
             raise ClientError("must be streaming to get next")
 
-        return self._get_next()
+        if out is not None or self._frame_ring is None:
+            return self._get_next(out=out)
+
+        out = self._frame_ring.acquire()
+
+        try:
+            info, data = self._get_next(out=out)
+        except Exception:
+            self._frame_ring.release(out)
+            raise
+
+        if out is None:  # The ring is sized from the first frame
+            data = self._frame_ring.adopt(data)
+
+        return info, data
+
+    def get_next_batch(self, max_frames, timeout=None):
+        """
+        Retrieves all results already received by the client, up to ``max_frames``.
+        Will block until at least one result is received.
+
+        :param max_frames: The maximum number of results to retrieve
+        :type max_frames: int
+        :param timeout: If given, keeps waiting for more results until ``max_frames`` results
+                        have been received or roughly this many seconds have passed,
+                        defaults to `None`
+        :type timeout: float, optional
+
+        :return: A tuple with the result infos and data of the retrieved results.
+                The data is the data from ``get_next()`` stacked along a new first dimension.
+                The infos are given as a dict mapping every info key to an array of its
+                values, with the same leading dimensions as the data.
+        :rtype: tuple[dict, np.ndarray]
+        """
+        if not self._streaming_started:
+            raise ClientError("must be streaming to get next")
+
+        if max_frames < 1:
+            raise ValueError("max_frames must be at least 1")
+
+        start_time = time()
+        info, data = self._get_next()
+
+        batch = np.empty((max_frames,) + data.shape, dtype=data.dtype)
+        batch[0] = data
+        infos = [info]
+
+        while len(infos) < max_frames:
+            if not self._has_pending_frame():
+                if timeout is None or time() - start_time >= timeout:
+                    break
+
+            info, _ = self._get_next(out=batch[len(infos)])
+            infos.append(info)
+
+        return stack_data_infos(infos), batch[: len(infos)]
+
+    def stream(self, max_frames=100, timeout=None):
+        """
+        Generator yielding batches of results from ``get_next_batch()`` until the session is
+        stopped.
+
+        :param max_frames: The maximum number of results per batch, defaults to 100
+        :type max_frames: int
+        :param timeout: See ``get_next_batch()``, defaults to `None`
+        :type timeout: float, optional
+        """
+        while self._streaming_started:
+            yield self.get_next_batch(max_frames, timeout)
+
+    def release_frame(self, data):
+        """
+        Gives a frame buffer returned by ``get_next()`` back to the client for reuse.
+        Only needed if the client was created with ``num_frame_buffers``.
+        Arrays not owned by the client are ignored.
+
+        :param data: The data array returned by ``get_next()``
+        :type data: np.ndarray
+        """
+        if self._frame_ring is not None:
+            self._frame_ring.release(data)
 
     def stop_session(self):
         """
@@ -178,22 +283,14 @@ class BaseClient(abc.ABC):
         self.supported_modes = None
 
     def _check_config(self, config):
-        try:
-            alerts = config.check()
-        except AttributeError:
-            return
-
-        try:
-            error_alert = next(a for a in alerts if a.severity == configbase.Severity.ERROR)
-        except StopIteration:
-            return
-
-        msg = "error in config: {}: {}".format(error_alert.param, error_alert.msg)
-        raise IllegalConfigError(msg)
+        check_config(config)
 
     def _get_supported_modes(self):
         return set(modes.Mode)
 
+    def _has_pending_frame(self):
+        return False
+
     @abc.abstractmethod
     def _connect(self):
         pass
@@ -207,7 +304,7 @@ class BaseClient(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def _get_next(self):
+    def _get_next(self, out=None):
         pass
 
     @abc.abstractmethod
@@ -226,6 +323,61 @@ class BaseClient(abc.ABC):
     def squeeze(self, squeeze):
         self._squeeze = squeeze
 
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        if dtype not in DATA_DTYPES:
+            raise ValueError("unknown dtype '{}'".format(dtype))
+
+        self._dtype = dtype
+
+
+class FrameRing:
+    def __init__(self, num_slots):
+        if num_slots < 1:
+            raise ValueError("number of frame buffers must be at least 1")
+
+        self._num_slots = num_slots
+        self.reset()
+
+    def reset(self):
+        self._slots = None
+        self._held = [False] * self._num_slots
+        self._next_index = 0
+
+    def acquire(self):
+        if self._slots is None:
+            return None
+
+        for _ in range(self._num_slots):
+            i = self._next_index
+            self._next_index = (i + 1) % self._num_slots
+
+            if not self._held[i]:
+                self._held[i] = True
+                return self._slots[i]
+
+        raise ClientError("all frame buffers are held, release frames with release_frame()")
+
+    def adopt(self, data):
+        self._slots = [np.empty_like(data) for _ in range(self._num_slots)]
+        self._held = [False] * self._num_slots
+        out = self.acquire()
+        np.copyto(out, data)
+        return out
+
+    def release(self, data):
+        if data is None or self._slots is None:
+            return
+
+        for i, slot in enumerate(self._slots):
+            if slot is data:
+                self._held[i] = False
+                return
+
 
 class ClientError(Exception):
     pass
@@ -239,6 +391,104 @@ class SessionSetupError(ClientError):
     pass
 
 
+def check_config(config):
+    """Raises ``IllegalConfigError`` if the config has any errors."""
+
+    try:
+        alerts = config.check()
+    except AttributeError:
+        return
+
+    try:
+        error_alert = next(a for a in alerts if a.severity == configbase.Severity.ERROR)
+    except StopIteration:
+        return
+
+    msg = "error in config: {}: {}".format(error_alert.param, error_alert.msg)
+    raise IllegalConfigError(msg)
+
+
+def log_server_version(info):
+    """Logs the server version from a connect info dict, and warns if it doesn't match."""
+
+    try:
+        log.info("reported version: {}".format(info["version_str"]))
+
+        if info["strict_version"] < version.parse(SDK_VERSION):
+            log.warning("old server version - please upgrade server")
+        elif info["strict_version"] > version.parse(SDK_VERSION):
+            log.warning("new server version - please upgrade client")
+    except KeyError:
+        log.warning("could not read software version (might be too old)")
+
+
+def stack_data_infos(infos):
+    """Converts a list of result infos from ``get_next()`` to a dict of arrays, one per key."""
+
+    if len(infos) == 0:
+        return {}
+
+    if isinstance(infos[0], dict):
+        keys = infos[0].keys()
+        return {k: np.array([info.get(k) for info in infos]) for k in keys}
+
+    keys = infos[0][0].keys() if infos[0] else []
+    return {k: np.array([[info.get(k) for info in frame] for frame in infos]) for k in keys}
+
+
+def decode_data_buffer(buffer, mode, shape, byteorder="<", dtype="float64", out=None):
+    """Decodes a raw data buffer from the sensor, optionally into a preallocated array."""
+
+    mode = modes.get_mode(mode)
+    real_dtype, iq_dtype = DATA_DTYPES[dtype]
+
+    if mode == modes.Mode.IQ:
+        raw = np.frombuffer(buffer, dtype=byteorder + "i2").reshape(tuple(shape) + (2,))
+
+        if dtype == "raw":
+            if out is None:
+                return raw.astype(iq_dtype)
+
+            np.copyto(out, raw.reshape(out.shape))
+            return out
+
+        if out is None:
+            out = np.empty(raw.shape[:-1], dtype=iq_dtype)
+        else:
+            raw = raw.reshape(out.shape + (2,))
+
+        np.copyto(out.real, raw[..., 0])
+        np.copyto(out.imag, raw[..., 1])
+        return out
+
+    raw = np.frombuffer(buffer, dtype=byteorder + "u2")
+
+    if out is None:
+        return raw.reshape(shape).astype(real_dtype)
+
+    np.copyto(out, raw.reshape(out.shape))
+    return out
+
+
+def cast_data(data, mode, dtype):
+    """Casts float64/complex128 data to the type given by a ``dtype`` client option."""
+
+    mode = modes.get_mode(mode)
+    real_dtype, iq_dtype = DATA_DTYPES[dtype]
+
+    if mode == modes.Mode.IQ:
+        if dtype == "raw":
+            data = np.stack((data.real, data.imag), axis=-1)
+            return np.rint(data).clip(-(2 ** 15), 2 ** 15 - 1).astype(iq_dtype)
+
+        return data.astype(iq_dtype)
+
+    if dtype == "raw":
+        return np.rint(data).clip(0, 2 ** 16 - 1).astype(real_dtype)
+
+    return data.astype(real_dtype)
+
+
 def decode_version_str(version_str: str) -> dict:
     if "-" in version_str:
         strict_version = version.parse(version_str.split("-")[0])
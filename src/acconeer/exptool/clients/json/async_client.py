@@ -0,0 +1,291 @@
+import asyncio
+import logging
+
+from acconeer.exptool.clients import links
+from acconeer.exptool.clients.base import DATA_DTYPES, ClientError, SessionSetupError
+from acconeer.exptool.clients.base import check_config as _check_config
+from acconeer.exptool.clients.base import log_server_version
+from acconeer.exptool.clients.json.client import (
+    JsonProtocolBase,
+    JsonProtocolExplorationServer,
+    JsonProtocolStreamingServer,
+    decode_system_info,
+    decode_version_msg,
+)
+
+
+log = logging.getLogger(__name__)
+
+
+class AsyncSocketClient:
+    """
+    asyncio version of ``SocketClient``. Many clients can be run from a single event loop,
+    for example one per board::
+
+        async with AsyncSocketClient(host) as client:
+            await client.start_session(config)
+
+            async for info, data in client:
+                ...
+
+    The methods mirror the ones of the blocking clients, but are coroutines.
+    """
+
+    DEFAULT_TIMEOUT = links.BaseLink.DEFAULT_TIMEOUT
+    _PORT = links.SocketLink._PORT
+
+    def __init__(self, host, squeeze=True, dtype="float64"):
+        if dtype not in DATA_DTYPES:
+            raise ValueError("unknown dtype '{}'".format(dtype))
+
+        self._host = host
+        self._port = self._PORT
+        self._squeeze = squeeze
+        self._dtype = dtype
+        self._timeout = self.DEFAULT_TIMEOUT
+
+        self._reader = None
+        self._writer = None
+        self._protocol = None
+        self._session_cmd = None
+
+        self._connected = False
+        self._session_setup_done = False
+        self._streaming_started = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._connected:
+            await self.disconnect()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._streaming_started:
+            raise StopAsyncIteration
+
+        return await self.get_next()
+
+    async def connect(self):
+        """Initiates a connection with the device. See ``BaseClient.connect()``."""
+
+        if self._connected:
+            raise ClientError("already connected")
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), self._timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise links.LinkError("failed to connect") from e
+
+        info = {}
+
+        self._protocol = JsonProtocolBase(None)
+
+        await self._send_cmd({"cmd": "get_version"})
+
+        try:
+            header, _ = await self._recv_frame()
+        except links.LinkError as e:
+            raise ClientError("no response from server") from e
+
+        msg = self._protocol.handle_version_header(header)
+        if msg:
+            version_info = decode_version_msg(msg)
+            if version_info is not None:
+                info.update(version_info)
+
+                self._protocol = JsonProtocolStreamingServer(None, self._squeeze, self._dtype)
+                await self._send_cmd({"cmd": "get_board_sensor_count"})
+                header, _ = await self._recv_frame()
+                info["board_sensor_count"] = self._protocol.handle_sensor_count_header(header)
+        else:
+            self._protocol = JsonProtocolExplorationServer(None, self._squeeze, self._dtype)
+            await self._send_cmd({"cmd": "get_system_info"})
+
+            try:
+                header, _ = await self._recv_frame()
+            except links.LinkError as e:
+                raise ClientError("no response from server") from e
+
+            system_info = self._protocol.handle_system_info_header(header)
+            info.update(decode_system_info(system_info))
+
+        self._connected = True
+        log_server_version(info)
+
+        return info
+
+    async def setup_session(self, config, check_config=True):
+        """
+        Sets up a session with the given config. Will call ``connect()`` if not already
+        connected. See ``BaseClient.setup_session()``.
+        """
+
+        if check_config:
+            _check_config(config)
+
+        if self._streaming_started:
+            raise ClientError("can't setup session while streaming")
+
+        if not self._connected:
+            await self.connect()
+
+        cmd = self._protocol.setup_session(config)
+        self._session_cmd = cmd
+        info = await self._init_session()
+
+        if "update_rate" in cmd:
+            self._timeout = 1 / cmd["update_rate"] + self.DEFAULT_TIMEOUT
+        else:
+            self._timeout = self.DEFAULT_TIMEOUT
+
+        self._session_setup_done = True
+
+        log.debug("setup session")
+
+        return info
+
+    async def start_session(self, config=None, check_config=True):
+        """
+        Starts the session, calling ``setup_session()`` first if `config` is given.
+        See ``BaseClient.start_session()``.
+        """
+
+        if self._streaming_started:
+            raise ClientError("already streaming")
+
+        if config is None:
+            ret = None
+        else:
+            ret = await self.setup_session(config, check_config=check_config)
+
+        if not self._session_setup_done:
+            raise ClientError("session needs to be set up before starting stream")
+
+        await self._send_cmd({"cmd": "start_streaming"})
+        header, _ = await self._recv_frame()
+        self._protocol.handle_start_header(header)
+
+        self._streaming_started = True
+        return ret
+
+    async def get_next(self, out=None):
+        """
+        Retrieves the next result, waiting until it's received. See ``BaseClient.get_next()``.
+        """
+
+        if not self._streaming_started:
+            raise ClientError("must be streaming to get next")
+
+        header, payload = await self._recv_frame()
+        return self._protocol.decode_stream_frame(header, payload, out)
+
+    async def stop_session(self):
+        """
+        Stops the session. All buffered/waiting data is thrown away.
+        Waits until the server has confirmed that the session has ended.
+        """
+
+        if not self._streaming_started:
+            raise ClientError("not streaming")
+
+        await self._send_cmd({"cmd": "stop_streaming"})
+
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        while loop.time() - t0 < self._timeout:
+            header, _ = await self._recv_frame()
+            if self._protocol.handle_stop_header(header):
+                break
+        else:
+            raise ClientError
+
+        self._timeout = self.DEFAULT_TIMEOUT
+        self._streaming_started = False
+
+    async def disconnect(self):
+        """Disconnects the client, stopping the session first if it's started."""
+
+        if not self._connected:
+            raise ClientError("not connected")
+
+        if self._streaming_started:
+            await self.stop_session()
+
+        self._writer.close()
+        await self._writer.wait_closed()
+
+        self._reader = None
+        self._writer = None
+        self._connected = False
+        self._session_setup_done = False
+
+        log.debug("disconnected")
+
+    async def _init_session(self, retry=True):
+        if self._session_cmd is None:
+            raise ClientError
+
+        await self._send_cmd(self._session_cmd)
+        header, _ = await self._recv_frame()
+
+        if header["status"] == "error":
+            if retry:
+                return await self._init_session(retry=False)
+            else:
+                raise SessionSetupError
+
+        return self._protocol.handle_session_header(header)
+
+    async def _send_cmd(self, cmd_dict):
+        self._writer.write(self._protocol.encode_cmd(cmd_dict))
+        await self._writer.drain()
+
+    async def _recv_frame(self):
+        try:
+            return await asyncio.wait_for(self._read_frame(), self._timeout)
+        except asyncio.TimeoutError as e:
+            raise links.LinkError("recv timeout") from e
+        except asyncio.IncompleteReadError as e:
+            raise links.LinkError("connection closed") from e
+
+    async def _read_frame(self):
+        packed = await self._reader.readuntil(b"\n")
+        header = self._protocol.decode_header(packed)
+        payload_len = header["payload_size"]
+
+        if payload_len > 0:
+            payload = await self._reader.readexactly(payload_len)
+        else:
+            payload = None
+
+        return header, payload
+
+    @property
+    def squeeze(self):
+        return self._squeeze
+
+    @squeeze.setter
+    def squeeze(self, squeeze):
+        if self._protocol:
+            self._protocol.squeeze = squeeze
+        self._squeeze = squeeze
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        if dtype not in DATA_DTYPES:
+            raise ValueError("unknown dtype '{}'".format(dtype))
+
+        if self._protocol:
+            self._protocol.dtype = dtype
+        self._dtype = dtype
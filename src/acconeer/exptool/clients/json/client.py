@@ -11,6 +11,7 @@ from acconeer.exptool.clients.base import (
     BaseClient,
     ClientError,
     SessionSetupError,
+    decode_data_buffer,
     decode_version_str,
 )
 from acconeer.exptool.modes import Mode, get_mode
@@ -20,6 +21,8 @@ log = logging.getLogger(__name__)
 
 
 class JsonProtocolBase:
+    STOP_STATUS = None
+
     def __init__(self, link):
         self._link = link
         self._num_sensors = None
@@ -28,24 +31,28 @@ class JsonProtocolBase:
         self._mode = None
 
     def _send_cmd(self, cmd_dict):
-        cmd_dict["api_version"] = 3
-        s = json.dumps(cmd_dict, separators=(",", ":"))
-        packed = bytearray(s + "\n", "ascii")
-
-        self._link.send(packed)
+        self._link.send(self.encode_cmd(cmd_dict))
 
     def _recv_frame(self):
         packed = self._link.recv_until(b"\n")
-        header = json.loads(str(packed, "ascii"))
+        header = self.decode_header(packed)
         payload_len = header["payload_size"]
 
         if payload_len > 0:
-            payload = self._link.recv(payload_len)
+            payload = self._link.recv_view(payload_len)
         else:
             payload = None
 
         return header, payload
 
+    def encode_cmd(self, cmd_dict):
+        cmd_dict["api_version"] = 3
+        s = json.dumps(cmd_dict, separators=(",", ":"))
+        return bytearray(s + "\n", "ascii")
+
+    def decode_header(self, packed):
+        return json.loads(str(packed, "ascii"))
+
     def get_version(self):
         cmd = {"cmd": "get_version"}
         self._send_cmd(cmd)
@@ -55,6 +62,9 @@ class JsonProtocolBase:
         except links.LinkError as e:
             raise ClientError("no response from server") from e
 
+        return self.handle_version_header(header)
+
+    def handle_version_header(self, header):
         log.debug("connected and got a response")
 
         msg = None
@@ -69,12 +79,30 @@ class JsonProtocolBase:
     def get_sensor_count(self):
         self._send_cmd({"cmd": "get_board_sensor_count"})
         header, _ = self._recv_frame()
+        return self.handle_sensor_count_header(header)
+
+    def handle_sensor_count_header(self, header):
         return int(header["message"])
 
     def setup_session(self, config):
         pass
 
     def init_session(self, retry=True):
+        if self._session_cmd is None:
+            raise ClientError
+
+        self._send_cmd(self._session_cmd)
+        header, _ = self._recv_frame()
+
+        if header["status"] == "error":
+            if retry:
+                return self.init_session(retry=False)
+            else:
+                raise SessionSetupError
+
+        return self.handle_session_header(header)
+
+    def handle_session_header(self, header):
         pass
 
     def start_session(self):
@@ -84,14 +112,19 @@ class JsonProtocolBase:
         cmd = {"cmd": "start_streaming"}
         self._send_cmd(cmd)
         header, _ = self._recv_frame()
+        self.handle_start_header(header)
+
+    def handle_start_header(self, header):
         if header["status"] != "start":
             raise ClientError
 
         log.debug("started streaming")
 
-    def get_next(self):
+    def get_next(self, out=None):
         header, payload = self._recv_frame()
+        return self.decode_stream_frame(header, payload, out)
 
+    def decode_stream_frame(self, header, payload, out=None):
         status = header["status"]
         if status == "end":
             raise ClientError("session ended")
@@ -99,23 +132,79 @@ class JsonProtocolBase:
             raise ClientError("server error")
 
         info = self.decode_stream_header(header)
-        data = self.decode_stream_payload(payload)
+        data = self.decode_stream_payload(payload, out)
         return info, data
 
     def stop_session(self):
-        pass
+        cmd = {"cmd": "stop_streaming"}
+        self._send_cmd(cmd)
+
+        t0 = time()
+        while time() - t0 < self._link.timeout:
+            header, _ = self._recv_frame()
+            if self.handle_stop_header(header):
+                break
+        else:
+            raise ClientError
+
+        self._link.timeout = self._link.DEFAULT_TIMEOUT
+
+    def handle_stop_header(self, header):
+        status = header["status"]
+        if status == "ok":  # got streaming data
+            return False
+        elif status != self.STOP_STATUS:
+            raise ClientError
+
+        self._session_ready = False
+
+        log.debug("stopped streaming")
+
+        return True
 
     def decode_stream_header(self, header):
         pass
 
-    def decode_stream_payload(self, payload):
+    def decode_stream_payload(self, payload, out=None):
         pass
 
+    def _decode_stream_payload(self, payload, byteorder, out=None):
+        if not payload:
+            return None
+
+        squeeze = self.squeeze and self._num_sensors == 1
+
+        if self._mode == Mode.SPARSE:
+            if squeeze:
+                shape = (self._sweeps_per_frame, -1)
+            else:
+                shape = (self._num_sensors, self._sweeps_per_frame, -1)
+        else:
+            if squeeze:
+                shape = (-1,)
+            else:
+                shape = (self._num_sensors, -1)
+
+        if self._mode in (Mode.SPARSE, Mode.IQ, Mode.ENVELOPE, Mode.POWER_BINS):
+            return decode_data_buffer(payload, self._mode, shape, byteorder, self.dtype, out)
+
+        # Fallback
+        data = np.frombuffer(payload, dtype=byteorder + "u2").reshape(shape)
+
+        if out is None:
+            return data
+
+        np.copyto(out, data)
+        return out
+
 
 class JsonProtocolStreamingServer(JsonProtocolBase):
-    def __init__(self, link, squeeze):
+    STOP_STATUS = "end"
+
+    def __init__(self, link, squeeze, dtype="float64"):
         super().__init__(link)
         self._squeeze = squeeze
+        self.dtype = dtype
 
     def setup_session(self, config):
         if isinstance(config, dict):
@@ -137,19 +226,8 @@ class JsonProtocolStreamingServer(JsonProtocolBase):
 
         return cmd
 
-    def init_session(self, retry=True):
-        if self._session_cmd is None:
-            raise ClientError
-
-        self._send_cmd(self._session_cmd)
-        header, _ = self._recv_frame()
-
-        if header["status"] == "error":
-            if retry:
-                return self.init_session(retry=False)
-            else:
-                raise SessionSetupError
-        elif header["status"] != "ok":
+    def handle_session_header(self, header):
+        if header["status"] != "ok":
             raise ClientError("got unexpected header")
 
         log.debug("session initialized")
@@ -159,29 +237,6 @@ class JsonProtocolStreamingServer(JsonProtocolBase):
 
         return info
 
-    def stop_session(self):
-        cmd = {"cmd": "stop_streaming"}
-        self._send_cmd(cmd)
-
-        t0 = time()
-        while time() - t0 < self._link.timeout:
-            header, _ = self._recv_frame()
-            status = header["status"]
-            if status == "end":
-                break
-            elif status == "ok":  # got streaming data
-                continue
-            else:
-                raise ClientError
-        else:
-            raise ClientError
-
-        self._link.timeout = self._link.DEFAULT_TIMEOUT
-
-        self._session_ready = False
-
-        log.debug("stopped streaming")
-
     def decode_stream_header(self, header):
         raw_infos = header["result_info"]
         mapped_infos = [{} for _ in raw_infos]
@@ -200,34 +255,8 @@ class JsonProtocolStreamingServer(JsonProtocolBase):
         else:
             return mapped_infos
 
-    def decode_stream_payload(self, payload):
-        if not payload:
-            return None
-
-        squeeze = self.squeeze and self._num_sensors == 1
-
-        if self._mode == Mode.SPARSE:
-            data = np.frombuffer(payload, dtype=">u2").astype("float")
-
-            if squeeze:
-                shape = (self._sweeps_per_frame, -1)
-            else:
-                shape = (self._num_sensors, self._sweeps_per_frame, -1)
-
-            return data.reshape(shape)
-
-        if self._mode == Mode.IQ:
-            data = np.frombuffer(payload, dtype=">i2").astype("float")
-            data = data.reshape((-1, 2)).view(dtype="complex").flatten()
-        elif self._mode in (Mode.ENVELOPE, Mode.POWER_BINS):
-            data = np.frombuffer(payload, dtype=">u2").astype("float")
-        else:  # Fallback
-            data = np.frombuffer(payload, dtype=">u2")
-
-        if not squeeze:
-            data = data.reshape((self._num_sensors, -1))
-
-        return data
+    def decode_stream_payload(self, payload, out=None):
+        return self._decode_stream_payload(payload, ">", out)
 
     def _get_dict_for_config(self, config):
         d = {}
@@ -276,9 +305,12 @@ class JsonProtocolStreamingServer(JsonProtocolBase):
 
 
 class JsonProtocolExplorationServer(JsonProtocolBase):
-    def __init__(self, link, squeeze):
+    STOP_STATUS = "stop"
+
+    def __init__(self, link, squeeze, dtype="float64"):
         super().__init__(link)
         self._squeeze = squeeze
+        self.dtype = dtype
 
     def get_system_info(self):
         self._send_cmd({"cmd": "get_system_info"})
@@ -287,6 +319,9 @@ class JsonProtocolExplorationServer(JsonProtocolBase):
         except links.LinkError as e:
             raise ClientError("no response from server") from e
 
+        return self.handle_system_info_header(header)
+
+    def handle_system_info_header(self, header):
         if header["status"] != "ok":
             raise ClientError(f"system_info error {header}")
 
@@ -364,19 +399,8 @@ class JsonProtocolExplorationServer(JsonProtocolBase):
 
         return cmd
 
-    def init_session(self, retry=True):
-        if self._session_cmd is None:
-            raise ClientError
-
-        self._send_cmd(self._session_cmd)
-        header, _ = self._recv_frame()
-
-        if header["status"] == "error":
-            if retry:
-                return self.init_session(retry=False)
-            else:
-                raise SessionSetupError
-        elif header["status"] != "ok":
+    def handle_session_header(self, header):
+        if header["status"] != "ok":
             raise ClientError("got unexpected header")
 
         log.debug("session initialized")
@@ -395,29 +419,6 @@ class JsonProtocolExplorationServer(JsonProtocolBase):
 
         return info
 
-    def stop_session(self):
-        cmd = {"cmd": "stop_streaming"}
-        self._send_cmd(cmd)
-
-        t0 = time()
-        while time() - t0 < self._link.timeout:
-            header, _ = self._recv_frame()
-            status = header["status"]
-            if status == "stop":
-                break
-            elif status == "ok":  # got streaming data
-                continue
-            else:
-                raise ClientError
-        else:
-            raise ClientError
-
-        self._link.timeout = self._link.DEFAULT_TIMEOUT
-
-        self._session_ready = False
-
-        log.debug("stopped streaming")
-
     def decode_stream_header(self, header):
         raw_infos = header["result_info"][0]
         mapped_infos = [{} for _ in raw_infos]
@@ -436,34 +437,8 @@ class JsonProtocolExplorationServer(JsonProtocolBase):
         else:
             return mapped_infos
 
-    def decode_stream_payload(self, payload):
-        if not payload:
-            return None
-
-        squeeze = self.squeeze and self._num_sensors == 1
-
-        if self._mode == Mode.SPARSE:
-            data = np.frombuffer(payload, dtype="<u2").astype("float")
-
-            if squeeze:
-                shape = (self._sweeps_per_frame, -1)
-            else:
-                shape = (self._num_sensors, self._sweeps_per_frame, -1)
-
-            return data.reshape(shape)
-
-        if self._mode == Mode.IQ:
-            data = np.frombuffer(payload, dtype="<i2").astype("float")
-            data = data.reshape((-1, 2)).view(dtype="complex").flatten()
-        elif self._mode in (Mode.ENVELOPE, Mode.POWER_BINS):
-            data = np.frombuffer(payload, dtype="<u2").astype("float")
-        else:  # Fallback
-            data = np.frombuffer(payload, dtype="<u2")
-
-        if not squeeze:
-            data = data.reshape((self._num_sensors, -1))
-
-        return data
+    def decode_stream_payload(self, payload, out=None):
+        return self._decode_stream_payload(payload, "<", out)
 
     @property
     def squeeze(self):
@@ -493,23 +468,18 @@ class SocketClient(BaseClient):
 
         msg = self._protocol.get_version()
         if msg:
-            startstr = "server version v"
-            if not msg.startswith(startstr):
-                log.warning("server version unknown")
+            version_info = decode_version_msg(msg)
+            if version_info is None:
                 return info
 
-            server_version_str = msg[len(startstr) :].strip()
-            info.update(decode_version_str(server_version_str))
+            info.update(version_info)
 
-            self._protocol = JsonProtocolStreamingServer(self._link, self.squeeze)
+            self._protocol = JsonProtocolStreamingServer(self._link, self.squeeze, self.dtype)
             info["board_sensor_count"] = self._protocol.get_sensor_count()
         else:
-            self._protocol = JsonProtocolExplorationServer(self._link, self.squeeze)
+            self._protocol = JsonProtocolExplorationServer(self._link, self.squeeze, self.dtype)
             system_info = self._protocol.get_system_info()
-            info.update(decode_version_str(system_info["rss_version"][1:]))
-            info["sensor"] = system_info["sensor"]
-            info["board_sensor_count"] = system_info["sensor_count"]
-            info["hw"] = system_info["hw"]
+            info.update(decode_system_info(system_info))
 
         return info
 
@@ -529,8 +499,11 @@ class SocketClient(BaseClient):
     def _start_session(self):
         self._protocol.start_session()
 
-    def _get_next(self):
-        return self._protocol.get_next()
+    def _get_next(self, out=None):
+        return self._protocol.get_next(out)
+
+    def _has_pending_frame(self):
+        return self._link.data_available()
 
     def _stop_session(self):
         self._protocol.stop_session()
@@ -553,6 +526,31 @@ class SocketClient(BaseClient):
             self._protocol.squeeze = squeeze
         self._squeeze = squeeze
 
+    @BaseClient.dtype.setter
+    def dtype(self, dtype):
+        BaseClient.dtype.fset(self, dtype)
+
+        if getattr(self, "_protocol", None):
+            self._protocol.dtype = dtype
+
+
+def decode_version_msg(msg):
+    startstr = "server version v"
+    if not msg.startswith(startstr):
+        log.warning("server version unknown")
+        return None
+
+    server_version_str = msg[len(startstr) :].strip()
+    return decode_version_str(server_version_str)
+
+
+def decode_system_info(system_info):
+    info = decode_version_str(system_info["rss_version"][1:])
+    info["sensor"] = system_info["sensor"]
+    info["board_sensor_count"] = system_info["sensor_count"]
+    info["hw"] = system_info["hw"]
+    return info
+
 
 CONFIG_TO_CMD_KEY_MAP = {
     "sensor": "sensors",
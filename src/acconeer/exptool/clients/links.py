@@ -2,6 +2,7 @@ import logging
 import multiprocessing as mp
 import platform
 import queue
+import select
 import signal
 import socket
 import traceback
@@ -20,6 +21,201 @@ class LinkError(ClientError):
     pass
 
 
+class RecvBuffer:
+    """
+    Receive buffer which is consumed from the front by moving an offset, rather than by
+    copying the remaining data on every read.
+
+    The buffer is only compacted when there's no room left at the end, and then always into a
+    new bytearray, so that memoryviews handed out by ``take()`` are never overwritten.
+    """
+
+    def __init__(self, capacity=2 ** 16):
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._end = 0
+        self._scan_delim = None
+        self._scan_pos = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def reserve(self, num_bytes):
+        if len(self._buf) - self._end < num_bytes:
+            size = len(self)
+            capacity = max(len(self._buf), 2 * (size + num_bytes))
+            buf = bytearray(capacity)
+            buf[:size] = memoryview(self._buf)[self._start : self._end]
+            self._scan_pos -= self._start
+            self._buf = buf
+            self._start = 0
+            self._end = size
+
+        return memoryview(self._buf)[self._end :]
+
+    def commit(self, num_bytes):
+        self._end += num_bytes
+
+    def extend(self, data):
+        n = len(data)
+        self.reserve(n)[:n] = data
+        self._end += n
+
+    def find(self, bs):
+        if bs != self._scan_delim:
+            self._scan_delim = bs
+            self._scan_pos = self._start
+
+        i = self._buf.find(bs, max(self._start, self._scan_pos), self._end)
+
+        if i < 0:
+            self._scan_pos = max(self._start, self._end - len(bs) + 1)
+            return -1
+
+        return i - self._start
+
+    def take(self, num_bytes):
+        view = memoryview(self._buf)[self._start : self._start + num_bytes]
+        self._start += num_bytes
+        return view
+
+
+class SharedMemoryRing:
+    """
+    Single producer, single consumer byte ring in shared memory, used to move data between
+    processes without pickling it. A pipe is used as a doorbell to wake up the consumer when
+    the ring goes from empty to non-empty.
+
+    Must be handed to the other process as an argument when the process is created.
+    """
+
+    DEFAULT_CAPACITY = 2 ** 22
+    _POLL_INTERVAL = 0.0005
+    _LEN_FIELD_SIZE = 4
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._data = mp.RawArray("B", capacity)
+        self._counters = mp.RawArray("Q", 2)  # Total number of bytes written and read
+        self._doorbell_recv, self._doorbell_send = mp.Pipe(duplex=False)
+        self._view = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_view"] = None  # Memoryviews can't be pickled, recreated on first use
+        return state
+
+    def write(self, data, timeout=None):
+        return self._write([data], timeout)
+
+    def write_message(self, *parts, timeout=None):
+        size = sum(len(part) for part in parts)
+        header = size.to_bytes(self._LEN_FIELD_SIZE, "little")
+        return self._write([header, *parts], timeout)
+
+    def read_into(self, recv_buffer, timeout=None):
+        if not self._wait(timeout):
+            return 0
+
+        written, read = self._counters
+        num_bytes = written - read
+        view = recv_buffer.reserve(num_bytes)
+        self._copy_out(read, view[:num_bytes])
+        view.release()
+        recv_buffer.commit(num_bytes)
+        self._counters[1] = written
+        return num_bytes
+
+    def read_message(self, timeout=None):
+        if not self._wait(timeout):
+            return None
+
+        read = self._counters[1]
+        header = bytearray(self._LEN_FIELD_SIZE)
+        self._copy_out(read, header)
+        message = bytearray(int.from_bytes(header, "little"))
+        self._copy_out(read + self._LEN_FIELD_SIZE, message)
+        self._counters[1] = read + self._LEN_FIELD_SIZE + len(message)
+        return message
+
+    def has_data(self):
+        written, read = self._counters
+        return written > read
+
+    def clear(self):
+        self._counters[1] = self._counters[0]
+
+    def _write(self, parts, timeout):
+        size = sum(len(part) for part in parts)
+
+        if size > self._capacity:
+            raise ValueError("data does not fit in ring")
+
+        t0 = time()
+        while True:
+            written, read = self._counters
+
+            if self._capacity - (written - read) >= size:
+                break
+
+            if timeout is not None and time() - t0 > timeout:
+                return False
+
+            sleep(self._POLL_INTERVAL)
+
+        pos = written
+        for part in parts:
+            self._copy_in(pos, part)
+            pos += len(part)
+
+        self._counters[0] = pos
+
+        # Only ring the doorbell if the consumer had read everything, as it may then be waiting.
+        # Otherwise it will find the new data before it waits again, and a stalled consumer
+        # can't fill up the pipe and block the producer.
+        if self._counters[1] == written:
+            self._doorbell_send.send_bytes(b"\x00")
+
+        return True
+
+    def _wait(self, timeout):
+        deadline = None if timeout is None else time() + timeout
+
+        while True:
+            while self._doorbell_recv.poll():
+                self._doorbell_recv.recv_bytes()
+
+            if self.has_data():
+                return True
+
+            remaining = None if deadline is None else max(deadline - time(), 0)
+
+            if not self._doorbell_recv.poll(remaining):
+                return self.has_data()
+
+    def _get_view(self):
+        if self._view is None:
+            self._view = memoryview(self._data).cast("B")
+
+        return self._view
+
+    def _copy_in(self, pos, data):
+        view = self._get_view()
+        pos %= self._capacity
+        n = len(data)
+        first = min(n, self._capacity - pos)
+        view[pos : pos + first] = data[:first]
+        view[: n - first] = data[first:]
+
+    def _copy_out(self, pos, out):
+        view = self._get_view()
+        pos %= self._capacity
+        n = len(out)
+        first = min(n, self._capacity - pos)
+        out[:first] = view[pos : pos + first]
+        out[first:n] = view[: n - first]
+
+
 class BaseLink(metaclass=ABCMeta):
     DEFAULT_TIMEOUT = 2
 
@@ -39,6 +235,9 @@ class BaseLink(metaclass=ABCMeta):
     def recv_until(self, bs):
         pass
 
+    def recv_view(self, num_bytes):
+        return memoryview(self.recv(num_bytes))
+
     @abstractmethod
     def send(self, data):
         pass
@@ -47,6 +246,9 @@ class BaseLink(metaclass=ABCMeta):
     def disconnect(self):
         pass
 
+    def data_available(self):
+        return False
+
     @property
     def timeout(self):
         return self._timeout
@@ -84,48 +286,54 @@ class SocketLink(BaseLink):
             self._sock = None
             raise LinkError("failed to connect") from e
 
-        self._buf = bytearray()
+        self._buf = RecvBuffer()
 
     def recv(self, num_bytes):
+        return bytearray(self.recv_view(num_bytes))
+
+    def recv_view(self, num_bytes):
         while len(self._buf) < num_bytes:
-            try:
-                r = self._sock.recv(self._CHUNK_SIZE)
-            except OSError as e:
-                raise LinkError from e
-            self._buf.extend(r)
+            self._recv_into_buf()
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.take(num_bytes)
 
     def recv_until(self, bs):
         t0 = time()
         while True:
-            try:
-                i = self._buf.index(bs)
-            except ValueError:
-                pass
-            else:
+            i = self._buf.find(bs)
+
+            if i >= 0:
                 break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-            try:
-                r = self._sock.recv(self._CHUNK_SIZE)
-            except OSError as e:
-                raise LinkError from e
-            self._buf.extend(r)
+            self._recv_into_buf()
 
-        i += 1
-        data = self._buf[:i]
-        self._buf = self._buf[i:]
+        return bytearray(self._buf.take(i + len(bs)))
 
-        return data
+    def _recv_into_buf(self):
+        view = self._buf.reserve(self._CHUNK_SIZE)
+
+        try:
+            n = self._sock.recv_into(view, self._CHUNK_SIZE)
+        except OSError as e:
+            raise LinkError from e
+        finally:
+            view.release()
+
+        self._buf.commit(n)
 
     def send(self, data):
         self._sock.sendall(data)
 
+    def data_available(self):
+        if len(self._buf) > 0:
+            return True
+
+        readable, _, _ = select.select([self._sock], [], [], 0)
+        return bool(readable)
+
     def disconnect(self):
         self._sock.shutdown(socket.SHUT_RDWR)
         self._sock.close()
@@ -190,6 +398,9 @@ class SerialLink(BaseSerialLink):
         self._ser.close()
         self._ser = None
 
+    def data_available(self):
+        return self._ser.in_waiting > 0
+
     @property
     def baudrate(self):
         return self._baudrate
@@ -219,7 +430,7 @@ class ExploreSerialLink(SerialLink):
         self._ser.port = self._port
         self._ser.rtscts = self._flowcontrol
         self._ser.open()
-        self._buf = bytearray()
+        self._buf = RecvBuffer()
 
         if platform.system().lower() == "windows":
             self._ser.set_buffer_size(rx_size=10 ** 6, tx_size=10 ** 6)
@@ -227,45 +438,43 @@ class ExploreSerialLink(SerialLink):
         self.send_break()
 
     def recv(self, num_bytes):
+        return bytearray(self.recv_view(num_bytes))
+
+    def recv_view(self, num_bytes):
         t0 = time()
         while len(self._buf) < num_bytes:
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-            try:
-                r = bytearray(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
-            except OSError as e:
-                raise LinkError from e
-            self._buf.extend(r)
+            self._read_into_buf()
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.take(num_bytes)
 
     def recv_until(self, bs):
         t0 = time()
         while True:
-            try:
-                i = self._buf.index(bs)
-            except ValueError:
-                pass
-            else:
+            i = self._buf.find(bs)
+
+            if i >= 0:
                 break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-            try:
-                r = bytearray(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
-            except OSError as e:
-                raise LinkError from e
-            self._buf.extend(r)
+            self._read_into_buf()
 
-        i += 1
-        data = self._buf[:i]
-        self._buf = self._buf[i:]
+        return bytearray(self._buf.take(i + len(bs)))
 
-        return data
+    def _read_into_buf(self):
+        try:
+            r = self._ser.read(self._SERIAL_READ_PACKET_SIZE)
+        except OSError as e:
+            raise LinkError from e
+
+        self._buf.extend(r)
+
+    def data_available(self):
+        return len(self._buf) > 0 or self._ser.in_waiting > 0
 
 
 class SerialProcessLink(BaseSerialLink):
@@ -275,7 +484,7 @@ class SerialProcessLink(BaseSerialLink):
         self._process = None
 
     def connect(self):
-        self._recv_queue = mp.Queue()
+        self._recv_ring = SharedMemoryRing()
         self._send_queue = mp.Queue()
         self._flow_event = mp.Event()
         self._error_event = mp.Event()
@@ -283,7 +492,7 @@ class SerialProcessLink(BaseSerialLink):
         args = (
             self._port,
             self._baudrate,
-            self._recv_queue,
+            self._recv_ring,
             self._send_queue,
             self._flow_event,
             self._error_event,
@@ -313,9 +522,12 @@ class SerialProcessLink(BaseSerialLink):
 
         log.debug("connect - successful")
 
-        self._buf = bytearray()
+        self._buf = RecvBuffer()
 
     def recv(self, num_bytes):
+        return bytearray(self.recv_view(num_bytes))
+
+    def recv_view(self, num_bytes):
         self.__empty_queue_into_buf()
 
         t0 = time()
@@ -325,40 +537,31 @@ class SerialProcessLink(BaseSerialLink):
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.take(num_bytes)
 
     def recv_until(self, bs):
         self.__empty_queue_into_buf()
 
-        n = len(bs)
-        si = 0
         t0 = time()
         while True:
-            buf_size = len(self._buf)
-            if buf_size >= n:
-                try:
-                    i = self._buf.index(bs, si)
-                except ValueError:
-                    pass
-                else:
-                    break
+            i = self._buf.find(bs)
 
-                si = buf_size - n + 1
+            if i >= 0:
+                break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
             self.__get_into_buf()
 
-        data = self._buf[: i + n]
-        self._buf = self._buf[i + n :]
-        return data
+        return bytearray(self._buf.take(i + len(bs)))
 
     def send(self, data):
         self._send_queue.put(data)
 
+    def data_available(self):
+        return len(self._buf) > 0 or self._recv_ring.has_data()
+
     def disconnect(self):
         if self._process.exitcode is None:
             self._flow_event.clear()
@@ -374,23 +577,16 @@ class SerialProcessLink(BaseSerialLink):
             raise LinkError("failed to disconnect")
 
     def __empty_queue_into_buf(self):
-        while True:
-            try:
-                data = self._recv_queue.get_nowait()
-            except queue.Empty:
-                break
-
-            self._buf.extend(data)
+        self._recv_ring.read_into(self._buf, timeout=0)
 
     def __get_into_buf(self):
         try:
-            data = self._recv_queue.get(timeout=self._timeout)
-        except queue.Empty:
-            raise LinkError("recv timeout")
+            num_bytes = self._recv_ring.read_into(self._buf, timeout=self._timeout)
         except InterruptedError:
             return  # fixes interrupt issue on Windows
 
-        self._buf.extend(data)
+        if num_bytes == 0:
+            raise LinkError("recv timeout")
 
     @property
     def baudrate(self):
@@ -405,12 +601,12 @@ class SerialProcessLink(BaseSerialLink):
             self._send_queue.put(("baudrate", new_baudrate))
 
 
-def serial_process_program(port, baud, recv_q, send_q, flow_event, error_event):
+def serial_process_program(port, baud, recv_ring, send_q, flow_event, error_event):
     log.debug("serial communication process started")
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
     try:
-        _serial_process_program(port, baud, recv_q, send_q, flow_event, error_event)
+        _serial_process_program(port, baud, recv_ring, send_q, flow_event, error_event)
     except Exception:
         error_event.set()
         flow_event.set()
@@ -419,24 +615,22 @@ def serial_process_program(port, baud, recv_q, send_q, flow_event, error_event):
         traceback.print_exc()
         print("\n\n")
 
-    recv_q.close()
     send_q.close()
 
 
-def _serial_process_program(port, baud, recv_q, send_q, flow_event, error_event):
-    ser = serial.Serial(port=port, baudrate=baud, timeout=0, exclusive=True)
+def _serial_process_program(port, baud, recv_ring, send_q, flow_event, error_event):
+    # The read timeout bounds the latency of sending when nothing is received
+    ser = serial.Serial(port=port, baudrate=baud, timeout=0.0025, exclusive=True)
     flow_event.set()
     while flow_event.is_set():
-        received = bytearray()
-        while True:
-            data = bytearray(ser.read(4096))
-            if len(data) == 0:
+        received = bytearray(ser.read(max(ser.in_waiting, 1)))
+        while ser.in_waiting > 0:
+            received.extend(ser.read(ser.in_waiting))
+
+        while received and flow_event.is_set():
+            if recv_ring.write(received, timeout=0.1):
                 break
-            received.extend(data)
-        if len(received) > 0:
-            recv_q.put(received)
 
-        sent = False
         while True:
             try:
                 x = send_q.get_nowait()
@@ -448,9 +642,5 @@ def _serial_process_program(port, baud, recv_q, send_q, flow_event, error_event)
                 ser.baudrate = val
             else:
                 ser.write(x)
-                sent = True
-
-        if not sent:
-            sleep(0.0025)
 
     ser.close()
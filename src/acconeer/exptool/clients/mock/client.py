@@ -4,7 +4,7 @@ from time import sleep, time
 import numpy as np
 
 from acconeer.exptool import SDK_VERSION
-from acconeer.exptool.clients.base import BaseClient, ClientError, decode_version_str
+from acconeer.exptool.clients.base import BaseClient, ClientError, cast_data, decode_version_str
 from acconeer.exptool.configs import BaseServiceConfig
 from acconeer.exptool.modes import Mode
 
@@ -62,7 +62,7 @@ class MockClient(BaseClient):
         self._start_time = time()
         self._data_count = 0
 
-    def _get_next(self):
+    def _get_next(self, out=None):
         config = self._config
 
         self._data_count += 1
@@ -80,16 +80,27 @@ class MockClient(BaseClient):
             info[MISSED_GET_NEXT_KEY] = self._missed
         else:
             idx_offset = max(0, (num_sensors - 1) / 2)
-            out = [self._mocker.get_next(*args, i - idx_offset) for i in range(num_sensors)]
-            info, data = zip(*out)
+            results = [self._mocker.get_next(*args, i - idx_offset) for i in range(num_sensors)]
+            info, data = zip(*results)
             data = np.array(data)
             info = list(info)
 
             for d in info:
                 d[MISSED_GET_NEXT_KEY] = self._missed
 
+        if self.dtype != "float64":
+            data = cast_data(data, config.mode, self.dtype)
+
+        if out is not None:
+            np.copyto(out, data)
+            data = out
+
         return info, data
 
+    def _has_pending_frame(self):
+        next_data_capture_time = (self._data_count + 1) / self._update_rate
+        return next_data_capture_time <= time() - self._start_time
+
     def _stop_session(self):
         pass
 
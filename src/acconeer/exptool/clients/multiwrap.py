@@ -1,22 +1,43 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
 import numpy as np
 
 from acconeer.exptool.clients.base import BaseClient, ClientError
 
 
 class MultiClientWrapper(BaseClient):
-    def __init__(self, clients, **kwargs):
+    """
+    Wraps one client per board into a single client, with the boards as sensors 1, 2, ...
+
+    With ``threaded=True``, the clients are connected, set up and started in parallel, and
+    each client is drained by its own thread into a queue holding at most ``queue_size``
+    frames. Frames are then matched up by arrival time: frames arriving more than
+    ``alignment_tolerance`` seconds (defaults to half the update period) before the latest
+    frame of the other clients are dropped. Each result info then also has the keys
+    ``arrival_time`` and ``num_dropped_frames``, the number of frames dropped for that client
+    since the previous result.
+    """
+
+    def __init__(self, clients, threaded=False, alignment_tolerance=None, queue_size=10, **kwargs):
         kwargs["squeeze"] = False
         super().__init__(**kwargs)
         self.clients = clients
+        self._threaded = threaded
+        self._alignment_tolerance = alignment_tolerance
+        self._queue_size = queue_size
+        self._tolerance = None
+        self._readers = []
 
         for client in clients:
             client.squeeze = False
+            client.dtype = self.dtype
 
     def _connect(self):
-        for client in self.clients:
-            info = client.connect()
-
-        return info
+        infos = self._map(lambda client: client.connect())
+        return infos[-1]
 
     def _setup_session(self, config):
         expected_sensors = [i + 1 for i in range(len(self.clients))]
@@ -26,31 +47,180 @@ class MultiClientWrapper(BaseClient):
 
         config.sensor = 1
 
-        for client in self.clients:
-            info = client.setup_session(config)
+        try:
+            infos = self._map(lambda client: client.setup_session(config))
+        finally:
+            config.sensor = expected_sensors
+
+        update_rate = getattr(config, "update_rate", None)
 
-        config.sensor = expected_sensors
+        if self._alignment_tolerance is not None:
+            self._tolerance = self._alignment_tolerance
+        elif update_rate:
+            self._tolerance = 0.5 / update_rate
+        else:
+            self._tolerance = None
 
-        return info
+        return infos[-1]
 
     def _start_session(self):
-        for client in self.clients:
-            client.start_session()
+        self._map(lambda client: client.start_session())
+
+        if self._threaded:
+            self._stop_event = threading.Event()
+            self._readers = [
+                _ClientReader(c, self._queue_size, self._stop_event) for c in self.clients
+            ]
+
+            for reader in self._readers:
+                reader.start()
+
+    def _get_next(self, out=None):
+        if self._threaded:
+            results = self._get_next_aligned()
+        else:
+            results = []
+            for i, client in enumerate(self.clients):
+                if out is None:
+                    results.append(client.get_next())
+                else:
+                    results.append(client.get_next(out=out[i : i + 1]))
 
-    def _get_next(self):
         all_info = []
         all_data = []
-        for client in self.clients:
-            info, data = client.get_next()
+        for i, (info, data) in enumerate(results):
             all_info.extend(info)
             all_data.append(data)
 
+            if self._threaded and out is not None:
+                np.copyto(out[i : i + 1], data)
+
+        if out is not None:
+            return all_info, out
+
         return all_info, np.concatenate(all_data)
 
+    def _get_next_aligned(self):
+        heads = [reader.get() for reader in self._readers]
+
+        if self._tolerance is not None:
+            while True:
+                latest = max(t for t, _, _ in heads)
+                late = [i for i, (t, _, _) in enumerate(heads) if t < latest - self._tolerance]
+
+                if not late:
+                    break
+
+                for i in late:
+                    self._readers[i].count_dropped_frame()
+                    heads[i] = self._readers[i].get()
+
+        results = []
+        for reader, (arrival_time, info, data) in zip(self._readers, heads):
+            num_dropped_frames = reader.pop_num_dropped_frames()
+
+            for sensor_info in info:
+                sensor_info["arrival_time"] = arrival_time
+                sensor_info["num_dropped_frames"] = num_dropped_frames
+
+            results.append((info, data))
+
+        return results
+
+    def _has_pending_frame(self):
+        if self._threaded:
+            return all(reader.has_frame() for reader in self._readers)
+
+        return all(client._has_pending_frame() for client in self.clients)
+
     def _stop_session(self):
-        for client in self.clients:
-            client.stop_session()
+        if self._threaded:
+            self._stop_event.set()
+
+            for reader in self._readers:
+                reader.join()
+
+            self._readers = []
+
+        self._map(lambda client: client.stop_session())
 
     def _disconnect(self):
-        for client in self.clients:
-            client.disconnect()
+        self._map(lambda client: client.disconnect())
+
+    def _map(self, fn):
+        if not self._threaded:
+            return [fn(client) for client in self.clients]
+
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            futures = [executor.submit(fn, client) for client in self.clients]
+
+        return [future.result() for future in futures]
+
+    @BaseClient.dtype.setter
+    def dtype(self, dtype):
+        BaseClient.dtype.fset(self, dtype)
+
+        for client in getattr(self, "clients", []):
+            client.dtype = dtype
+
+
+class _ClientReader(threading.Thread):
+    def __init__(self, client, queue_size, stop_event):
+        super().__init__(daemon=True)
+        self._client = client
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = stop_event
+        self._lock = threading.Lock()
+        self._num_dropped_frames = 0
+        self._error = None
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                info, data = self._client.get_next()
+            except Exception as e:
+                self._put(e)
+                break
+
+            self._put((time(), info, data))
+
+    def _put(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+
+            try:  # Drop the oldest frame to make room
+                self._queue.get_nowait()
+            except queue.Empty:
+                continue
+
+            self.count_dropped_frame()
+
+    def get(self):
+        # The reader has stopped after an error, so every later call raises it as well
+        if self._error is None:
+            item = self._queue.get()
+
+            if not isinstance(item, Exception):
+                return item
+
+            self._error = item
+
+        raise ClientError("exception raised in client reader thread") from self._error
+
+    def count_dropped_frame(self):
+        with self._lock:
+            self._num_dropped_frames += 1
+
+    def pop_num_dropped_frames(self):
+        with self._lock:
+            n = self._num_dropped_frames
+            self._num_dropped_frames = 0
+
+        return n
+
+    def has_frame(self):
+        return not self._queue.empty()
@@ -57,10 +57,12 @@ class RegBaseClient(BaseClient):
         self._mode = mode
         self._config = config
 
-        self._write_reg("main_control", "stop")
-        self._write_reg("mode_selection", mode)
-        self._write_reg("update_rate", 0)
-        self._write_reg("sensor_power_mode", "active")
+        reg_vals = [
+            ("main_control", "stop"),
+            ("mode_selection", mode),
+            ("update_rate", 0),
+            ("sensor_power_mode", "active"),
+        ]
 
         for key, reg in regmap.get_config_key_to_reg_map(mode).items():
             val = getattr(config, key)
@@ -68,23 +70,25 @@ class RegBaseClient(BaseClient):
             if val is None:
                 continue
 
-            self._write_reg(reg, val)
+            reg_vals.append((reg, val))
 
-        self._write_reg("streaming_control", self._streaming_control_val)
+        reg_vals.append(("streaming_control", self._streaming_control_val))
+        self._write_regs(reg_vals)
 
         self._write_reg("main_control", "create")
         self._wait_status(regmap.STATUS_FLAGS.CREATED)
 
-        info = {}
-        info_regs = regmap.get_session_info_regs(mode)
-        for reg in info_regs:
+        info_regs = {}
+        for reg in regmap.get_session_info_regs(mode):
             k = reg.stripped_name
             k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
 
             if k is None:
                 continue
 
-            info[k] = self._read_reg(reg)
+            info_regs[k] = reg
+
+        info = dict(zip(info_regs.keys(), self._read_regs(info_regs.values())))
 
         if MODE_INFOS[mode].fixed_buffer_size:
             self._data_length = info.get("data_length")
@@ -140,6 +144,22 @@ class RegBaseClient(BaseClient):
 
         return supported_modes
 
+    def _decode_frame(self, info, buffer, out=None):
+        sweeps_per_frame = getattr(self._config, "sweeps_per_frame", None)
+
+        args = (buffer, self._mode, sweeps_per_frame)
+
+        if self.squeeze:
+            data = protocol.decode_output_buffer(*args, out=out, dtype=self.dtype)
+            return info, data
+
+        if out is None:
+            data = protocol.decode_output_buffer(*args, dtype=self.dtype)
+            return [info], np.expand_dims(data, 0)
+
+        protocol.decode_output_buffer(*args, out=out[0], dtype=self.dtype)
+        return [info], out
+
     @property
     def _buffer_size(self):  # B
         if self._data_length is None or self._mode is None:
@@ -154,6 +174,13 @@ class RegBaseClient(BaseClient):
 
         return self._buffer_size * 8 * self._config.update_rate
 
+    def _read_regs(self, regs):
+        return [self._read_reg(reg) for reg in regs]
+
+    def _write_regs(self, reg_vals):
+        for reg, val in reg_vals:
+            self._write_reg(reg, val)
+
     @abc.abstractmethod
     def _read_reg(self, reg):
         pass
@@ -166,9 +193,11 @@ class RegBaseClient(BaseClient):
 class UARTClient(RegBaseClient):
     DEFAULT_BASE_BAUDRATE = 115200
     CONNECT_ROUTINE_TIMEOUT = 0.6
+    MAX_PIPELINED_REQUESTS = 16
 
     def __init__(self, port, **kwargs):
         self.override_baudrate = kwargs.pop("override_baudrate", None)
+        self._pipelined = kwargs.pop("pipelined", False)
 
         super().__init__(**kwargs)
 
@@ -252,36 +281,27 @@ class UARTClient(RegBaseClient):
         # self._wait_status(regmap.STATUS_FLAGS.ACTIVATED)
         # TODO: how can we handle streaming and reading/writing registers at the same time?
 
-    def _get_next(self):
-        packet = self._recv_packet(allow_recovery_skip=True)
+    def _get_next(self, out=None):
+        packet = self._recv_packet(allow_recovery_skip=True, structured_result_info=True)
 
         if not isinstance(packet, protocol.StreamData):
             raise ClientError("got unexpected type of frame")
 
-        info = {}
-        for addr, enc_val in packet.result_info:
-            try:
-                reg = regmap.get_reg(addr, self._mode)
-                val = reg.decode(enc_val)
-            except (protocol.ProtocolError, ValueError):
+        if packet.result_info is None:
+            info = {}
+        else:
+            decoder = regmap.get_result_info_decoder(self._mode)
+            info, unknown = decoder.decode(packet.result_info)
+
+            for addr, val in unknown.tolist():
+                enc_val = val.to_bytes(protocol.REG_SIZE, protocol.BO)
                 log.info("got unknown reg val in result info")
                 log.info("addr: {}, value: {}".format(addr, fmt_enc_val(enc_val)))
-            else:
-                k = reg.stripped_name
-                k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
 
-                if k is None:
-                    continue
+        return self._decode_frame(info, packet.buffer, out)
 
-                info[k] = val
-
-        sweeps_per_frame = getattr(self._config, "sweeps_per_frame", None)
-        data = protocol.decode_output_buffer(packet.buffer, self._mode, sweeps_per_frame)
-
-        if self.squeeze:
-            return info, data
-        else:
-            return [info], np.expand_dims(data, 0)
+    def _has_pending_frame(self):
+        return self._link.data_available()
 
     def _stop_session(self):
         self._write_reg("main_control", "stop", expect_response=False)
@@ -318,7 +338,7 @@ class UARTClient(RegBaseClient):
 
         log.debug("recv buf r res: addr: 0x{:02x} len: {}".format(addr, len(res.buffer)))
 
-        return res.buffer
+        return bytearray(res.buffer)
 
     def _read_reg(self, reg, mode=None):
         mode = self._mode if mode is None else mode
@@ -365,11 +385,72 @@ class UARTClient(RegBaseClient):
 
             log.debug("recv reg w res: ok")
 
+    def _read_regs(self, regs):
+        if not self._pipelined:
+            return super()._read_regs(regs)
+
+        regs = [regmap.get_reg(reg, self._mode) for reg in regs]
+        reqs = [protocol.RegReadRequest(reg.addr) for reg in regs]
+        responses = self._send_pipelined_packets(reqs)
+
+        vals = []
+        failed = []
+        for reg, res in zip(regs, responses):
+            if not isinstance(res, protocol.RegReadResponse) or res.reg_val.addr != reg.addr:
+                log.debug("pipelined reg r failed: {}".format(reg.full_name))
+                failed.append(reg.full_name)
+                continue
+
+            vals.append(reg.decode(res.reg_val.val))
+
+        if failed:
+            raise ClientError("reg read failed: {}".format(", ".join(failed)))
+
+        return vals
+
+    def _write_regs(self, reg_vals):
+        if not self._pipelined:
+            return super()._write_regs(reg_vals)
+
+        regs = []
+        reqs = []
+        for reg, val in reg_vals:
+            reg = regmap.get_reg(reg, self._mode)
+            regs.append(reg)
+            reqs.append(protocol.RegWriteRequest(protocol.RegVal(reg.addr, reg.encode(val))))
+
+        responses = self._send_pipelined_packets(reqs)
+
+        failed = []
+        for reg, req, res in zip(regs, reqs, responses):
+            if not isinstance(res, protocol.RegWriteResponse) or res.reg_val != req.reg_val:
+                log.debug("pipelined reg w failed: {}".format(reg.full_name))
+                failed.append(reg.full_name)
+
+        if failed:
+            raise ClientError("reg write failed: {}".format(", ".join(failed)))
+
+    def _send_pipelined_packets(self, packets):
+        """Sends requests back to back, in batches, and returns the responses in order"""
+
+        responses = []
+        for i in range(0, len(packets), self.MAX_PIPELINED_REQUESTS):
+            batch = packets[i : i + self.MAX_PIPELINED_REQUESTS]
+            frames = [protocol.insert_packet_into_frame(packet) for packet in batch]
+            self._link.send(b"".join(frames))
+
+            log.debug("sent {} pipelined requests".format(len(batch)))
+
+            for _ in batch:
+                responses.append(self._recv_packet())
+
+        return responses
+
     def _send_packet(self, packet):
         frame = protocol.insert_packet_into_frame(packet)
         self._link.send(frame)
 
-    def _recv_packet(self, allow_recovery_skip=False):
+    def _recv_packet(self, allow_recovery_skip=False, structured_result_info=False):
         buf_1 = self._link.recv(1 + protocol.LEN_FIELD_SIZE)
 
         start_marker = buf_1[0]
@@ -378,7 +459,7 @@ class UARTClient(RegBaseClient):
         if start_marker != protocol.START_MARKER:
             raise ClientError("got invalid frame (incorrect start marker)")
 
-        buf_2 = self._link.recv(packet_len + 2)
+        buf_2 = self._link.recv_view(packet_len + 2)
         packet = buf_2[:-1]
         end_marker = buf_2[-1]
 
@@ -388,6 +469,7 @@ class UARTClient(RegBaseClient):
 
             log.debug("got invalid frame (incorrect end marker), attempting recovery")
 
+            buf_2 = bytearray(buf_2)
             buf_2.extend(self._link.recv(1 + protocol.LEN_FIELD_SIZE))
 
             si = 0
@@ -412,7 +494,7 @@ class UARTClient(RegBaseClient):
 
             log.warning("successfully recovered from corrupt frame")
 
-        return protocol.unpack_packet(packet)
+        return protocol.unpack_packet(packet, structured_result_info)
 
     def _handshake(self):
         self._write_reg("main_control", "stop", expect_response=False)
@@ -437,7 +519,7 @@ class PollingUARTClient(UARTClient):
         self._write_reg("main_control", "activate")
         self._wait_status(regmap.STATUS_FLAGS.ACTIVATED)
 
-    def _get_next(self):
+    def _get_next(self, out=None):
         if self._measure_on_call:
             self._write_reg("main_control", "clear_status")
 
@@ -458,27 +540,25 @@ class PollingUARTClient(UARTClient):
 
         buffer = self._read_buf_raw()
 
-        info = {}
-        info_regs = regmap.get_data_info_regs(self._config.mode)
-        for reg in info_regs:
+        info_regs = {}
+        for reg in regmap.get_data_info_regs(self._config.mode):
             k = reg.stripped_name
             k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
 
             if k is None:
                 continue
 
-            info[k] = self._read_reg(reg)
+            info_regs[k] = reg
+
+        info = dict(zip(info_regs.keys(), self._read_regs(info_regs.values())))
 
         if not self._measure_on_call:
             self._write_reg("main_control", "clear_status")
 
-        sweeps_per_frame = getattr(self._config, "sweeps_per_frame", None)
-        data = protocol.decode_output_buffer(buffer, self._mode, sweeps_per_frame)
+        return self._decode_frame(info, buffer, out)
 
-        if self.squeeze:
-            return info, data
-        else:
-            return [info], np.expand_dims(data, 0)
+    def _has_pending_frame(self):
+        return False  # Every frame is polled for
 
     def _stop_session(self):
         self._write_reg("main_control", "stop")
@@ -488,6 +568,8 @@ class PollingUARTClient(UARTClient):
 
 
 class SPIClient(RegBaseClient):
+    _FRAME_WAIT_INTERVAL = 0.05
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -496,9 +578,11 @@ class SPIClient(RegBaseClient):
     def _connect(self):
         self._cmd_queue = mp.Queue()
         self._data_queue = mp.Queue()
+        self._data_ring = links.SharedMemoryRing()
         args = (
             self._cmd_queue,
             self._data_queue,
+            self._data_ring,
         )
         self._proc = SPICommProcess(*args)
         self._proc.start()
@@ -532,24 +616,37 @@ class SPIClient(RegBaseClient):
 
         self.__cmd_proc("start_session")
 
-    def _get_next(self):
-        ret_cmd, ret_args = self._data_queue.get()
-        if ret_cmd == "error":
-            raise ClientError("exception raised in SPI communcation process")
-        elif ret_cmd != "get_next":
-            raise ClientError
-        info, buffer = ret_args
+    def _get_next(self, out=None):
+        while True:
+            message = self._data_ring.read_message(timeout=self._FRAME_WAIT_INTERVAL)
 
-        sweeps_per_frame = getattr(self._config, "sweeps_per_frame", None)
-        data = protocol.decode_output_buffer(buffer, self._mode, sweeps_per_frame)
+            if message is not None:
+                break
 
-        if self.squeeze:
-            return info, data
-        else:
-            return [info], np.expand_dims(data, 0)
+            # Errors in the process are still reported through the data queue
+            if not self._data_queue.empty():
+                ret_cmd, _ = self._data_queue.get()
+                if ret_cmd == "error":
+                    raise ClientError("exception raised in SPI communcation process")
+                else:
+                    raise ClientError
+
+        num_info = int.from_bytes(message[:2], protocol.BO)
+        info_end = 2 + num_info * protocol.RESULT_INFO_DTYPE.itemsize
+        records = np.frombuffer(
+            message, dtype=protocol.RESULT_INFO_DTYPE, count=num_info, offset=2
+        )
+        info, _ = regmap.get_result_info_decoder(self._mode).decode(records)
+        buffer = memoryview(message)[info_end:]
+
+        return self._decode_frame(info, buffer, out)
+
+    def _has_pending_frame(self):
+        return self._data_ring.has_data()
 
     def _stop_session(self):
         self.__cmd_proc("stop_session")
+        self._data_ring.clear()
 
         mask = regmap.STATUS_FLAGS.CREATED | regmap.STATUS_FLAGS.ACTIVATED
         self._wait_status(0, mask=mask)
@@ -613,10 +710,11 @@ class SPIClient(RegBaseClient):
 
 
 class SPICommProcess(mp.Process):
-    def __init__(self, cmd_q, data_q):
+    def __init__(self, cmd_q, data_q, frame_ring):
         super().__init__(daemon=True)
         self.cmd_q = cmd_q
         self.data_q = data_q
+        self.frame_ring = frame_ring
         self.mode = None
 
     def run(self):
@@ -655,8 +753,13 @@ class SPICommProcess(mp.Process):
 
     def poll(self):
         while self.cmd_q.empty():
-            ret = self.get_next()
-            self.data_q.put(("get_next", ret))
+            records, buffer = self.get_next()
+            num_info = len(records) // protocol.RESULT_INFO_DTYPE.itemsize
+            header = num_info.to_bytes(2, protocol.BO)
+
+            while not self.frame_ring.write_message(header, records, buffer, timeout=0.1):
+                if not self.cmd_q.empty():
+                    return
 
     def get_next(self):
         poll_t = time()
@@ -680,20 +783,18 @@ class SPICommProcess(mp.Process):
         else:
             buffer = bytearray()
 
-        info = {}
-        info_regs = regmap.get_data_info_regs(self.mode)
-        for reg in info_regs:
-            k = reg.stripped_name
-            k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
-
+        # The data info is passed on as raw result info records, decoded in the main process
+        records = bytearray()
+        for addr, (k, _) in regmap.get_data_info_decoders(self.mode).items():
             if k is None:
                 continue
 
-            info[k] = self.read_reg(reg, do_log=False)
+            records.append(addr)
+            records.extend(self.read_reg_raw(addr, do_log=False))
 
         self.write_reg("main_control", "clear_status", do_log=False)
 
-        return info, buffer
+        return records, buffer
 
     def connect(self):
         self.dev = libft4222.Device()
@@ -2,6 +2,7 @@ from collections import namedtuple
 
 import numpy as np
 
+from acconeer.exptool.clients.base import decode_data_buffer
 from acconeer.exptool.modes import Mode, get_mode
 
 
@@ -25,6 +26,7 @@ LEN_FIELD_SIZE = 2
 MIN_FRAME_SIZE = 1 + LEN_FIELD_SIZE + 1 + 1
 BYTEORDER = "little"
 BO = BYTEORDER
+BYTEORDER_PREFIX = "<"
 
 START_MARKER = 0xCC
 END_MARKER = 0xCD
@@ -40,8 +42,10 @@ STREAM_BUFFER = 0xFE
 
 MAIN_BUFFER_ADDR = 0xE8
 
+RESULT_INFO_DTYPE = np.dtype([("addr", "u1"), ("val", "<u4")])  # Packed (addr, enc val) pairs
 
-def unpack_packet(packet):
+
+def unpack_packet(packet, structured_result_info=False):
     if len(packet) < 1:
         raise ProtocolError("package is too short")
 
@@ -55,7 +59,7 @@ def unpack_packet(packet):
     elif packet_type == BUF_READ_RESPONSE:
         return unpack_buf_read_res_segment(segment)
     elif packet_type == STREAM_PACKET:
-        return unpack_stream_data_segment(segment)
+        return unpack_stream_data_segment(segment, structured_result_info)
     else:
         raise ProtocolError("unknown packet type")
 
@@ -86,7 +90,7 @@ def unpack_buf_read_res_segment(segment):
     return BufferReadResponse(buf_addr, buffer)
 
 
-def unpack_stream_data_segment(segment):
+def unpack_stream_data_segment(segment, structured_result_info=False):
     result_info = None
     buffer = None
     rest = segment
@@ -106,6 +110,10 @@ def unpack_stream_data_segment(segment):
             if part_len % s != 0:
                 raise ProtocolError("invalid package length")
 
+            if structured_result_info:
+                result_info = np.frombuffer(part_data, dtype=RESULT_INFO_DTYPE)
+                continue
+
             result_info = []
             num_regs = part_len // s
             for i in range(num_regs):
@@ -188,19 +196,14 @@ def insert_packet_into_frame(packet):
     return frame
 
 
-def decode_output_buffer(buffer, mode, sweeps_per_frame=None):
+def decode_output_buffer(buffer, mode, sweeps_per_frame=None, out=None, dtype="float64"):
     mode = get_mode(mode)
 
-    if mode == Mode.POWER_BINS:
-        return np.frombuffer(buffer, dtype="<u2").astype("float")
-    elif mode == Mode.ENVELOPE:
-        return np.frombuffer(buffer, dtype="<u2").astype("float")
-    elif mode == Mode.IQ:
-        data = np.frombuffer(buffer, dtype="<i2").astype("float")
-        return data.reshape((-1, 2)).view(dtype="complex").flatten()
+    if mode in (Mode.POWER_BINS, Mode.ENVELOPE, Mode.IQ):
+        shape = (-1,)
     elif mode == Mode.SPARSE:
-        data = np.frombuffer(buffer, dtype="<u2").astype("float")
-        data = data.reshape((sweeps_per_frame, -1))
-        return data
+        shape = (sweeps_per_frame, -1)
     else:
         raise NotImplementedError
+
+    return decode_data_buffer(buffer, mode, shape, BYTEORDER_PREFIX, dtype, out)
@@ -4,6 +4,7 @@ import os
 from functools import partial, reduce
 
 import attr
+import numpy as np
 import yaml
 
 from acconeer.exptool import configs
@@ -108,6 +109,72 @@ class Register:
         return value
 
 
+class ResultInfoDecoder:
+    """Decodes the result info registers of a mode from an array of (addr, val) records"""
+
+    _BOOL, _FLOAT, _INT, _OTHER = range(4)
+
+    def __init__(self, decoders):  # {addr: (info key or None, reg)}
+        self._index = np.full(256, -1, dtype=int)
+        self._ignored = np.zeros(256, dtype=bool)
+        self._keys = []
+        self._regs = []
+
+        for addr, (k, reg) in decoders.items():
+            if k is None:
+                self._ignored[addr] = True
+                continue
+
+            self._index[addr] = len(self._keys)
+            self._keys.append(k)
+            self._regs.append(reg)
+
+        self._signed = np.array([r.data_type == DataType.INT32 for r in self._regs], dtype=bool)
+        self._scale = np.array([r.float_scale or 1.0 for r in self._regs])
+
+        self._kinds = []
+        for reg in self._regs:
+            if reg.data_type == DataType.BOOL:
+                self._kinds.append(self._BOOL)
+            elif reg.data_type in (DataType.ENUM, DataType.BITSET):
+                self._kinds.append(self._OTHER)
+            elif reg.float_scale is not None:
+                self._kinds.append(self._FLOAT)
+            else:
+                self._kinds.append(self._INT)
+
+    def decode(self, records):
+        """Returns the info dict and the records with unknown addresses"""
+
+        addrs = records["addr"]
+        idx = self._index[addrs]
+        known = idx >= 0
+        unknown = records[~known & ~self._ignored[addrs]]
+
+        idx = idx[known]
+        vals = records["val"][known].astype(np.int64)
+        vals = np.where(self._signed[idx] & (vals >= 2 ** 31), vals - 2 ** 32, vals)
+
+        columns = [
+            (vals != 0).tolist(),
+            (vals / self._scale[idx]).tolist(),
+            vals.tolist(),
+        ]
+
+        info = {}
+        for j, i in enumerate(idx.tolist()):
+            kind = self._kinds[i]
+
+            if kind == self._OTHER:
+                val = self._regs[i].decode(columns[self._INT][j].to_bytes(4, BO))
+            else:
+                val = columns[kind][j]
+
+            info[self._keys[i]] = val
+
+        return info, unknown
+
+
 PREFIX_TO_MODE_MAP = {
     "pb": Mode.POWER_BINS,
     "env": Mode.ENVELOPE,
@@ -165,33 +232,25 @@ ENUM_REMAP = {
 }
 
 REGISTERS = None
-
-
-def _match_reg_by_addr(addr, reg):
-    return reg.addr == addr
-
-
-def _match_reg_by_name(name, reg):
-    return name in (reg.full_name, reg.stripped_name)
+REGS_BY_ADDR = None  # {mode: {addr: [reg, ...]}}, built by load_yaml
+REGS_BY_NAME = None  # {mode: {full or stripped name: [reg, ...]}}, built by load_yaml
+REGS_FOR_MODE = None  # {mode: [reg, ...]}, built by load_yaml
+DATA_INFO_DECODERS = None  # {mode: {addr: (info key, reg)}}, built by load_yaml
+RESULT_INFO_DECODERS = None  # {mode: ResultInfoDecoder}, built by load_yaml
 
 
 def get_reg(value, mode=None):
     if isinstance(value, Register):
         return value
     elif isinstance(value, int):
-        match_fun = partial(_match_reg_by_addr, value)
+        index = REGS_BY_ADDR
     elif isinstance(value, str):
-        match_fun = partial(_match_reg_by_name, value)
+        index = REGS_BY_NAME
     else:
         raise ValueError
 
     mode = get_mode(mode)
-    matches = []
-
-    for reg in REGISTERS:
-        if match_fun(reg):
-            if mode is None or reg.modes is None or mode in reg.modes:
-                matches.append(reg)
+    matches = index[mode].get(value, [])
 
     if len(matches) < 1:
         raise ValueError("unknown reg: {}".format(value))
@@ -216,7 +275,7 @@ def get_regs_for_mode(mode):
         raise ValueError
 
     mode = get_mode(mode)
-    return [reg for reg in REGISTERS if reg.modes is None or mode in reg.modes]
+    return list(REGS_FOR_MODE[mode])
 
 
 def get_regs_for_mode_in_category(category, mode):
@@ -227,6 +286,14 @@ get_session_info_regs = partial(get_regs_for_mode_in_category, Category.SESSION_
 get_data_info_regs = partial(get_regs_for_mode_in_category, Category.DATA_INFO)
 
 
+def get_data_info_decoders(mode):  # {addr: (info key or None, reg)}
+    return DATA_INFO_DECODERS[get_mode(mode)]
+
+
+def get_result_info_decoder(mode):
+    return RESULT_INFO_DECODERS[get_mode(mode)]
+
+
 def get_config_key_to_reg_map(mode):  # {config_key: reg}
     mode = get_mode(mode)
     config_cls = configs.MODE_TO_CONFIG_CLASS_MAP[mode]
@@ -347,6 +414,47 @@ def load_yaml():
 
         REGISTERS.append(reg)
 
+    _build_index()
+
+
+def _build_index():
+    global REGS_BY_ADDR, REGS_BY_NAME, REGS_FOR_MODE, DATA_INFO_DECODERS, RESULT_INFO_DECODERS
+
+    REGS_BY_ADDR = {}
+    REGS_BY_NAME = {}
+    REGS_FOR_MODE = {}
+    DATA_INFO_DECODERS = {}
+    RESULT_INFO_DECODERS = {}
+
+    for mode in [None, *Mode]:
+        regs = [reg for reg in REGISTERS if mode is None or reg.modes is None or mode in reg.modes]
+        by_addr = {}
+        by_name = {}
+
+        for reg in regs:
+            by_addr.setdefault(reg.addr, []).append(reg)
+
+            for name in {reg.full_name, reg.stripped_name}:
+                by_name.setdefault(name, []).append(reg)
+
+        REGS_BY_ADDR[mode] = by_addr
+        REGS_BY_NAME[mode] = by_name
+        REGS_FOR_MODE[mode] = regs
+
+        if mode is None:
+            continue
+
+        decoders = {}
+        for reg in regs:
+            if reg.category != Category.DATA_INFO or len(by_addr[reg.addr]) > 1:
+                continue
+
+            k = STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+            decoders[reg.addr] = (k, reg)
+
+        DATA_INFO_DECODERS[mode] = decoders
+        RESULT_INFO_DECODERS[mode] = ResultInfoDecoder(decoders)
+
 
 load_yaml()
 
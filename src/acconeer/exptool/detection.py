@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def cfar_threshold(sweep, idx_cfar_pts, alpha, one_sided=False):
+    """
+    CFAR threshold of a sweep. The threshold at each depth is the mean of the sweep at the
+    given offsets ``idx_cfar_pts`` (in samples) before, and unless ``one_sided`` also after,
+    the depth, scaled by ``1 / alpha``. Depths without a full window are NaN.
+
+    All windows are gathered into one matrix and averaged along its rows, giving the same
+    floating point results as averaging each window separately.
+    """
+
+    sweep = np.asarray(sweep)
+    idx_cfar_pts = np.asarray(idx_cfar_pts)
+
+    threshold = np.full(sweep.shape, np.nan)
+
+    start_idx = int(np.max(idx_cfar_pts))
+    if one_sided:
+        rel_indexes = -idx_cfar_pts
+        end_idx = sweep.size
+    else:
+        rel_indexes = np.concatenate((-idx_cfar_pts, +idx_cfar_pts), axis=0)
+        end_idx = sweep.size - start_idx
+
+    if end_idx <= start_idx:
+        return threshold
+
+    idxs = np.arange(start_idx, end_idx)
+    windows = sweep[(idxs[:, None] + rel_indexes[None, :]).astype(int)]
+    threshold[idxs] = 1.0 / (alpha + 1e-10) * np.mean(windows, axis=1)
+
+    return threshold
+
+
+def find_peaks(sweep, threshold):
+    """
+    Returns the indexes of the peaks of a sweep above a threshold, in increasing order.
+
+    A peak is either a single point or a plateau of several equal points, all over their
+    threshold. The closest neighboring points on each side must have a lower value and be over
+    their threshold, so at least 3 points above threshold are needed. The index of a plateau
+    is its middle point, rounded up. The search ends where the threshold ends (becomes NaN).
+    """
+
+    if threshold is None or np.all(np.isnan(threshold)):
+        return []
+
+    sweep = np.asarray(sweep)
+    threshold = np.asarray(threshold)
+    n = len(sweep)
+
+    if n < 3:
+        return []
+
+    defined = ~np.isnan(threshold)
+    above = sweep > threshold
+
+    # The search ends at the first point after which the threshold isn't defined
+    (ends,) = np.nonzero(defined[:-2] & ~defined[2:])
+    end = ends[0] + 1 if len(ends) else n - 1
+
+    # Rising edges onto a point/plateau, from a point over threshold
+    d = np.arange(1, end)
+    d = d[above[d] & above[d - 1] & (sweep[d - 1] < sweep[d])]
+
+    # The first point after each plateau, which must be lower and over threshold, as must all
+    # points of the plateau
+    (changes,) = np.nonzero(sweep[1:] != sweep[:-1])
+    changes += 1
+    j = np.searchsorted(changes, d, side="right")
+    has_end = j < len(changes)
+    d = d[has_end]
+    e = changes[j[has_end]]
+
+    num_below_cum = np.cumsum(~above)
+    is_peak = (e <= n - 2) & (num_below_cum[e] == num_below_cum[d]) & (sweep[e] < sweep[d])
+
+    return (d[is_peak] + (e[is_peak] - d[is_peak]) // 2).tolist()
+
+
+def merge_peaks(peak_indexes, merge_max_range):
+    """
+    Merges peaks closer than ``merge_max_range`` to each other. Repeatedly, the peak with the
+    most neighbors within range (the first one if several) is merged with its neighbors into
+    their rounded mean. Returns the sorted peak indexes.
+    """
+
+    peaks = np.sort(np.asarray(peak_indexes, dtype=int))
+
+    while len(peaks) > 1:
+        # Peaks are sorted, so the neighbors of each peak are a contiguous range
+        lo = np.searchsorted(peaks, peaks - merge_max_range, side="right")
+        hi = np.searchsorted(peaks, peaks + merge_max_range, side="left")
+        num_neighbors = hi - lo
+
+        i_peak = np.argmax(num_neighbors)  # First of max
+
+        if num_neighbors[i_peak] <= 1:
+            break
+
+        merged_peak = int(round(np.mean(peaks[lo[i_peak] : hi[i_peak]])))
+        peaks = np.concatenate((peaks[: lo[i_peak]], peaks[hi[i_peak] :]))
+        peaks = np.insert(peaks, np.searchsorted(peaks, merged_peak), merged_peak)
+
+    return peaks.tolist()
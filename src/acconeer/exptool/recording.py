@@ -1,8 +1,16 @@
+import builtins
 import copy
 import datetime
 import json
+import os
+import queue
+import struct
+import threading
 import time
 import warnings
+import zipfile
+import zlib
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Optional, Union
 
@@ -15,6 +23,20 @@ from acconeer.exptool import configs, modes
 from acconeer.exptool.structs import configbase
 
 
+DATA_INFO_KEYS_FIELD = "data_info_keys"
+DATA_INFO_COLUMN_PREFIX = "data_info/"
+
+# Codecs are given as "none", "gzip", "gzip-<level 0-9>" or "lzf", optionally followed by
+# "+shuffle" for the byte-shuffle filter (HDF5 only), e.g. "gzip-1+shuffle"
+DEFAULT_CODEC = "gzip"
+JOURNAL_MAGIC = b"ACCJOURNAL1\n"
+_JOURNAL_ENTRY_HEADER = struct.Struct("<IIB")  # Payload length, CRC32 of payload, kind
+_JOURNAL_FRAME_HEADER = struct.Struct("<dI")  # Sample time, data info length
+_JOURNAL_JSON, _JOURNAL_FRAME = 0, 1
+
+BENCHMARK_CODECS = ["none", "gzip-1", "gzip", "gzip-9", "gzip+shuffle", "lzf", "lzf+shuffle"]
+
+
 @attr.s
 class Record:
     # Sensor session related (required):
@@ -22,7 +44,7 @@ class Record:
     sensor_config_dump = attr.ib(type=str)  # SensorConfig._dumps
     session_info = attr.ib(type=dict)  # save/restore with json.dumps/loads
     data = attr.ib(default=None)  # [np.array], saved as np.array, restore as is
-    data_info = attr.ib(type=list, factory=list)  # [[{...}]], save/restore with json.dumps/loads
+    data_info = attr.ib(type=list, factory=list)  # [[{...}]], saved columnar, see pack/unpack
 
     # Processing related (optional):
     module_key = attr.ib(type=Optional[str], default=None)
@@ -55,93 +77,810 @@ class Record:
         self._iter_index += 1
         return current_data_info, current_data
 
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("records can only be indexed by slices of frames")
+
+        sample_times = None if self.sample_times is None else self.sample_times[key]
+
+        return attr.evolve(
+            self,
+            data=self.data[key],
+            data_info=self.data_info[key],
+            sample_times=sample_times,
+        )
+
     @property
     def sensor_config(self):
         return configs.load(self.sensor_config_dump, self.mode)
 
 
-class Recorder:
-    def __init__(self, **kwargs):
-        sensor_config = kwargs.pop("sensor_config")
-        session_info = kwargs.pop("session_info")
-        module_key = kwargs.pop("module_key", None)
-        processing_config = kwargs.pop("processing_config", None)
-        rss_version = kwargs.pop("rss_version", None)
+class ColumnarDataInfo(Sequence):
+    """
+    Read-only data info of a loaded record, behaving like the usual list (frames) of lists
+    (sensors) of dicts. It's backed by one (frame, sensor) array per key, and the dicts of a
+    frame are only created when the frame is accessed.
+    """
 
-        mode = kwargs.pop("mode", sensor_config.mode)
+    def __init__(self, columns: dict, keys: list):
+        self.columns = columns
+        self.keys = list(keys)
 
-        self.max_len = kwargs.pop("max_len", None)
+    def __len__(self):
+        return len(self.columns[self.keys[0]]) if self.keys else 0
 
-        if kwargs:
-            key = next(iter(kwargs.keys()))
-            msg = "Recorder got an unexpected keyword argument '{}'".format(key)
-            raise TypeError(msg)
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarDataInfo({k: v[index] for k, v in self.columns.items()}, self.keys)
 
-        if not isinstance(sensor_config, configbase.SensorConfig):
-            raise TypeError("Unexpected sensor config type")
+        values = [_decode_column_values(self.columns[k][index]) for k in self.keys]
+        return [dict(zip(self.keys, sensor_values)) for sensor_values in zip(*values)]
 
-        if isinstance(processing_config, configbase.ProcessingConfig):
-            processing_config_dump = processing_config._dumps()
-        elif processing_config is None:
-            processing_config_dump = None
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "ColumnarDataInfo(keys={}, len={})".format(self.keys, len(self))
+
+    def tolist(self):
+        return _columns_to_data_info(self.columns, self.keys)
+
+
+class LazyRecordData:
+    """
+    Array-like data of a record opened with ``open(..., lazy=True)``. Nothing is read from
+    the file until accessed. Frames are then read and converted to float, as ``load()`` does,
+    a chunk at a time. Slicing frames gives a new lazy view; other indexing reads the frames
+    needed and returns an array.
+    """
+
+    _DEFAULT_CHUNK_SIZE = 2 ** 20  # B
+
+    def __init__(self, dataset, start=0, stop=None):
+        self._dataset = dataset
+        self._start = start
+        self._stop = len(dataset) if stop is None else stop
+
+        if np.isrealobj(dataset):
+            self.dtype = np.dtype("float")
         else:
-            raise TypeError("Unexpected processing config type")
-
-        self.record = Record(
-            mode=mode,
-            sensor_config_dump=sensor_config._dumps(),
-            session_info=copy.deepcopy(session_info),
-            module_key=module_key,
-            processing_config_dump=processing_config_dump,
-            rss_version=rss_version,
-            lib_version=acconeer.exptool.__version__,
-            timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
-        )
+            self.dtype = dataset.dtype
+
+        if dataset.chunks is not None:
+            self._chunk_len = dataset.chunks[0]
+        else:
+            frame_size = self.dtype.itemsize * int(np.prod(dataset.shape[1:]))
+            self._chunk_len = max(1, self._DEFAULT_CHUNK_SIZE // max(frame_size, 1))
+
+        self._cache_start = None
+        self._cache = None
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def shape(self):
+        return (len(self),) + self._dataset.shape[1:]
+
+    @property
+    def ndim(self):
+        return len(self._dataset.shape)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._get_frame(int(key))
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+
+            if step == 1:
+                stop = max(start, stop)
+                return LazyRecordData(self._dataset, self._start + start, self._start + stop)
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        frame_key = key[0] if key else slice(None)
+
+        if isinstance(frame_key, slice):  # Only read the frames needed
+            start, stop, step = frame_key.indices(len(self))
+            stop = max(start, stop)
+            frame_key = slice(None, None, step)
+            return self._read(start, stop)[(frame_key,) + tuple(key[1:])]
+
+        return np.asarray(self)[key]
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __array__(self, dtype=None):
+        data = self._read(0, len(self))
+        return data if dtype is None else data.astype(dtype)
+
+    def iter_chunks(self, max_frames=None):
+        """Yields the data as arrays of consecutive frames, at most one file chunk each"""
+
+        chunk_len = self._chunk_len if max_frames is None else min(self._chunk_len, max_frames)
+
+        for start in range(0, len(self), chunk_len):
+            yield self._read(start, min(start + chunk_len, len(self)))
+
+    def close(self):
+        self._dataset.file.close()
+
+    def _read(self, start, stop):
+        data = self._dataset[self._start + start : self._start + stop]
+        return data.astype(self.dtype, copy=False)
+
+    def _get_frame(self, index):
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+
+        index += self._start
+
+        if self._cache is None or not 0 <= index - self._cache_start < len(self._cache):
+            self._cache_start = index - index % self._chunk_len
+            cache_stop = min(self._cache_start + self._chunk_len, len(self._dataset))
+            self._cache = self._dataset[self._cache_start : cache_stop].astype(self.dtype)
+
+        return self._cache[index - self._cache_start]
+
+
+class Recorder:
+    """
+    Records frames in memory. With ``max_len`` set, only the latest ``max_len`` frames are
+    kept, in a preallocated ring buffer which is unrolled by ``close()``.
+    """
+
+    def __init__(self, **kwargs):
+        self.max_len = kwargs.pop("max_len", None)
 
+        self.record = _create_record(type(self).__name__, kwargs)
         self.record.data = []
         self.record.sample_times = []
 
+        self._num_samples = 0
+        self._data_ring = None
+        self._data_info_ring = None
+        self._sample_times_ring = None
+
     def sample(self, data_info: list, data: np.ndarray):
-        expected_num_dims = 3 if self.record.mode == modes.Mode.SPARSE else 2
-        if data.ndim != expected_num_dims:  # then assume data is squeezed
-            # unsqueeze (add back sensor dim)
-            data = data[None, ...]
-            data_info = [data_info]
+        data_info, data = _normalize_sample(self.record.mode, data_info, data)
+
+        if self.max_len is not None:
+            self._sample_into_ring(data_info, data)
+            return
 
         self.record.data.append(data.copy())
         self.record.data_info.append(copy.deepcopy(data_info))
 
         self.record.sample_times.append(time.time())
 
-        if self.max_len is not None and len(self.record.data) > self.max_len:
-            self.record.data.pop(0)
-            self.record.data_info.pop(0)
-            self.record.sample_times.pop(0)
+    def _sample_into_ring(self, data_info, data):
+        if self._data_ring is None:
+            self._data_ring = np.empty((self.max_len,) + data.shape, dtype=data.dtype)
+            self._data_info_ring = [None] * self.max_len
+            self._sample_times_ring = np.empty(self.max_len)
+
+        i = self._num_samples % self.max_len
+        self._data_ring[i] = data
+        self._data_info_ring[i] = [dict(info) for info in data_info]  # Values are scalars
+        self._sample_times_ring[i] = time.time()
+        self._num_samples += 1
 
     def close(self):
-        self.record.data = np.array(self.record.data)
-        self.record.sample_times = np.array(self.record.sample_times)
+        if self._data_ring is None:
+            self.record.data = np.array(self.record.data)
+            self.record.sample_times = np.array(self.record.sample_times)
+            return self.record
+
+        if self._num_samples <= self.max_len:
+            n = self._num_samples
+            self.record.data = self._data_ring[:n].copy()
+            self.record.sample_times = self._sample_times_ring[:n].copy()
+            self.record.data_info = self._data_info_ring[:n]
+        else:  # Unroll, starting at the oldest sample
+            i = self._num_samples % self.max_len
+            self.record.data = np.concatenate((self._data_ring[i:], self._data_ring[:i]))
+            self.record.sample_times = np.concatenate(
+                (self._sample_times_ring[i:], self._sample_times_ring[:i])
+            )
+            self.record.data_info = self._data_info_ring[i:] + self._data_info_ring[:i]
+
+        self._data_ring = None
+        self._data_info_ring = None
+        self._sample_times_ring = None
+        self._num_samples = 0
         return self.record
 
 
-def save(filename: Union[str, Path], record: Record):
+class StreamingRecorder:
+    """
+    Recorder writing to an HDF5 file while recording, instead of keeping everything in memory.
+
+    Frames are buffered and appended to the file every ``flush_interval`` frames, so a crash
+    loses at most that many frames. Takes the same keyword arguments as ``Recorder``, except
+    ``max_len``. The finished file is read with ``load()``.
+    """
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        flush_interval: int = 100,
+        codec: str = DEFAULT_CODEC,
+        **kwargs,
+    ):
+        self.record = _create_record(type(self).__name__, kwargs)
+        self._open(filename, flush_interval, codec, _pack_metadata(self.record))
+
+    @classmethod
+    def _from_packed_metadata(cls, filename, packed_metadata, flush_interval, codec):
+        self = cls.__new__(cls)
+        self.record = None
+        self._open(filename, flush_interval, codec, packed_metadata)
+        return self
+
+    def _open(self, filename, flush_interval, codec, packed_metadata):
+        filename = str(filename)
+
+        if not filename.lower().endswith(".h5"):
+            filename = filename + ".h5"
+
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.codec = codec
+        self.num_frames = 0
+
+        self._data_buffer = None
+        self._data_info_buffer = []
+        self._sample_times_buffer = []
+        self._data_info_keys = None
+        self._codec_kwargs = _get_h5_codec_kwargs(codec)
+
+        self._file = h5py.File(filename, "w")
+
+        for k, v in packed_metadata.items():
+            _create_h5_dataset(self._file, k, v)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sample(self, data_info: list, data: np.ndarray):
+        data_info, data = _normalize_sample(self.record.mode, data_info, data)
+        self._append(data_info, data, time.time())
+
+    def _append(self, data_info, data, sample_time):
+        if self._data_buffer is None:
+            self._data_buffer = np.empty((self.flush_interval,) + data.shape, dtype=data.dtype)
+            self._data_info_keys = list(data_info[0].keys())
+
+            if self._data_info_keys:
+                keys_dump = json.dumps(self._data_info_keys)
+                _create_h5_dataset(self._file, DATA_INFO_KEYS_FIELD, keys_dump)
+
+            chunk_shape = _get_chunk_shape(data.shape, data.dtype, self.flush_interval)
+            self._file.create_dataset(
+                "data",
+                shape=(0,) + data.shape,
+                maxshape=(None,) + data.shape,
+                dtype=data.dtype,
+                chunks=chunk_shape,
+                **self._codec_kwargs,
+            )
+            self._file.create_dataset(
+                "sample_times",
+                shape=(0,),
+                maxshape=(None,),
+                dtype="float64",
+                chunks=chunk_shape[:1],
+            )
+
+        if any(list(info.keys()) != self._data_info_keys for info in data_info):
+            raise ValueError("data info keys changed during recording")
+
+        self._data_buffer[len(self._sample_times_buffer)] = data
+        self._data_info_buffer.append(data_info)
+        self._sample_times_buffer.append(sample_time)
+
+        if len(self._sample_times_buffer) >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        n = len(self._sample_times_buffer)
+
+        if n == 0:
+            return
+
+        _append_to_h5_dataset(self._file["data"], self._data_buffer[:n])
+        _append_to_h5_dataset(self._file["sample_times"], np.array(self._sample_times_buffer))
+
+        columns = _data_info_to_columns(self._data_info_buffer, self._data_info_keys)
+        for key, column in columns.items():
+            name = DATA_INFO_COLUMN_PREFIX + key
+
+            if name not in self._file:
+                self._file.create_dataset(
+                    name,
+                    shape=(0,) + column.shape[1:],
+                    maxshape=(None,) + column.shape[1:],
+                    dtype=_get_h5_dtype(column),
+                    chunks=True,
+                    **self._codec_kwargs,
+                )
+
+            _append_to_h5_dataset(self._file[name], column)
+
+        self.num_frames += n
+        self._data_info_buffer = []
+        self._sample_times_buffer = []
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self.flush()
+
+        if self.num_frames == 0:
+            self._file.create_dataset("data", data=np.zeros(0))
+            self._file.create_dataset("sample_times", data=np.zeros(0))
+
+        if not self._data_info_keys:  # Nothing to store columnar
+            num_sensors = self._file["data"].shape[1] if self.num_frames else 0
+            data_info = [[{}] * num_sensors] * self.num_frames
+            _create_h5_dataset(self._file, "data_info", json.dumps(data_info))
+
+        self._file.close()
+        self._file = None
+
+
+class RotatingRecorder:
+    """
+    Recorder splitting a recording into numbered files, ``0001.h5``, ``0002.h5``, ..., in
+    ``directory``. A new file is started every ``frames_per_file`` frames and/or
+    ``seconds_per_file`` seconds.
+
+    Finished records are saved by a background thread, so ``sample()`` doesn't wait for the
+    file writes. At most ``queue_size`` records wait to be saved. If the writer can't keep up,
+    ``sample()`` blocks until there's room, which shows in ``metrics``. Takes the same keyword
+    arguments as ``Recorder``, except ``max_len``.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        frames_per_file: Optional[int] = None,
+        seconds_per_file: Optional[float] = None,
+        file_format: str = "h5",
+        codec: str = DEFAULT_CODEC,
+        queue_size: int = 2,
+        **kwargs,
+    ):
+        if frames_per_file is None and seconds_per_file is None:
+            raise ValueError("frames_per_file and/or seconds_per_file must be given")
+
+        if file_format not in ["h5", "npz"]:
+            raise ValueError("Unknown file format '{}'".format(file_format))
+
+        if "max_len" in kwargs:
+            raise TypeError("RotatingRecorder got an unexpected keyword argument 'max_len'")
+
+        _parse_codec(codec)  # Fail early on unknown codecs
+
+        self.directory = Path(directory)
+        self.frames_per_file = frames_per_file
+        self.seconds_per_file = seconds_per_file
+        self.file_format = file_format
+        self.codec = codec
+        self.filenames = []
+
+        self._recorder_kwargs = kwargs
+        self._recorder = self._create_recorder()
+        self._num_frames_in_file = 0
+        self._file_start_time = None
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._error = None
+        self._closed = False
+
+        self._num_files_written = 0
+        self._write_time = 0.0
+        self._blocked_time = 0.0
+        self._num_blocked = 0
+        self._max_queue_len = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sample(self, data_info: list, data: np.ndarray):
+        self._raise_writer_error()
+
+        now = time.time()
+
+        if self._file_start_time is None:
+            self._file_start_time = now
+
+        self._recorder.sample(data_info, data)
+        self._num_frames_in_file += 1
+
+        full = self.frames_per_file is not None and (
+            self._num_frames_in_file >= self.frames_per_file
+        )
+        expired = self.seconds_per_file is not None and (
+            now - self._file_start_time >= self.seconds_per_file
+        )
+
+        if full or expired:
+            self.rotate()
+
+    def rotate(self):
+        """Ends the current file, if it has any frames, and queues it to be saved"""
+
+        if self._num_frames_in_file == 0:
+            return
+
+        record = self._recorder.close()
+        filename = self.directory.joinpath(
+            "{:04}.{}".format(len(self.filenames) + 1, self.file_format)
+        )
+        self.filenames.append(filename)
+
+        self._recorder = self._create_recorder()
+        self._num_frames_in_file = 0
+        self._file_start_time = None
+
+        self._put((filename, record))
+
+    def close(self):
+        """Saves the remaining frames and waits for all files to be written"""
+
+        if self._closed:
+            return self.filenames
+
+        self.rotate()
+        self._put(None)
+        self._writer.join()
+        self._closed = True
+
+        self._raise_writer_error()
+
+        return self.filenames
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Writer statistics: the number of files written and the time spent writing them, the
+        current and highest number of queued records, and how many times and for how long
+        ``sample()`` has been blocked by a full queue.
+        """
+
+        with self._lock:
+            return {
+                "num_files_written": self._num_files_written,
+                "write_time": self._write_time,
+                "queue_len": self._queue.qsize(),
+                "max_queue_len": self._max_queue_len,
+                "num_blocked": self._num_blocked,
+                "blocked_time": self._blocked_time,
+            }
+
+    def _create_recorder(self):
+        kwargs = dict(self._recorder_kwargs)
+
+        if self.frames_per_file is not None:  # Preallocated, and never wraps around
+            kwargs["max_len"] = self.frames_per_file
+
+        return Recorder(**kwargs)
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            t0 = time.time()
+            self._queue.put(item)
+
+            with self._lock:
+                self._num_blocked += 1
+                self._blocked_time += time.time() - t0
+
+        with self._lock:
+            self._max_queue_len = max(self._max_queue_len, self._queue.qsize())
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            if self._error is not None:  # Keep draining so that sample() never blocks
+                continue
+
+            filename, record = item
+            t0 = time.time()
+
+            try:
+                save(filename, record, codec=self.codec)
+            except Exception as e:
+                self._error = e
+                continue
+
+            with self._lock:
+                self._num_files_written += 1
+                self._write_time += time.time() - t0
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            raise RuntimeError("failed to write record") from self._error
+
+
+class JournalRecorder:
+    """
+    Recorder appending frames to a binary journal file as they're sampled, so that a power cut
+    or crash during a recording only loses the latest frames. The journal is synced to disk
+    every ``sync_interval`` seconds. Use ``recover()`` to turn a journal, finished or not, into
+    a regular record. Takes the same keyword arguments as ``Recorder``, except ``max_len``.
+
+    The journal starts with ``JOURNAL_MAGIC`` followed by entries of a header (payload length,
+    CRC32 of the payload, kind) and a payload. The first entry holds the record metadata as
+    JSON, and the second the frame shape and dtype. The rest are frames, each the sample time,
+    the data info as JSON and the raw data.
+    """
+
+    def __init__(self, filename: Union[str, Path], sync_interval: float = 1.0, **kwargs):
+        self.filename = str(filename)
+        self.sync_interval = sync_interval
+        self.record = _create_record(type(self).__name__, kwargs)
+        self.num_frames = 0
+
+        self._frame_format = None
+        self._buffer = bytearray(JOURNAL_MAGIC)
+        self._last_sync_time = time.time()
+
+        self._file = builtins.open(self.filename, "wb")
+        self._append_json(_pack_metadata(self.record))
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sample(self, data_info: list, data: np.ndarray):
+        data_info, data = _normalize_sample(self.record.mode, data_info, data)
+
+        frame_format = {"dtype": data.dtype.str, "shape": list(data.shape)}
+
+        if self._frame_format is None:
+            self._frame_format = frame_format
+            self._append_json(frame_format)
+        elif frame_format != self._frame_format:
+            raise ValueError("data shape or dtype changed during recording")
+
+        now = time.time()
+        info_dump = json.dumps(data_info).encode()
+        payload = b"".join(
+            [
+                _JOURNAL_FRAME_HEADER.pack(now, len(info_dump)),
+                info_dump,
+                np.ascontiguousarray(data).tobytes(),
+            ]
+        )
+        self._append(_JOURNAL_FRAME, payload)
+        self.num_frames += 1
+
+        if now - self._last_sync_time >= self.sync_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered frames to the journal and syncs it to disk"""
+
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync_time = time.time()
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def _append_json(self, obj):
+        self._append(_JOURNAL_JSON, json.dumps(obj).encode())
+
+    def _append(self, kind, payload):
+        self._buffer += _JOURNAL_ENTRY_HEADER.pack(len(payload), zlib.crc32(payload), kind)
+        self._buffer += payload
+
+
+def _create_record(recorder_name, kwargs) -> Record:
+    sensor_config = kwargs.pop("sensor_config")
+    session_info = kwargs.pop("session_info")
+    module_key = kwargs.pop("module_key", None)
+    processing_config = kwargs.pop("processing_config", None)
+    rss_version = kwargs.pop("rss_version", None)
+
+    mode = kwargs.pop("mode", sensor_config.mode)
+
+    if kwargs:
+        key = next(iter(kwargs.keys()))
+        msg = "{} got an unexpected keyword argument '{}'".format(recorder_name, key)
+        raise TypeError(msg)
+
+    if not isinstance(sensor_config, configbase.SensorConfig):
+        raise TypeError("Unexpected sensor config type")
+
+    if isinstance(processing_config, configbase.ProcessingConfig):
+        processing_config_dump = processing_config._dumps()
+    elif processing_config is None:
+        processing_config_dump = None
+    else:
+        raise TypeError("Unexpected processing config type")
+
+    return Record(
+        mode=mode,
+        sensor_config_dump=sensor_config._dumps(),
+        session_info=copy.deepcopy(session_info),
+        module_key=module_key,
+        processing_config_dump=processing_config_dump,
+        rss_version=rss_version,
+        lib_version=acconeer.exptool.__version__,
+        timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
+    )
+
+
+def _normalize_sample(mode, data_info, data):
+    if mode == modes.Mode.IQ and not np.iscomplexobj(data):
+        data = data[..., 0] + 1j * data[..., 1]  # I/Q pairs from a client with dtype="raw"
+
+    expected_num_dims = 3 if mode == modes.Mode.SPARSE else 2
+    if data.ndim != expected_num_dims:  # then assume data is squeezed
+        # unsqueeze (add back sensor dim)
+        data = data[None, ...]
+        data_info = [data_info]
+
+    return data_info, data
+
+
+def _get_chunk_shape(frame_shape, dtype, max_frames, max_chunk_size=2 ** 20):
+    frame_size = int(np.prod(frame_shape)) * np.dtype(dtype).itemsize
+    num_frames = max(1, min(max_frames, max_chunk_size // max(frame_size, 1)))
+    return (num_frames,) + tuple(frame_shape)
+
+
+def _append_to_h5_dataset(dataset, values):
+    n = dataset.shape[0]
+    dataset.resize(n + len(values), axis=0)
+    dataset[n:] = values
+
+
+def _get_data_info_keys(data_info):
+    """Returns the keys of the info dicts if they can be stored columnar, otherwise None"""
+
+    if len(data_info) == 0 or len(data_info[0]) == 0:
+        return None
+
+    keys = list(data_info[0][0].keys())
+    num_sensors = len(data_info[0])
+
+    if not keys:
+        return None
+
+    for frame_info in data_info:
+        if len(frame_info) != num_sensors:
+            return None
+
+        for info in frame_info:
+            if info.keys() != data_info[0][0].keys():
+                return None
+
+    return keys
+
+
+def _data_info_to_columns(data_info, keys):
+    """Converts per frame and sensor info dicts to one (frame, sensor) array per key"""
+
+    shape = (len(data_info), len(data_info[0]))
+
+    columns = {}
+    for key in keys:
+        values = [info[key] for frame_info in data_info for info in frame_info]
+
+        try:
+            column = np.array(values)
+        except ValueError:  # Ragged
+            column = None
+
+        if column is None or column.dtype.kind not in "biuf":  # Store as JSON strings
+            column = np.array([json.dumps(v) for v in values])
+
+        columns[key] = column.reshape(shape + column.shape[1:])
+
+    return columns
+
+
+def _decode_column_values(column):
+    if column.dtype.kind in "biuf":
+        return column.tolist()
+
+    return np.vectorize(lambda v: json.loads(_to_str(v)), otypes=[object])(column).tolist()
+
+
+def _columns_to_data_info(columns, keys):
+    decoded = {key: _decode_column_values(columns[key]) for key in keys}
+
+    num_frames, num_sensors = columns[keys[0]].shape if keys else (0, 0)
+
+    return [
+        [{key: decoded[key][i][j] for key in keys} for j in range(num_sensors)]
+        for i in range(num_frames)
+    ]
+
+
+def _to_str(v):
+    return v.decode() if isinstance(v, bytes) else v
+
+
+def save(filename: Union[str, Path], record: Record, codec: str = DEFAULT_CODEC, catalog=None):
+    """
+    Saves the record, as HDF5 or NumPy depending on the file extension. If a ``catalog``, a
+    ``catalog.RecordCatalog`` or the filename of one, is given, the file is added to it.
+    """
+
     filename = str(filename)
 
     if filename.lower().endswith(".h5"):
-        return save_h5(filename, record)
+        save_h5(filename, record, codec=codec)
     elif filename.lower().endswith(".npz"):
-        return save_npz(filename, record)
+        save_npz(filename, record, codec=codec)
     elif filename.lower().endswith(".npy"):
         raise ValueError("Unknown file format '.npy', perhaps you meant '.npz'?")
     else:
         raise ValueError("Unknown file format")
 
+    if catalog is None:
+        return
+
+    from acconeer.exptool.catalog import RecordCatalog
+
+    if isinstance(catalog, RecordCatalog):
+        catalog.add(filename, record)
+    else:
+        with RecordCatalog(catalog) as c:
+            c.add(filename, record)
+
 
 def pack(record: Record) -> dict:
-    packed = attr.asdict(record, filter=lambda attr, v: attr.type in (str, Optional[str]))
-    packed["mode"] = record.mode.name.lower()
-    packed["session_info"] = json.dumps(record.session_info)
-    packed["data_info"] = json.dumps(record.data_info)
+    packed = _pack_metadata(record)
+    packed.update(_pack_data_info(record.data_info))
 
     data = np.array(record.data)
     if np.isrealobj(data):
@@ -159,36 +898,199 @@ def pack(record: Record) -> dict:
     return packed
 
 
-def save_npz(filename: Union[str, Path], record: Record):
+def _pack_data_info(data_info) -> dict:
+    if isinstance(data_info, ColumnarDataInfo):
+        keys = data_info.keys
+        columns = data_info.columns
+    else:
+        keys = _get_data_info_keys(data_info)
+
+        if keys is None:
+            return {"data_info": json.dumps(data_info)}
+
+        columns = _data_info_to_columns(data_info, keys)
+
+    packed = {DATA_INFO_KEYS_FIELD: json.dumps(keys)}
+
+    for key, column in columns.items():
+        packed[DATA_INFO_COLUMN_PREFIX + key] = np.asarray(column)
+
+    return packed
+
+
+def _pack_metadata(record: Record) -> dict:
+    packed = attr.asdict(record, filter=lambda attr, v: attr.type in (str, Optional[str]))
+    packed["mode"] = record.mode.name.lower()
+    packed["session_info"] = json.dumps(record.session_info)
+    return {k: v for k, v in packed.items() if v is not None}
+
+
+def save_npz(filename: Union[str, Path], record: Record, codec: str = DEFAULT_CODEC):
+    """
+    Saves the record as a NumPy ``.npz`` file. Only the "none" and "gzip" codecs are supported,
+    the latter stored as zip deflate with the given level.
+    """
+
     filename = str(filename)
 
     if not filename.lower().endswith(".npz"):
         filename = filename + ".npz"
 
+    compression, level, shuffle = _parse_codec(codec)
+
+    if compression == "lzf" or shuffle:
+        raise ValueError("codec '{}' is not supported for .npz files".format(codec))
+
+    if compression is None:
+        zip_kwargs = {"compression": zipfile.ZIP_STORED}
+    else:
+        zip_kwargs = {"compression": zipfile.ZIP_DEFLATED, "compresslevel": level}
+
     packed = pack(record)
-    np.savez_compressed(filename, **packed)
+
+    # Same layout as np.savez, which doesn't take a compression level
+    with zipfile.ZipFile(filename, "w", allowZip64=True, **zip_kwargs) as zf:
+        for k, v in packed.items():
+            with zf.open(k + ".npy", "w", force_zip64=True) as fp:
+                np.lib.format.write_array(fp, np.asanyarray(v), allow_pickle=False)
 
 
-def save_h5(filename: Union[str, Path], record: Record):
+def save_h5(filename: Union[str, Path], record: Record, codec: str = DEFAULT_CODEC):
     filename = str(filename)
 
     if not filename.lower().endswith(".h5"):
         filename = filename + ".h5"
 
+    if isinstance(record.data, LazyRecordData):
+        _save_h5_from_parts(filename, record, [record.data], codec)
+        return
+
+    codec_kwargs = _get_h5_codec_kwargs(codec)
     packed = pack(record)
 
     with h5py.File(filename, "w") as f:
         for k, v in packed.items():
-            if isinstance(v, str):
-                dtype = h5py.special_dtype(vlen=str)
-                compression = None
-            elif isinstance(v, np.ndarray):
-                dtype = v.dtype
-                compression = "gzip"
+            _create_h5_dataset(f, k, v, codec_kwargs)
+
+
+def _save_h5_from_parts(filename, record, data_parts, codec):
+    """Saves the record with its data being the concatenated parts, copied chunk by chunk"""
+
+    codec_kwargs = _get_h5_codec_kwargs(codec)
+    packed = pack(attr.evolve(record, data=np.zeros(0)))
+
+    with h5py.File(filename, "w") as f:
+        for k, v in packed.items():
+            if k == "data":
+                _create_h5_dataset_from_parts(f, k, data_parts, codec_kwargs)
             else:
-                raise TypeError
+                _create_h5_dataset(f, k, v, codec_kwargs)
+
+
+def _parse_codec(codec):
+    """Returns the compression ("gzip", "lzf" or None), level and shuffle flag of a codec"""
+
+    name, plus, flt = codec.lower().partition("+")
+
+    if plus and flt != "shuffle":
+        raise ValueError("unknown codec filter '{}'".format(flt))
+
+    shuffle = bool(plus)
+    name, dash, level = name.partition("-")
+
+    if name == "none" and not dash:
+        return None, None, shuffle
+    elif name == "lzf" and not dash:
+        return "lzf", None, shuffle
+    elif name == "gzip" and not dash:
+        return "gzip", 4, shuffle
+    elif name == "gzip" and level.isdigit() and 0 <= int(level) <= 9:
+        return "gzip", int(level), shuffle
+
+    raise ValueError("unknown codec '{}'".format(codec))
+
+
+def _get_h5_codec_kwargs(codec):
+    compression, level, shuffle = _parse_codec(codec)
+
+    kwargs = {}
+
+    if compression is not None:
+        kwargs["compression"] = compression
+
+    if level is not None:
+        kwargs["compression_opts"] = level
+
+    if shuffle:
+        kwargs["shuffle"] = True
+
+    return kwargs
+
+
+def _create_h5_dataset(f, k, v, codec_kwargs=None):
+    if codec_kwargs is None:
+        codec_kwargs = _get_h5_codec_kwargs(DEFAULT_CODEC)
+
+    kwargs = {}
+
+    if isinstance(v, str):
+        dtype = h5py.special_dtype(vlen=str)
+    elif isinstance(v, np.ndarray):
+        dtype = _get_h5_dtype(v)
+
+        if dtype != v.dtype:
+            v = v.astype(object)
+
+        if v.ndim > 0 and v.size > 0:
+            kwargs.update(codec_kwargs)
+
+            if k == "data" and codec_kwargs:  # Chunks of whole frames
+                kwargs["chunks"] = _get_chunk_shape(v.shape[1:], v.dtype, len(v))
+    else:
+        raise TypeError
+
+    f.create_dataset(k, data=v, dtype=dtype, **kwargs)
+
+
+def _create_h5_dataset_from_parts(f, k, parts, codec_kwargs):
+    dtype = np.result_type(*[_get_stored_dtype(part) for part in parts])
+    shape = (sum(len(part) for part in parts),) + tuple(parts[0].shape[1:])
+    kwargs = {}
+
+    if shape[0] > 0:
+        kwargs.update(codec_kwargs)
+
+        if codec_kwargs:
+            kwargs["chunks"] = _get_chunk_shape(shape[1:], dtype, shape[0])
+
+    dataset = f.create_dataset(k, shape=shape, dtype=dtype, **kwargs)
+
+    start = 0
+    for part in parts:
+        chunks = part.iter_chunks() if isinstance(part, LazyRecordData) else [part]
+
+        for chunk in chunks:
+            dataset[start : start + len(chunk)] = np.asarray(chunk).astype(dtype)
+            start += len(chunk)
 
-            f.create_dataset(k, data=v, dtype=dtype, compression=compression)
+
+def _get_stored_dtype(data):
+    if isinstance(data, LazyRecordData):
+        return data._dataset.dtype  # As stored, e.g. u2, rather than converted to float
+
+    data = np.asarray(data)
+
+    if np.isrealobj(data) and np.all(data == data.astype("u2")):
+        return np.dtype("u2")
+
+    return data.dtype
+
+
+def _get_h5_dtype(v):
+    if v.dtype.kind in "USO":
+        return h5py.special_dtype(vlen=str)
+
+    return v.dtype
 
 
 def load(filename: Union[str, Path]) -> Record:
@@ -206,7 +1108,9 @@ def unpack(packed: dict) -> Record:
     kwargs = {}
 
     data = packed["data"]
-    if np.isrealobj(data):
+    if isinstance(data, h5py.Dataset):
+        data = LazyRecordData(data)
+    elif np.isrealobj(data):
         data = data.astype("float")
 
     kwargs["data"] = data
@@ -227,7 +1131,13 @@ def unpack(packed: dict) -> Record:
     kwargs["mode"] = mode
 
     kwargs["session_info"] = json.loads(packed["session_info"])
-    kwargs["data_info"] = json.loads(packed["data_info"])
+
+    if DATA_INFO_KEYS_FIELD in packed:
+        keys = json.loads(packed[DATA_INFO_KEYS_FIELD])
+        columns = {k: packed[DATA_INFO_COLUMN_PREFIX + k] for k in keys}
+        kwargs["data_info"] = ColumnarDataInfo(columns, keys)
+    else:
+        kwargs["data_info"] = json.loads(packed["data_info"])
 
     kwargs["sample_times"] = packed.get("sample_times", None)
 
@@ -236,13 +1146,304 @@ def unpack(packed: dict) -> Record:
     return Record(**kwargs)
 
 
+def _iter_journal_entries(f):
+    if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+        raise ValueError("not a record journal")
+
+    num_frames = 0
+
+    while True:
+        header = f.read(_JOURNAL_ENTRY_HEADER.size)
+
+        if not header:
+            return
+
+        if len(header) == _JOURNAL_ENTRY_HEADER.size:
+            length, crc, kind = _JOURNAL_ENTRY_HEADER.unpack(header)
+            payload = f.read(length)
+
+            valid = len(payload) == length and zlib.crc32(payload) == crc
+
+            if valid and kind in (_JOURNAL_JSON, _JOURNAL_FRAME):
+                num_frames += kind == _JOURNAL_FRAME
+                yield kind, payload
+                continue
+
+        warnings.warn("journal truncated after {} frames".format(num_frames))
+        return
+
+
+def _read_journal(f):
+    """
+    Reads the metadata of an open journal. Returns the packed metadata, the frame dtype and
+    shape, and an iterator over the frames as ``(sample_time, data_info, data)``, which reads
+    them from the file one at a time.
+    """
+
+    entries = _iter_journal_entries(f)
+    kind, payload = next(entries, (None, None))
+
+    if kind != _JOURNAL_JSON:
+        raise ValueError("journal has no metadata")
+
+    packed = json.loads(payload)
+    kind, payload = next(entries, (None, None))
+
+    if kind == _JOURNAL_JSON:
+        frame_format = json.loads(payload)
+        dtype = np.dtype(frame_format["dtype"])
+        shape = tuple(frame_format["shape"])
+    else:  # No frames
+        dtype = np.dtype("float")
+        shape = ()
+
+    def frames():
+        for kind, payload in entries:
+            if kind != _JOURNAL_FRAME:
+                continue
+
+            sample_time, info_len = _JOURNAL_FRAME_HEADER.unpack_from(payload)
+            info_end = _JOURNAL_FRAME_HEADER.size + info_len
+            data_info = json.loads(payload[_JOURNAL_FRAME_HEADER.size : info_end])
+            data = np.frombuffer(payload, dtype=dtype, offset=info_end).reshape(shape)
+            yield sample_time, data_info, data
+
+    return packed, dtype, shape, frames()
+
+
+def load_journal(filename: Union[str, Path]) -> Record:
+    """
+    Loads the frames of a ``JournalRecorder`` journal. An incomplete or corrupt entry at the
+    end, as left by an interrupted recording, ends the record with a warning. Use ``recover()``
+    for journals that don't fit in memory.
+    """
+
+    with builtins.open(str(filename), "rb") as f:
+        packed, dtype, shape, frames = _read_journal(f)
+        frames = list(frames)
+
+    data = np.empty((len(frames),) + shape, dtype=dtype)
+    sample_times = np.empty(len(frames))
+    data_info = []
+
+    for i, (sample_time, info, frame_data) in enumerate(frames):
+        sample_times[i] = sample_time
+        data_info.append(info)
+        data[i] = frame_data
+
+    packed.update(_pack_data_info(data_info))
+    packed["data"] = data
+    packed["sample_times"] = sample_times
+
+    return unpack(packed)
+
+
+def recover(
+    filename: Union[str, Path],
+    dest: Optional[Union[str, Path]] = None,
+    codec: str = DEFAULT_CODEC,
+    flush_interval: int = 100,
+) -> Path:
+    """
+    Converts a ``JournalRecorder`` journal into a regular HDF5 record, saved to ``dest`` which
+    defaults to the journal filename with an ``.h5`` extension. The frames are read and written
+    ``flush_interval`` at a time as with ``StreamingRecorder``, so the journal doesn't need to
+    fit in memory, and the data keeps its recorded dtype. An incomplete or corrupt entry at the
+    end ends the record with a warning. Returns the path of the new file.
+    """
+
+    if dest is None:
+        dest = Path(filename).with_suffix(".h5")
+
+    with builtins.open(str(filename), "rb") as f:
+        packed, _, _, frames = _read_journal(f)
+
+        with StreamingRecorder._from_packed_metadata(dest, packed, flush_interval, codec) as w:
+            for sample_time, data_info, data in frames:
+                w._append(data_info, data, sample_time)
+
+    return Path(w.filename)
+
+
+def concat(filenames: list, dest: Union[str, Path], codec: str = DEFAULT_CODEC) -> Path:
+    """
+    Concatenates records, such as the files written by ``RotatingRecorder``, into a new
+    HDF5 file. The records must have the same mode, sensor config and session info. The data
+    is copied a chunk at a time, so the records don't need to fit in memory. Returns the path of
+    the new file.
+    """
+
+    records = [open(filename) for filename in filenames]
+
+    try:
+        if not records:
+            raise ValueError("no records to concatenate")
+
+        for record in records[1:]:
+            _check_compatible(records[0], record)
+
+        if any(r.sample_times is None for r in records):
+            sample_times = None
+        else:
+            sample_times = np.concatenate([r.sample_times for r in records])
+
+        record = attr.evolve(
+            records[0],
+            data=np.zeros(0),
+            data_info=_concat_data_info([r.data_info for r in records]),
+            sample_times=sample_times,
+        )
+
+        _save_h5_from_parts(str(dest), record, [r.data for r in records], codec)
+    finally:
+        for record in records:
+            _close_record(record)
+
+    return Path(dest)
+
+
+def split(
+    filename: Union[str, Path],
+    directory: Union[str, Path],
+    frames_per_file: Optional[int] = None,
+    seconds_per_file: Optional[float] = None,
+    codec: str = DEFAULT_CODEC,
+) -> list:
+    """
+    Splits a record into numbered HDF5 files, ``0001.h5``, ``0002.h5``, ..., in ``directory``,
+    by number of frames or by seconds of sample time. Returns the filenames.
+    """
+
+    if (frames_per_file is None) == (seconds_per_file is None):
+        raise ValueError("exactly one of frames_per_file and seconds_per_file must be given")
+
+    record = open(filename)
+
+    try:
+        num_frames = len(record.data)
+
+        if frames_per_file is not None:
+            starts = np.arange(0, num_frames, frames_per_file)
+        else:
+            t = _get_relative_sample_times(record)
+            num_files = int(t[-1] // seconds_per_file) + 1 if num_frames else 0
+            starts = np.searchsorted(t, np.arange(num_files) * seconds_per_file)
+            starts = np.unique(starts)
+
+        stops = np.append(starts[1:], num_frames)
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        filenames = []
+        for i, (start, stop) in enumerate(zip(starts, stops)):
+            dest = directory.joinpath("{:04}.h5".format(i + 1))
+            save_h5(dest, record[start:stop], codec=codec)
+            filenames.append(dest)
+    finally:
+        _close_record(record)
+
+    return filenames
+
+
+def extract(
+    filename: Union[str, Path],
+    dest: Union[str, Path],
+    start_time: float = 0.0,
+    end_time: Optional[float] = None,
+    codec: str = DEFAULT_CODEC,
+) -> Path:
+    """
+    Saves the frames sampled from ``start_time`` up to ``end_time``, in seconds from the first
+    frame, to a new HDF5 file. Only the frames in the window are read. Returns the path of the
+    new file.
+    """
+
+    record = open(filename)
+
+    try:
+        t = _get_relative_sample_times(record)
+        start = np.searchsorted(t, start_time)
+        stop = len(t) if end_time is None else np.searchsorted(t, end_time)
+        save_h5(dest, record[start : max(start, stop)], codec=codec)
+    finally:
+        _close_record(record)
+
+    return Path(dest)
+
+
+def _check_compatible(a, b):
+    for name in ["mode", "sensor_config_dump", "session_info"]:
+        if getattr(a, name) != getattr(b, name):
+            raise ValueError("records are not compatible, their {} differ".format(name))
+
+    if len(a.data) and len(b.data) and a.data.shape[1:] != b.data.shape[1:]:
+        raise ValueError("records are not compatible, their data shapes differ")
+
+
+def _concat_data_info(data_infos):
+    columnar = all(isinstance(d, ColumnarDataInfo) for d in data_infos)
+
+    if columnar and all(d.keys == data_infos[0].keys for d in data_infos):
+        keys = data_infos[0].keys
+        columns = {k: np.concatenate([d.columns[k] for d in data_infos]) for k in keys}
+        return ColumnarDataInfo(columns, keys)
+
+    return [info for data_info in data_infos for info in data_info]
+
+
+def _get_relative_sample_times(record):
+    if record.sample_times is None:
+        raise ValueError("record has no sample times")
+
+    t = np.asarray(record.sample_times)
+    return t - t[0] if len(t) else t
+
+
+def _close_record(record):
+    if isinstance(record.data, LazyRecordData):
+        record.data.close()
+
+
+def open(filename: Union[str, Path], lazy: bool = True) -> Record:
+    """
+    Opens a record file. With ``lazy``, the data of HDF5 files is only read when accessed,
+    see ``LazyRecordData``, and the file is kept open until ``record.data.close()`` is
+    called. It must be closed before the file can be overwritten. The rest of the record is
+    read as usual. NumPy files, or ``lazy=False``, are loaded as with ``load()``.
+    """
+
+    filename = str(filename)
+
+    if lazy and filename.lower().endswith(".h5"):
+        return open_h5(filename)
+
+    return load(filename)
+
+
+def open_h5(filename: Union[str, Path]) -> Record:
+    f = h5py.File(str(filename), "r")
+
+    packed = {}
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            packed[name] = obj if name == "data" else obj[()]
+
+    f.visititems(visit)
+
+    _decode_h5_strings(packed)
+
+    return unpack(packed)
+
+
 def load_npz(filename: Union[str, Path]) -> Record:
     filename = str(filename)
 
     packed = {}
     with np.load(filename, allow_pickle=False) as f:
         for k, v in f.items():
-            if v.dtype.type is np.unicode_:
+            if v.dtype.type is np.str_ and v.ndim == 0:
                 v = str(v)
 
             packed[k] = v
@@ -253,20 +1454,69 @@ def load_npz(filename: Union[str, Path]) -> Record:
 def load_h5(filename: Union[str, Path]) -> Record:
     filename = str(filename)
 
+    packed = {}
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            packed[name] = obj[()]
+
     with h5py.File(filename, "r") as f:
-        packed = {k: v[()] for k, v in f.items()}
+        f.visititems(visit)
 
+    _decode_h5_strings(packed)
+
+    return unpack(packed)
+
+
+def _decode_h5_strings(packed):
     for k, v in packed.items():
         if isinstance(v, bytes):
             packed[k] = v.decode()
 
-    return unpack(packed)
+
+def benchmark(record: Record, directory: Union[str, Path], codecs=None, ext="h5"):
+    """
+    Saves and loads the record with each codec, in the given directory. Returns a list of
+    dicts with the codec, write and read speed in MB/s of the packed record, and the
+    compression ratio.
+    """
+
+    if codecs is None:
+        codecs = BENCHMARK_CODECS
+
+        if ext == "npz":
+            codecs = [c for c in codecs if "lzf" not in c and "shuffle" not in c]
+
+    num_bytes = sum(np.asanyarray(v).nbytes for v in pack(record).values())
+    results = []
+
+    for codec in codecs:
+        filename = Path(directory).joinpath("benchmark_{}.{}".format(codec, ext))
+
+        t0 = time.perf_counter()
+        save(filename, record, codec=codec)
+        t1 = time.perf_counter()
+        load(filename)
+        t2 = time.perf_counter()
+
+        results.append(
+            {
+                "codec": codec,
+                "write_mb_per_s": num_bytes / (t1 - t0) / 1e6,
+                "read_mb_per_s": num_bytes / (t2 - t1) / 1e6,
+                "ratio": num_bytes / filename.stat().st_size,
+            }
+        )
+
+        filename.unlink()
+
+    return results
 
 
 if __name__ == "__main__":
     import argparse
-    import os
     import sys
+    import tempfile
 
     parser = argparse.ArgumentParser()
 
@@ -277,14 +1527,34 @@ if __name__ == "__main__":
     sp.add_argument("source")
     sp.add_argument("dest")
     sp.add_argument("-f", "--force", action="store_true")
+    sp.add_argument("-c", "--codec", default=DEFAULT_CODEC)
+
+    sp = subparsers.add_parser("benchmark")
+    sp.add_argument("source")
+    sp.add_argument("-c", "--codec", nargs="+")
+    sp.add_argument("--npz", action="store_true")
 
     args = parser.parse_args()
 
-    # assume resave as it's currently the only option
+    if args.command == "benchmark":
+        record = load(args.source)
+
+        with tempfile.TemporaryDirectory() as directory:
+            ext = "npz" if args.npz else "h5"
+            results = benchmark(record, directory, codecs=args.codec, ext=ext)
+
+        print("{:<16}{:>12}{:>12}{:>8}".format("codec", "write MB/s", "read MB/s", "ratio"))
+
+        for r in results:
+            print(
+                "{codec:<16}{write_mb_per_s:>12.1f}{read_mb_per_s:>12.1f}{ratio:>8.2f}".format(**r)
+            )
+
+        sys.exit(0)
 
     if not args.force and os.path.exists(args.dest):
         sys.stderr.write("error: destination file already exists (try using -f)\n")
         sys.exit(1)
 
     record = load(args.source)
-    save(args.dest, record)
+    save(args.dest, record, codec=args.codec)
@@ -542,3 +542,155 @@ def pg_curve_set_data_with_nan(curve, x, y):
 
 def optional_or_else(value, default):
     return default if value is None else value
+
+
+class RingBuffer:
+    """
+    Fixed size history of the latest appended items, e.g. sweeps, ordered from oldest to
+    newest. Replaces rolling an array with ``np.roll`` for every new item, which copies the
+    whole history.
+
+    Every item is stored twice, so that the items in order are always a contiguous part of
+    the underlying array. Appending is O(1) in the size of the buffer, and ``view()`` gives
+    the items in order without copying.
+
+    :param size: Number of items
+    :param item_shape: Shape of each item, e.g. ``(num_depths,)``
+    :param dtype: Data type of the items
+    :param fill_value: Initial value of all items
+    """
+
+    def __init__(self, size, item_shape=(), dtype=float, fill_value=0):
+        self._size = int(size)
+        self._data = np.full((2 * self._size,) + tuple(item_shape), fill_value, dtype=dtype)
+        self._start = 0
+
+        # Slices of a read-only view are read-only too
+        self._read_only_data = self._data.view()
+        self._read_only_data.flags.writeable = False
+
+    @classmethod
+    def from_array(cls, items):
+        """Creates a buffer holding the given items, from oldest to newest"""
+
+        items = np.asarray(items)
+        buffer = cls(len(items), items.shape[1:], dtype=items.dtype)
+        buffer.extend(items)
+        return buffer
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        return self.view()[key]
+
+    def __array__(self, dtype=None):
+        return self.copy() if dtype is None else self.copy().astype(dtype)
+
+    @property
+    def shape(self):
+        return (self._size,) + self._data.shape[1:]
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    def append(self, item):
+        """Appends an item, dropping the oldest one"""
+
+        if self._size == 0:
+            return
+
+        self._data[self._start] = item
+        self._data[self._start + self._size] = item
+        self._start = (self._start + 1) % self._size
+
+    def extend(self, items):
+        """Appends several items, in order"""
+
+        items = np.asarray(items)
+        num_items = len(items)
+
+        if num_items >= self._size:
+            self._data[: self._size] = items[num_items - self._size :]
+            self._data[self._size :] = self._data[: self._size]
+            self._start = 0
+            return
+
+        idxs = (self._start + np.arange(num_items)) % self._size
+        self._data[idxs] = items
+        self._data[idxs + self._size] = items
+        self._start = (self._start + num_items) % self._size
+
+    def fill(self, value):
+        """Sets all items to a value"""
+
+        self._data[...] = value
+
+    def view(self):
+        """
+        Returns a read-only view of the items, from oldest to newest. The view changes when
+        items are appended, so use ``copy()`` to keep the current items.
+        """
+
+        return self._read_only_data[self._start : self._start + self._size]
+
+    def copy(self):
+        """Returns a copy of the items, from oldest to newest"""
+
+        return self._data[self._start : self._start + self._size].copy()
+
+
+def process_batch(processor, frames, infos=None):
+    """
+    Processes several frames, e.g. a whole record, with an example processor. Uses the
+    processor's ``process_batch(frames, infos)`` if it has one, and otherwise calls
+    ``process`` once per frame. Returns a list with the output of each frame, the same as when
+    processing the frames one by one.
+    """
+
+    if infos is None:
+        infos = [None] * len(frames)
+
+    if hasattr(processor, "process_batch"):
+        return processor.process_batch(frames, infos)
+
+    return [processor.process(frame, info) for frame, info in zip(frames, infos)]
+
+
+def exp_smooth(x, sf, y0, weight=None):
+    """
+    Exponential smoothing along the first axis of ``x``, i.e. over frames. Each step is
+    ``y[n] = sf[n] * y[n - 1] + weight[n] * x[n]``, where ``y[-1] = y0`` and ``weight``
+    defaults to ``1 - sf``. ``sf`` and ``weight`` are scalars or one value per step.
+
+    Steps with the same factors are run through ``scipy.signal.lfilter``, which gives the same
+    results as the frame by frame updates done in the processors.
+    """
+
+    from scipy.signal import lfilter
+
+    x = np.asarray(x)
+    n = len(x)
+    sf = np.broadcast_to(np.asarray(sf, dtype=float), (n,))
+    weight = 1.0 - sf if weight is None else np.broadcast_to(np.asarray(weight, dtype=float), (n,))
+
+    y = np.empty(x.shape, dtype=np.result_type(x, y0, float))
+    prev = np.broadcast_to(y0, x.shape[1:])
+
+    changes = np.flatnonzero((sf[1:] != sf[:-1]) | (weight[1:] != weight[:-1])) + 1
+    bounds = [0, *changes.tolist(), n]
+
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        a = sf[start]
+        b = weight[start]
+
+        if end - start == 1:
+            y[start] = a * prev + b * x[start]
+        else:
+            zi = (a * prev)[np.newaxis]
+            y[start:end], _ = lfilter([b], [1.0, -a], x[start:end], axis=0, zi=zi)
+
+        prev = y[end - 1]
+
+    return y
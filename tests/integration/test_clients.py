@@ -112,6 +112,83 @@ def test_squeeze(setup, mode):
     client.squeeze = restore_squeeze
 
 
+@pytest.mark.parametrize("mode", modes.Mode)
+def test_get_next_into_out(setup, mode):
+    client, sensor = setup
+
+    config = configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.sensor = sensor
+
+    client.start_session(config)
+    _, data = client.get_next()
+    out = np.empty_like(data)
+    _, out_data = client.get_next(out=out)
+    client.stop_session()
+
+    assert out_data is out
+    assert out_data.shape == data.shape
+
+
+@pytest.mark.parametrize("mode", modes.Mode)
+def test_get_next_batch(setup, mode):
+    client, sensor = setup
+
+    config = configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.sensor = sensor
+    config.update_rate = 20
+
+    client.start_session(config)
+    data_info, data = client.get_next()
+    batch_info, batch_data = client.get_next_batch(3, timeout=2.0)
+    stream_info, stream_data = next(client.stream(max_frames=2, timeout=2.0))
+    client.stop_session()
+
+    assert batch_data.shape == (3,) + data.shape
+    assert batch_data.dtype == data.dtype
+    assert stream_data.shape == (2,) + data.shape
+
+    assert batch_info.keys() == data_info.keys()
+    assert batch_info["data_saturated"].shape == (3,)
+    assert batch_info["data_saturated"].dtype == bool
+
+
+@pytest.mark.parametrize("mode", modes.Mode)
+def test_dtype(setup, mode):
+    client, sensor = setup
+
+    restore_dtype = client.dtype
+
+    config = configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.sensor = sensor
+
+    client.start_session(config)
+    _, default_data = client.get_next()
+    client.stop_session()
+
+    client.dtype = "float32"
+    client.start_session(config)
+    _, float32_data = client.get_next()
+    client.stop_session()
+
+    client.dtype = "raw"
+    client.start_session(config)
+    _, raw_data = client.get_next()
+    client.stop_session()
+
+    client.dtype = restore_dtype
+
+    if mode == modes.Mode.IQ:
+        assert float32_data.dtype == np.complex64
+        assert raw_data.dtype == np.int16
+        assert raw_data.shape == default_data.shape + (2,)
+    else:
+        assert float32_data.dtype == np.float32
+        assert raw_data.dtype == np.uint16
+        assert raw_data.shape == default_data.shape
+
+    assert float32_data.shape == default_data.shape
+
+
 @pytest.mark.parametrize("mode", modes.Mode)
 def test_sanity_check_output(setup, mode):
     client, sensor = setup
@@ -25,7 +25,7 @@ PARAMETER_SETS = [
 ]
 
 
-def get_output(parameter_set=None):
+def get_output(parameter_set=None, batch=False):
     input_record = et.recording.load(HERE / "input.h5")
 
     processing_config = ProcessingConfiguration()
@@ -42,9 +42,16 @@ def get_output(parameter_set=None):
 
     output = {k: [] for k in TEST_KEYS}
 
-    for data_info, data in input_record:
-        result = processor.process(data.squeeze(0), data_info[0])
+    if batch:
+        frames = input_record.data[:, 0]
+        data_infos = [data_info[0] for data_info in input_record.data_info]
+        results = processor.process_batch(frames, data_infos)
+    else:
+        results = [
+            processor.process(data.squeeze(0), data_info[0]) for data_info, data in input_record
+        ]
 
+    for result in results:
         for k in TEST_KEYS:
             output[k].append(result[k])
 
@@ -112,6 +119,13 @@ def test_processor_against_reference():
         compare_output(expected, actual)
 
 
+def test_process_batch():
+    for parameter_set in PARAMETER_SETS:
+        expected = get_output(parameter_set)
+        actual = get_output(parameter_set, batch=True)
+        compare_output(expected, actual)
+
+
 if __name__ == "__main__":
     import argparse
 
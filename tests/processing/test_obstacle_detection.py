@@ -0,0 +1,38 @@
+import site
+from pathlib import Path
+
+import numpy as np
+
+
+processing_dir = Path(__file__).parents[2] / "examples" / "processing"
+site.addsitedir(processing_dir)
+
+
+import obstacle_detection  # noqa: E402
+
+
+def test_zero_gradients():
+    sensor_config = obstacle_detection.get_sensor_config()
+    sensor_config.sensor = 1
+    processing_config = obstacle_detection.get_processing_config()
+    processing_config["calib"]["value"] = 0
+    processing_config["static_grad"]["value"] = 0
+    processing_config["close_dist"]["value"] = 0
+
+    processor = obstacle_detection.ObstacleDetectionProcessor(
+        sensor_config, processing_config, None
+    )
+
+    # A strong target, moving away from the sensor, far from the first distance bin
+    len_range = 200
+    fft_len = processing_config["fft_length"]["value"]
+    depths = np.arange(len_range)
+    sweep = 2 ** 12 * np.exp(-0.5 * ((depths - 120) / 5) ** 2)
+
+    for i in range(2 * fft_len):
+        result = processor.process(sweep * np.exp(0.5j * i), None)
+
+    assert processor.threshold_map.shape == (len_range, fft_len)
+    assert not processor.threshold_map.flags.writeable
+    assert result["peaks_found"] > 0
+    assert result["fft_peaks"][0, 0] > 0
@@ -0,0 +1,112 @@
+import copy
+import importlib
+import site
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import acconeer.exptool as et
+
+
+processing_dir = Path(__file__).parents[2] / "examples" / "processing"  # noqa: E402
+site.addsitedir(processing_dir)  # noqa: E402
+
+
+MODULES = [
+    ("sparse_fft", "Processor"),
+    ("sparse_inter_fft", "Processor"),
+    ("parking", "Processor"),
+    ("phase_tracking", "PhaseTrackingProcessor"),
+    ("sparse_speed", "Processor"),
+    ("presence_detection_sparse", "Processor"),
+]
+
+NUM_FRAMES = 60
+
+
+def get_processors_and_frames(module_name, processor_class_name):
+    module = importlib.import_module(module_name)
+
+    sensor_config = module.get_sensor_config()
+    sensor_config.sensor = 1
+
+    if hasattr(module, "get_processing_config"):
+        processing_config = module.get_processing_config()
+    else:
+        processing_config = None
+
+    client = et.clients.MockClient()
+    session_info = client.start_session(sensor_config)
+    data_info, frame = client.get_next()
+    client.disconnect()
+
+    # Noisy copies of a mock frame, as the mock client is paced by the update rate
+    rng = np.random.default_rng(0)
+    data = frame * (1 + 0.2 * rng.standard_normal((NUM_FRAMES,) + frame.shape))
+    if np.iscomplexobj(frame):
+        data = data * np.exp(1j * rng.uniform(-0.5, 0.5, data.shape))
+
+    data_infos = [data_info] * NUM_FRAMES
+
+    processor_class = getattr(module, processor_class_name)
+    processors = [
+        processor_class(sensor_config, processing_config, session_info) for _ in range(2)
+    ]
+
+    return processors, data_infos, data
+
+
+def assert_outputs_equal(expected, actual):
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys()
+
+        for k in expected:
+            assert_outputs_equal(expected[k], actual[k])
+    elif isinstance(expected, tuple):
+        assert len(expected) == len(actual)
+
+        for e, a in zip(expected, actual):
+            assert_outputs_equal(e, a)
+    elif expected is None:
+        assert actual is None
+    else:
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("module_name,processor_class_name", MODULES)
+def test_process_batch(module_name, processor_class_name):
+    processors, data_infos, data = get_processors_and_frames(module_name, processor_class_name)
+    sequential_processor, batch_processor = processors
+
+    # Some outputs are updated in place by later frames
+    expected = [
+        copy.deepcopy(sequential_processor.process(d, i)) for d, i in zip(data, data_infos)
+    ]
+
+    # Split into several batches, and process the last frame one by one, to check that the
+    # processor is left in the same state as after sequential processing
+    split = [0, 1, 17, NUM_FRAMES - 1]
+    actual = []
+    for start, end in zip(split[:-1], split[1:]):
+        actual.extend(batch_processor.process_batch(data[start:end], data_infos[start:end]))
+
+    actual.append(batch_processor.process(data[-1], data_infos[-1]))
+
+    assert len(actual) == len(expected)
+
+    for e, a in zip(expected, actual):
+        assert_outputs_equal(e, a)
+
+
+def test_process_batch_fallback():
+    class SequentialProcessor:
+        def __init__(self):
+            self.count = 0
+
+        def process(self, data, data_info):
+            self.count += 1
+            return self.count
+
+    processor = SequentialProcessor()
+    assert et.utils.process_batch(processor, np.zeros((3, 4))) == [1, 2, 3]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import numpy as np
+
+from acconeer.exptool import configs
+from acconeer.exptool.clients import AsyncSocketClient
+
+
+FRAME_DATA = np.arange(10, dtype=">u2")
+
+
+async def _handle_connection(reader, writer):
+    streaming = False
+
+    async def send(header, payload=b""):
+        header["payload_size"] = len(payload)
+        writer.write(json.dumps(header).encode("ascii") + b"\n" + payload)
+        await writer.drain()
+
+    while True:
+        try:
+            line = await asyncio.wait_for(reader.readline(), 0.01 if streaming else None)
+        except asyncio.TimeoutError:
+            info = {"sequence_number": 1, "data_saturated": False}
+            await send({"status": "ok", "result_info": [info]}, FRAME_DATA.tobytes())
+            continue
+
+        if not line:
+            break
+
+        cmd = json.loads(line)["cmd"]
+
+        if cmd == "get_version":
+            await send({"status": "ok", "message": "Server version v2.10.0"})
+        elif cmd == "get_board_sensor_count":
+            await send({"status": "ok", "message": "1"})
+        elif cmd == "envelope_data":
+            await send({"status": "ok", "start_m": 0.2, "length_m": 0.3, "data_length": 10})
+        elif cmd == "start_streaming":
+            streaming = True
+            await send({"status": "start"})
+        elif cmd == "stop_streaming":
+            streaming = False
+            await send({"status": "end"})
+
+    writer.close()
+
+
+async def _run_client(port, num_frames):
+    client = AsyncSocketClient("localhost")
+    client._port = port
+    config = configs.EnvelopeServiceConfig()
+    config.update_rate = 100
+
+    frames = []
+    async with client:
+        session_info = await client.start_session(config)
+
+        async for info, data in client:
+            frames.append((info, data))
+
+            if len(frames) == num_frames:
+                await client.stop_session()
+
+    return session_info, frames
+
+
+def test_async_socket_client():
+    async def main():
+        server = await asyncio.start_server(_handle_connection, "localhost", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        # Several clients multiplexed on one event loop
+        results = await asyncio.gather(*[_run_client(port, 3 + i) for i in range(4)])
+
+        server.close()
+        await server.wait_closed()
+        return results
+
+    results = asyncio.run(main())
+
+    for i, (session_info, frames) in enumerate(results):
+        assert session_info["range_start_m"] == 0.2
+        assert session_info["data_length"] == 10
+        assert len(frames) == 3 + i
+
+        for info, data in frames:
+            assert info["sequence_number"] == 1
+            assert data.dtype == np.float64
+            np.testing.assert_array_equal(data, FRAME_DATA)
@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import clients, configs
+
+
+def test_frame_buffers():
+    client = clients.MockClient(num_frame_buffers=2)
+    client.start_session(configs.EnvelopeServiceConfig())
+
+    _, first = client.get_next()
+    _, second = client.get_next()
+
+    with pytest.raises(clients.base.ClientError):
+        client.get_next()
+
+    client.release_frame(first)
+    _, third = client.get_next()
+
+    client.release_frame(np.zeros(3))  # ignored
+
+    client.disconnect()
+
+    assert third is first
+    assert second is not first
+    assert second.shape == first.shape
+
+
+def test_get_next_batch_drains_pending_frames():
+    client = clients.MockClient(squeeze=False)
+    config = configs.SparseServiceConfig()
+    config.update_rate = 100
+    client.start_session(config)
+
+    time.sleep(0.1)
+    info, data = client.get_next_batch(100)
+
+    client.disconnect()
+
+    assert 5 < len(data) < 100
+    assert data.shape[1:] == (1, config.sweeps_per_frame, data.shape[-1])
+    assert info["missed_data"].shape == (len(data), 1)
+
+
+def test_stack_data_infos():
+    infos = [{"a": 1, "b": True}, {"a": 2, "b": False}]
+    stacked = clients.base.stack_data_infos(infos)
+
+    assert np.all(stacked["a"] == [1, 2])
+    assert stacked["b"].dtype == bool
+
+    stacked = clients.base.stack_data_infos([[d, d] for d in infos])
+
+    assert stacked["a"].shape == (2, 2)
+    assert clients.base.stack_data_infos([]) == {}
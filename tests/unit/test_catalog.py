@@ -0,0 +1,95 @@
+import logging
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import catalog as catalog_module
+from acconeer.exptool import clients, configs, recording
+from acconeer.exptool.catalog import RecordCatalog
+
+
+def make_record(config, num_frames, note=None):
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    recorder = recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(num_frames):
+        data_info, data = mocker.get_next()
+        recorder.sample(data_info, data)
+
+    record = recorder.close()
+    record.sample_times = np.arange(num_frames) * 0.5
+    record.note = note
+    return record
+
+
+def test_catalog(tmp_path):
+    envelope_config = configs.EnvelopeServiceConfig()
+    envelope_config.sensor = [1, 2]
+    envelope_config.range_interval = [0.2, 0.5]
+
+    sparse_config = configs.SparseServiceConfig()
+    sparse_config.sensor = [3]
+    sparse_config.update_rate = 10
+
+    catalog_filename = tmp_path.joinpath("catalog.db")
+
+    with RecordCatalog(catalog_filename) as catalog:
+        a = tmp_path.joinpath("a.h5")
+        recording.save(a, make_record(envelope_config, 5, note="walking"), catalog=catalog)
+
+        info = catalog.get(a)
+        assert info["mode"] == "envelope"
+        assert info["sensors"] == [1, 2]
+        assert info["num_frames"] == 5
+        assert info["duration"] == 2.0
+        assert info["note"] == "walking"
+
+    b = tmp_path.joinpath("sub", "b.npz")
+    b.parent.mkdir()
+    recording.save(b, make_record(sparse_config, 10))
+
+    with RecordCatalog(catalog_filename) as catalog:
+        assert catalog.scan(tmp_path) == 1
+        assert catalog.scan(tmp_path) == 0
+        assert len(catalog) == 2
+
+        assert catalog.query() == [a, b]
+        assert catalog.query(mode="sparse") == [b]
+        assert catalog.query(sensor=2) == [a]
+        assert catalog.query(sensor=3, update_rate=10) == [b]
+        assert catalog.query(note="walk") == [a]
+        assert catalog.query(min_frames=6) == [b]
+        assert catalog.query(within_range=(0.1, 0.6)) == [a]
+        assert catalog.query(where="duration > ?", params=(3,)) == [b]
+
+        a.unlink()
+        catalog.scan(tmp_path)
+        assert catalog.query() == [b]
+
+
+def test_scan_skips_unreadable_files(tmp_path, caplog, monkeypatch):
+    config = configs.EnvelopeServiceConfig()
+    recording.save(tmp_path.joinpath("a.h5"), make_record(config, 3))
+    tmp_path.joinpath("b.h5").write_bytes(b"not a record")
+    tmp_path.joinpath("c.npz").write_bytes(b"")
+
+    with RecordCatalog(tmp_path.joinpath("catalog.db")) as catalog:
+        with caplog.at_level(logging.WARNING):
+            assert catalog.scan(tmp_path) == 1
+
+        assert len(caplog.records) == 2
+        assert "b.h5" in caplog.records[0].getMessage()
+        assert "c.npz" in caplog.records[1].getMessage()
+
+        # Other errors are not hidden
+        def get_row(path, record):
+            raise TypeError
+
+        monkeypatch.setattr(catalog_module, "_get_row", get_row)
+        recording.save(tmp_path.joinpath("d.h5"), make_record(config, 3))
+
+        with pytest.raises(TypeError):
+            catalog.scan(tmp_path)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from acconeer.exptool import detection
+
+
+def test_cfar_threshold():
+    sweep = np.arange(10, dtype=float)
+
+    threshold = detection.cfar_threshold(sweep, np.array([2.0, 3.0]), 0.5)
+    assert np.all(np.isnan(threshold[:3]))
+    assert np.all(np.isnan(threshold[7:]))
+    np.testing.assert_allclose(threshold[3:7], 2 * sweep[3:7])
+
+    threshold = detection.cfar_threshold(sweep, np.array([2.0, 3.0]), 0.5, one_sided=True)
+    assert np.all(np.isnan(threshold[:3]))
+    np.testing.assert_allclose(threshold[3:], 2 * (sweep[3:] - 2.5))
+
+
+def test_find_peaks():
+    sweep = np.array([0, 2, 3, 2, 5, 5, 5, 5, 3, 4, 6, 6, 2, 9, 9], dtype=float)
+    threshold = np.ones_like(sweep)
+
+    assert detection.find_peaks(sweep, threshold) == [2, 6, 11]
+
+    threshold[9:] = np.nan
+    assert detection.find_peaks(sweep, threshold) == [2, 6]
+
+    assert detection.find_peaks(sweep, np.full_like(sweep, np.nan)) == []
+
+
+def test_merge_peaks():
+    assert detection.merge_peaks([1, 2, 3, 10, 20, 21], 2) == [2, 10, 20]
+    assert detection.merge_peaks([1, 5, 9], 2) == [1, 5, 9]
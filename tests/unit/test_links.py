@@ -0,0 +1,89 @@
+import multiprocessing as mp
+import socket
+
+from acconeer.exptool.clients import links
+
+
+def test_recv_buffer():
+    buf = links.RecvBuffer(capacity=8)
+    buf.extend(b"abc")
+    buf.extend(b"de\nfg")
+
+    assert len(buf) == 8
+    assert buf.find(b"\n") == 5
+
+    view = buf.take(6)
+    assert view == b"abcde\n"
+    assert buf.find(b"\n") == -1
+
+    buf.extend(b"h" * 20)  # compacts into a new, larger buffer
+    buf.extend(b"\n")
+
+    assert view == b"abcde\n"  # handed out views are left untouched
+    assert buf.find(b"\n") == 22
+    assert buf.take(23) == b"fg" + b"h" * 20 + b"\n"
+    assert len(buf) == 0
+
+
+def test_socket_link_recv():
+    link = links.SocketLink()
+    link._sock, other = socket.socketpair()
+    link._buf = links.RecvBuffer(capacity=16)
+
+    other.sendall(b'{"a": 1}\n' + bytes(range(100)) + b"x\n")
+
+    assert link.recv_until(b"\n") == b'{"a": 1}\n'
+    assert link.recv_view(100) == bytes(range(100))
+    assert link.recv(1) == b"x"
+    assert link.data_available()
+    assert link.recv_until(b"\n") == b"\n"
+    assert not link.data_available()
+
+    link._sock.close()
+    other.close()
+
+
+def _write_to_ring(ring, chunks):
+    for chunk in chunks:
+        ring.write_message(chunk[:3], chunk[3:])
+
+
+def test_shared_memory_ring():
+    ring = links.SharedMemoryRing(capacity=32)
+
+    assert ring.read_message(timeout=0) is None
+    assert ring.write(b"abc")
+    assert ring.write(bytes(range(20)))
+
+    buf = links.RecvBuffer(capacity=4)
+    assert ring.read_into(buf, timeout=0) == 23
+    assert buf.take(23) == b"abc" + bytes(range(20))
+
+    assert ring.write(b"x" * 32)  # wraps around
+    assert not ring.write(b"y", timeout=0)
+    ring.clear()
+
+    chunks = [bytes([i]) * (i + 5) for i in range(20)]
+    proc = mp.Process(target=_write_to_ring, args=(ring, chunks), daemon=True)
+    proc.start()
+
+    for chunk in chunks:
+        assert ring.read_message(timeout=5) == chunk
+
+    proc.join(5)
+    assert not ring.has_data()
+
+
+def test_shared_memory_ring_doorbell():
+    ring = links.SharedMemoryRing(capacity=1024)
+
+    # Only the first write to an empty ring rings the doorbell
+    for _ in range(100):
+        assert ring.write(b"abc")
+
+    assert ring._doorbell_recv.recv_bytes() == b"\x00"
+    assert not ring._doorbell_recv.poll()
+
+    ring.clear()
+    assert ring.write(b"abc")
+    assert ring._doorbell_recv.poll()
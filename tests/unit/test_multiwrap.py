@@ -0,0 +1,103 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import configs
+from acconeer.exptool.clients.base import BaseClient, ClientError
+from acconeer.exptool.clients.multiwrap import MultiClientWrapper
+
+
+class FakeClient(BaseClient):
+    def __init__(self, period, start_delay=0.0, fail_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self._period = period
+        self._start_delay = start_delay
+        self._fail_after = fail_after
+
+    def _connect(self):
+        time.sleep(0.1)
+        return {"mock": True}
+
+    def _setup_session(self, config):
+        time.sleep(0.1)
+        return {}
+
+    def _start_session(self):
+        self._next_t = time.time() + self._start_delay
+        self._count = 0
+
+    def _get_next(self, out=None):
+        if self._count == self._fail_after:
+            raise ClientError("fake failure")
+
+        self._next_t += self._period
+        time.sleep(max(self._next_t - time.time(), 0))
+        self._count += 1
+        return [{"count": self._count}], np.full((1, 3), self._count, dtype=float)
+
+    def _stop_session(self):
+        pass
+
+    def _disconnect(self):
+        pass
+
+
+def get_config():
+    config = configs.EnvelopeServiceConfig()
+    config.sensor = [1, 2]
+    config.update_rate = 20
+    return config
+
+
+def test_threaded_alignment():
+    clients = [FakeClient(0.05), FakeClient(0.05, start_delay=0.12)]
+    client = MultiClientWrapper(clients, threaded=True)
+
+    t0 = time.time()
+    client.connect()
+    client.setup_session(get_config())
+    assert time.time() - t0 < 0.35  # connect and setup run in parallel
+
+    client.start_session()
+
+    infos = []
+    for _ in range(5):
+        info, data = client.get_next()
+        assert data.shape == (2, 3)
+        infos.append(info)
+
+    client.disconnect()
+
+    for a, b in infos:
+        assert abs(a["arrival_time"] - b["arrival_time"]) <= 0.025
+
+    assert sum(a["num_dropped_frames"] for a, _ in infos) >= 2
+    assert infos[0][0]["count"] > infos[0][1]["count"]
+
+
+def test_threaded_reader_error():
+    clients = [FakeClient(0.01), FakeClient(0.01, fail_after=2)]
+    client = MultiClientWrapper(clients, threaded=True)
+    client.start_session(get_config())
+
+    with pytest.raises(ClientError):
+        for _ in range(10):
+            client.get_next()
+
+    # The error is raised again instead of blocking on the empty queue
+    errors = []
+
+    def get_next():
+        try:
+            client.get_next()
+        except ClientError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=get_next, daemon=True)
+    thread.start()
+    thread.join(2)
+    assert len(errors) == 1
+
+    client.disconnect()
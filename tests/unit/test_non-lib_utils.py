@@ -2,6 +2,7 @@ import sys
 from itertools import chain
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 import acconeer.exptool as et
@@ -11,6 +12,7 @@ HERE = Path(__file__).parent
 path = (HERE / ".." / ".." / "utils").resolve()
 sys.path.append(path.as_posix())
 
+from batch_convert import convert_file  # noqa: E402
 from convert_to_csv import record_to_csv  # noqa: E402
 
 
@@ -35,3 +37,36 @@ def test_csv_conversion_is_exact(test_file):
         for col in range(data.shape[1]):
             assert data[row, col] == complex(csv_table[row, col])
             assert data[row, col] == complex(csv_table_sac[col, row])
+
+
+@pytest.mark.parametrize("mode", [et.Mode.ENVELOPE, et.Mode.IQ, et.Mode.SPARSE])
+def test_batch_convert_is_exact(tmp_path, mode):
+    config = et.configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.sensor = [1, 2]
+
+    mocker = et.clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+    recorder = et.recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(5):
+        recorder.sample(*mocker.get_next())
+
+    record = recorder.close()
+    record.data[:, :, 0] = 1.25  # Not only integers
+
+    input_file = tmp_path / "record.h5"
+    et.recording.save(input_file, record)
+
+    output_file = tmp_path / "record.csv"
+    assert convert_file(input_file, output_file, sensor_index=1) == 5
+
+    with open(output_file) as f:
+        rows = [line.strip().split(",") for line in f]
+
+    expected = record.data[:, 1].reshape(5, -1)
+    np.testing.assert_array_equal([[complex(v) for v in row] for row in rows], expected)
+
+    resaved_file = tmp_path / "resaved.npz"
+    assert convert_file(input_file, resaved_file, codec="none") == 5
+    np.testing.assert_array_equal(et.recording.load(resaved_file).data, record.data)
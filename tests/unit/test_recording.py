@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import attr
+import h5py
 import numpy as np
 import pytest
 
@@ -96,3 +97,385 @@ def test_packing_mode(tmp_path, mode):
     restored = recording.unpack(packed)
 
     assert restored.mode == mode
+
+
+@pytest.mark.parametrize("mode", modes.Mode)
+def test_streaming_recorder(tmp_path, mode):
+    config = configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.downsampling_factor = 2
+
+    mocker = clients.MockClient()
+    session_info = mocker.start_session(config)
+
+    filename = Path(tmp_path).joinpath("record.h5")
+    recorder = recording.StreamingRecorder(
+        filename,
+        flush_interval=4,
+        sensor_config=config,
+        session_info=session_info,
+    )
+    reference_recorder = recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(10):
+        data_info, data = mocker.get_next()
+        recorder.sample(data_info, data)
+        reference_recorder.sample(data_info, data)
+
+    assert recorder.num_frames == 8  # flushed twice
+
+    recorder.close()
+    reference_record = reference_recorder.close()
+    loaded_record = recording.load(filename)
+
+    assert loaded_record.mode == mode
+    assert loaded_record.sensor_config_dump == config._dumps()
+    assert loaded_record.data_info == reference_record.data_info
+    assert np.all(loaded_record.data == reference_record.data)
+    assert len(loaded_record.sample_times) == 10
+
+
+def test_streaming_recorder_empty(tmp_path):
+    config = configs.EnvelopeServiceConfig()
+    filename = Path(tmp_path).joinpath("record.h5")
+
+    with recording.StreamingRecorder(filename, sensor_config=config, session_info={}):
+        pass
+
+    loaded_record = recording.load(filename)
+    assert len(loaded_record.data) == 0
+    assert loaded_record.data_info == []
+
+
+@pytest.mark.parametrize("num_frames", [0, 3, 5, 12])
+def test_recorder_max_len(num_frames):
+    config = configs.SparseServiceConfig()
+    mocker = clients.MockClient()
+    session_info = mocker.start_session(config)
+
+    recorder = recording.Recorder(sensor_config=config, session_info=session_info, max_len=5)
+
+    frames = [mocker.get_next() for _ in range(num_frames)]
+    for data_info, data in frames:
+        recorder.sample(data_info, data)
+
+    record = recorder.close()
+    assert record is recorder.close()  # Closing again does nothing
+
+    expected_frames = frames[-5:]
+    assert len(record.data) == len(expected_frames)
+    assert len(record.sample_times) == len(expected_frames)
+    assert record.data_info == [[data_info] for data_info, _ in expected_frames]
+
+    for data, (_, expected_data) in zip(record.data, expected_frames):
+        assert np.all(data[0] == expected_data)
+
+    assert np.all(np.diff(record.sample_times) >= 0)
+
+
+@pytest.mark.parametrize("ext", ["h5", "npz"])
+def test_columnar_data_info(tmp_path, ext):
+    config = configs.EnvelopeServiceConfig()
+    data_info = [
+        [{"sequence_number": i, "data_saturated": i == 2, "note": None if i else "first"}] * 2
+        for i in range(5)
+    ]
+
+    record = recording.Record(
+        mode=modes.Mode.ENVELOPE,
+        sensor_config_dump=config._dumps(),
+        session_info={},
+        data=np.zeros((5, 2, 10)),
+        data_info=data_info,
+    )
+
+    packed = recording.pack(record)
+    assert "data_info" not in packed
+    assert packed["data_info/sequence_number"].shape == (5, 2)
+
+    filename = Path(tmp_path).joinpath("record." + ext)
+    recording.save(filename, record)
+    loaded_record = recording.load(filename)
+
+    assert isinstance(loaded_record.data_info, recording.ColumnarDataInfo)
+    assert loaded_record.data_info == data_info
+    assert loaded_record.data_info[-1] == data_info[-1]
+    assert loaded_record.data_info[1:3] == data_info[1:3]
+    assert [info for info, _ in loaded_record] == data_info
+
+    # Resaving a loaded record keeps the columns as they are
+    recording.save(filename, loaded_record)
+    assert recording.load(filename).data_info == data_info
+
+
+def test_json_data_info_fallback():
+    config = configs.EnvelopeServiceConfig()
+    data_info = [[{"a": 1}], [{"b": 2}]]  # Inconsistent keys
+
+    record = recording.Record(
+        mode=modes.Mode.ENVELOPE,
+        sensor_config_dump=config._dumps(),
+        session_info={},
+        data=np.zeros((2, 1, 10)),
+        data_info=data_info,
+    )
+
+    packed = recording.pack(record)
+    assert "data_info" in packed
+    assert recording.unpack(packed).data_info == data_info
+
+
+@pytest.mark.parametrize("mode", [modes.Mode.ENVELOPE, modes.Mode.IQ])
+def test_open_lazy(tmp_path, mode):
+    config = configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    recorder = recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(25):
+        data_info, data = mocker.get_next()
+        recorder.sample(data_info, data)
+
+    record = recorder.close()
+
+    filename = tmp_path.joinpath("record.h5")
+    recording.save(filename, record)
+    lazy_record = recording.open(filename)
+
+    assert isinstance(lazy_record.data, recording.LazyRecordData)
+    assert lazy_record.data.shape == record.data.shape
+    assert lazy_record.data.dtype == record.data.dtype
+    np.testing.assert_array_equal(np.asarray(lazy_record.data), record.data)
+    np.testing.assert_array_equal(lazy_record.data[-3], record.data[-3])
+    np.testing.assert_array_equal(lazy_record.data[3:20:4, 0], record.data[3:20:4, 0])
+
+    sliced = lazy_record[5:15]
+    assert isinstance(sliced.data, recording.LazyRecordData)
+    assert len(sliced.data) == 10
+    assert sliced.data_info == record.data_info[5:15]
+    np.testing.assert_array_equal(sliced.sample_times, record.sample_times[5:15])
+
+    frames = [data for _, data in sliced]
+    np.testing.assert_array_equal(frames, record.data[5:15])
+
+    with pytest.raises(IndexError):
+        sliced.data[10]
+
+    with pytest.raises(TypeError):
+        lazy_record[0]
+
+    lazy_record.data.close()
+
+
+@pytest.mark.parametrize(
+    "ext,codec",
+    [
+        ("h5", "none"),
+        ("h5", "gzip-1"),
+        ("h5", "lzf+shuffle"),
+        ("npz", "none"),
+        ("npz", "gzip-9"),
+    ],
+)
+def test_save_codec(tmp_path, ext, codec):
+    config = configs.SparseServiceConfig()
+
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    recorder = recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(10):
+        data_info, data = mocker.get_next()
+        recorder.sample(data_info, data)
+
+    record = recorder.close()
+
+    filename = tmp_path.joinpath("record." + ext)
+    recording.save(filename, record, codec=codec)
+    loaded_record = recording.load(filename)
+
+    for a in attr.fields(recording.Record):
+        assert np.all(getattr(record, a.name) == getattr(loaded_record, a.name))
+
+
+def test_save_unknown_codec(tmp_path):
+    config = configs.EnvelopeServiceConfig()
+    session_info = clients.MockClient().setup_session(config)
+    record = recording.Recorder(sensor_config=config, session_info=session_info).close()
+
+    for codec in ["zstd", "gzip-10", "gzip+delta"]:
+        with pytest.raises(ValueError):
+            recording.save(tmp_path.joinpath("record.h5"), record, codec=codec)
+
+    with pytest.raises(ValueError):
+        recording.save(tmp_path.joinpath("record.npz"), record, codec="lzf")
+
+
+def test_rotating_recorder(tmp_path, monkeypatch):
+    config = configs.EnvelopeServiceConfig()
+
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    directory = tmp_path.joinpath("split")
+    frames = [mocker.get_next() for _ in range(25)]
+
+    with recording.RotatingRecorder(
+        directory,
+        frames_per_file=10,
+        queue_size=1,
+        sensor_config=config,
+        session_info=session_info,
+    ) as recorder:
+        for data_info, data in frames:
+            recorder.sample(data_info, data)
+
+    assert [f.name for f in recorder.filenames] == ["0001.h5", "0002.h5", "0003.h5"]
+    assert recorder.metrics["num_files_written"] == 3
+
+    records = [recording.load(f) for f in recorder.filenames]
+    assert [len(r.data) for r in records] == [10, 10, 5]
+    np.testing.assert_array_equal(
+        np.concatenate([r.data for r in records]), np.array([d for _, d in frames])
+    )
+
+    def failing_save(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(recording, "save", failing_save)
+
+    recorder = recording.RotatingRecorder(
+        tmp_path.joinpath("failing"),
+        seconds_per_file=0,
+        sensor_config=config,
+        session_info=session_info,
+    )
+
+    with pytest.raises(RuntimeError):
+        for data_info, data in frames:
+            recorder.sample(data_info, data)
+
+        recorder.close()
+
+
+def test_journal_recovery(tmp_path):
+    config = configs.IQServiceConfig()
+
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    filename = tmp_path.joinpath("record.journal")
+    frames = [mocker.get_next() for _ in range(10)]
+
+    with recording.JournalRecorder(
+        filename, sensor_config=config, session_info=session_info
+    ) as recorder:
+        for data_info, data in frames:
+            recorder.sample(data_info, data)
+
+    dest = recording.recover(filename)
+    loaded_record = recording.load(dest)
+
+    assert dest == tmp_path.joinpath("record.h5")
+    assert loaded_record.mode == modes.Mode.IQ
+    assert loaded_record.session_info == session_info
+    assert loaded_record.data_info == [info for info, _ in frames]
+    np.testing.assert_array_equal(loaded_record.data, np.array([d for _, d in frames]))
+    assert len(loaded_record.sample_times) == 10
+
+    # A recording cut short in the middle of writing a frame
+    with filename.open("r+b") as f:
+        f.truncate(filename.stat().st_size - 100)
+
+    with pytest.warns(UserWarning, match="truncated"):
+        record = recording.load_journal(filename)
+
+    assert len(record.data) == 9
+    np.testing.assert_array_equal(record.data, np.array([d for _, d in frames[:9]]))
+
+    with pytest.warns(UserWarning, match="truncated"):
+        dest = recording.recover(filename, flush_interval=4)
+
+    loaded_record = recording.load(dest)
+    assert loaded_record.data_info == [info for info, _ in frames[:9]]
+    np.testing.assert_array_equal(loaded_record.data, np.array([d for _, d in frames[:9]]))
+
+
+def test_journal_recovery_keeps_dtype(tmp_path):
+    config = configs.SparseServiceConfig()
+
+    mocker = clients.MockClient(dtype="raw")
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    filename = tmp_path.joinpath("record.journal")
+    frames = [mocker.get_next() for _ in range(5)]
+
+    with recording.JournalRecorder(
+        filename, sensor_config=config, session_info=session_info
+    ) as recorder:
+        for data_info, data in frames:
+            recorder.sample(data_info, data)
+
+    dest = recording.recover(filename, tmp_path.joinpath("recovered.h5"), flush_interval=2)
+
+    with h5py.File(str(dest), "r") as f:
+        assert f["data"].dtype == np.uint16
+        np.testing.assert_array_equal(f["data"][()], np.array([d for _, d in frames]))
+
+    # A recording stopped before the first frame
+    with recording.JournalRecorder(filename, sensor_config=config, session_info=session_info):
+        pass
+
+    assert len(recording.load(recording.recover(filename)).data) == 0
+
+
+def test_concat_split_extract(tmp_path):
+    config = configs.EnvelopeServiceConfig()
+
+    mocker = clients.MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+
+    recorder = recording.Recorder(sensor_config=config, session_info=session_info)
+
+    for _ in range(30):
+        data_info, data = mocker.get_next()
+        recorder.sample(data_info, data)
+
+    record = recorder.close()
+    record.sample_times = 1000.0 + 0.1 * np.arange(30)
+
+    filename = tmp_path.joinpath("record.h5")
+    recording.save(filename, record)
+
+    filenames = recording.split(filename, tmp_path.joinpath("frames"), frames_per_file=12)
+    assert [len(recording.load(f).data) for f in filenames] == [12, 12, 6]
+
+    filenames = recording.split(filename, tmp_path.joinpath("seconds"), seconds_per_file=1.0)
+    assert [len(recording.load(f).data) for f in filenames] == [10, 10, 10]
+
+    concatenated = recording.load(recording.concat(filenames, tmp_path.joinpath("concat.h5")))
+
+    for a in attr.fields(recording.Record):
+        assert np.all(getattr(record, a.name) == getattr(concatenated, a.name))
+
+    dest = recording.extract(filename, tmp_path.joinpath("extract.h5"), 0.45, 1.25)
+    extracted = recording.load(dest)
+    assert extracted.data_info == record.data_info[5:13]
+    np.testing.assert_array_equal(extracted.data, record.data[5:13])
+    np.testing.assert_array_equal(extracted.sample_times, record.sample_times[5:13])
+
+    config.range_interval = [0.3, 0.5]
+    other = recording.Recorder(sensor_config=config, session_info=session_info).close()
+    other_filename = tmp_path.joinpath("other.h5")
+    recording.save(other_filename, other)
+
+    with pytest.raises(ValueError, match="sensor_config_dump"):
+        recording.concat([filename, other_filename], tmp_path.joinpath("bad.h5"))
@@ -0,0 +1,188 @@
+import threading
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import configs, libft4222
+from acconeer.exptool.clients.base import ClientError
+from acconeer.exptool.clients.links import RecvBuffer
+from acconeer.exptool.clients.reg import client as reg_client
+from acconeer.exptool.clients.reg import protocol, regmap
+from acconeer.exptool.clients.reg.client import SPIClient, SPICommProcess, UARTClient
+from acconeer.exptool.modes import Mode
+
+
+class FakeRegLink:
+    """Emulates the register protocol server, answering every request frame it's sent"""
+
+    DEFAULT_TIMEOUT = 2
+
+    def __init__(self, reject_addr=None):
+        self.timeout = self.DEFAULT_TIMEOUT
+        self.regs = {}
+        self.num_sends = 0
+        self._reject_addr = reject_addr
+        self._buf = RecvBuffer()
+
+        status_reg = regmap.get_reg("status")
+        self.regs[status_reg.addr] = status_reg.encode(regmap.STATUS_FLAGS.CREATED)
+
+    def send(self, data):
+        self.num_sends += 1
+
+        while data:
+            packet_len = int.from_bytes(data[1 : 1 + protocol.LEN_FIELD_SIZE], protocol.BO)
+            frame_len = 1 + protocol.LEN_FIELD_SIZE + packet_len + 2
+            packet = protocol.extract_packet_from_frame(data[:frame_len])
+            data = data[frame_len:]
+            self._handle_packet(packet)
+
+    def _handle_packet(self, packet):
+        packet_type, addr = packet[0], packet[1]
+        val = bytes(packet[2:6])
+
+        if packet_type == protocol.REG_WRITE_REQUEST:
+            if addr == self._reject_addr:
+                val = bytes(protocol.REG_SIZE)
+            else:
+                self.regs[addr] = val
+
+            res = protocol.RegWriteResponse(protocol.RegVal(addr, val))
+        else:
+            val = self.regs.get(addr, bytes(protocol.REG_SIZE))
+            res = protocol.RegReadResponse(protocol.RegVal(addr, val))
+
+        self._buf.extend(protocol.insert_packet_into_frame(res))
+
+    def recv(self, num_bytes):
+        return bytearray(self._buf.take(num_bytes))
+
+    def recv_view(self, num_bytes):
+        return self._buf.take(num_bytes)
+
+
+def setup_session(link, **kwargs):
+    client = UARTClient("", **kwargs)
+    client._link = link
+
+    config = configs.EnvelopeServiceConfig()
+    config.range_interval = [0.3, 0.6]
+    return client._setup_session(config)
+
+
+def test_pipelined_setup_session():
+    link = FakeRegLink()
+    info = setup_session(link)
+
+    pipelined_link = FakeRegLink()
+    pipelined_info = setup_session(pipelined_link, pipelined=True)
+
+    assert pipelined_info == info
+    assert pipelined_link.regs == link.regs
+    assert pipelined_link.num_sends < link.num_sends / 3
+
+
+def test_pipelined_write_error():
+    reg = regmap.get_reg("range_start", Mode.ENVELOPE)
+
+    with pytest.raises(ClientError, match=reg.full_name):
+        setup_session(FakeRegLink(reject_addr=reg.addr), pipelined=True)
+
+
+class FakeSPIDevice:
+    """Emulates an FT4222 device connected to a register protocol server in envelope mode"""
+
+    DATA_LENGTH = 100
+
+    def __init__(self):
+        self.regs = {}
+        self._write_addr = None
+        self._read_req = None
+
+        self._set_reg("status", regmap.STATUS_FLAGS(0))
+        self._set_reg("output_buffer_length", 0)
+
+    def __getattr__(self, name):
+        # Device setup, such as open_ex() and set_clock(), is ignored
+        return lambda *args, **kwargs: None
+
+    def spi_master_single_write(self, data):
+        if self._write_addr is not None:
+            self.regs[self._write_addr] = bytes(data)
+            self._handle_write(self._write_addr, bytes(data))
+            self._write_addr = None
+            return
+
+        request, addr = data[0], data[1]
+
+        if request == protocol.REG_WRITE_REQUEST:
+            self._write_addr = addr
+        else:
+            self._read_req = (request, addr)
+
+    def spi_master_single_read(self, size):
+        request, addr = self._read_req
+
+        if request == protocol.BUF_READ_REQUEST:
+            return bytearray(np.arange(size // 2, dtype="<u2").tobytes())
+
+        return bytearray(self.regs.get(addr, bytes(protocol.REG_SIZE)))
+
+    def _set_reg(self, name, val, mode=None):
+        reg = regmap.get_reg(name, mode)
+        self.regs[reg.addr] = reg.encode(val)
+
+    def _handle_write(self, addr, enc_val):
+        main_control = regmap.get_reg("main_control")
+
+        if addr != main_control.addr:
+            return
+
+        flags = regmap.STATUS_FLAGS
+        buffer_size = self.DATA_LENGTH * 2
+
+        if enc_val == main_control.encode("create"):
+            self._set_reg("status", flags.CREATED)
+            self._set_reg("env_data_length", self.DATA_LENGTH, Mode.ENVELOPE)
+            self._set_reg("output_buffer_length", buffer_size)
+        elif enc_val == main_control.encode("activate"):
+            self._set_reg("status", flags.CREATED | flags.ACTIVATED | flags.DATA_READY)
+        elif enc_val == main_control.encode("stop"):
+            self._set_reg("status", flags(0))
+
+
+class ThreadedSPICommProcess(SPICommProcess):
+    """Runs the communication loop in a thread, so that it can use the fake device"""
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+
+def test_spi_client_frame_buffers(monkeypatch):
+    monkeypatch.setattr(libft4222, "Device", FakeSPIDevice)
+    monkeypatch.setattr(reg_client, "SPICommProcess", ThreadedSPICommProcess)
+
+    client = SPIClient(num_frame_buffers=2)
+
+    config = configs.EnvelopeServiceConfig()
+    config.range_interval = [0.3, 0.6]
+    config.update_rate = 100
+    session_info = client.setup_session(config)
+
+    assert session_info["data_length"] == FakeSPIDevice.DATA_LENGTH
+
+    client.start_session()
+    _, first = client.get_next()
+    _, second = client.get_next()
+    client.release_frame(first)
+    _, third = client.get_next()
+    client.stop_session()
+    client.disconnect()
+
+    assert third is first
+    assert second is not first
+    np.testing.assert_array_equal(second, np.arange(FakeSPIDevice.DATA_LENGTH))
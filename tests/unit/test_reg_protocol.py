@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 import acconeer.exptool.clients.reg.protocol as ptcl
 from acconeer.exptool.clients.reg import regmap
 from acconeer.exptool.modes import Mode
@@ -56,6 +59,11 @@ def test_unpack_stream_data_segment():
     unpacked = ptcl.unpack_stream_data_segment(pkd_stream_data_segment)
     assert unpacked == unp_stream_data
 
+    unpacked = ptcl.unpack_stream_data_segment(pkd_stream_data_segment, True)
+    assert unpacked.buffer == buffer
+    assert unpacked.result_info["addr"].tolist() == [rv_addr]
+    assert unpacked.result_info["val"].tolist() == [int.from_bytes(rv_enc_val, ptcl.BO)]
+
 
 def test_pack_packet():
     packed = ptcl.pack_packet(unp_reg_write_req)
@@ -70,3 +78,34 @@ def test_extract_packet_from_frame():
 def test_insert_packet_into_frame():
     frame = ptcl.insert_packet_into_frame(unp_reg_write_req)
     assert frame == pkd_reg_write_req_frame
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32", "raw"])
+@pytest.mark.parametrize("mode", Mode)
+def test_decode_output_buffer_into_out(mode, dtype):
+    buffer = np.arange(40, dtype="<u2").tobytes()
+
+    data = ptcl.decode_output_buffer(buffer, mode, sweeps_per_frame=4, dtype=dtype)
+    out = np.zeros_like(data)
+    ret = ptcl.decode_output_buffer(buffer, mode, sweeps_per_frame=4, out=out, dtype=dtype)
+
+    assert ret is out
+    assert np.all(out == data)
+
+
+def test_decode_output_buffer_iq():
+    buffer = np.array([1, -2, 3, 4], dtype="<i2").tobytes()
+    data = ptcl.decode_output_buffer(buffer, Mode.IQ)
+
+    assert data.dtype == complex
+    assert np.all(data == [1 - 2j, 3 + 4j])
+
+    data = ptcl.decode_output_buffer(buffer, Mode.IQ, dtype="float32")
+
+    assert data.dtype == np.complex64
+    assert np.all(data == [1 - 2j, 3 + 4j])
+
+    data = ptcl.decode_output_buffer(buffer, Mode.IQ, dtype="raw")
+
+    assert data.dtype == np.int16
+    assert np.all(data == [[1, -2], [3, 4]])
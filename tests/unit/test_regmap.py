@@ -1,9 +1,11 @@
 import inspect
 
+import numpy as np
 import pytest
 
 import acconeer.exptool.structs.configbase as cb
 from acconeer.exptool import configs
+from acconeer.exptool.clients.reg import protocol as ptcl
 from acconeer.exptool.clients.reg import regmap
 from acconeer.exptool.modes import Mode
 
@@ -48,6 +50,77 @@ def test_get_reg():
     assert regmap.get_reg(reg.addr, reg.modes[0]) == reg
 
 
+@pytest.mark.parametrize("mode", [None, *Mode])
+def test_get_reg_index_matches_linear_search(mode):
+    def linear_search(value):
+        matches = []
+        for reg in regmap.REGISTERS:
+            if value not in (reg.addr, reg.full_name, reg.stripped_name):
+                continue
+
+            if mode is None or reg.modes is None or mode in reg.modes:
+                matches.append(reg)
+
+        return matches
+
+    values = set()
+    for reg in regmap.REGISTERS:
+        values.update([reg.addr, reg.full_name, reg.stripped_name])
+
+    for value in values:
+        matches = linear_search(value)
+
+        if len(matches) == 1:
+            assert regmap.get_reg(value, mode) == matches[0]
+        else:
+            with pytest.raises(ValueError):
+                regmap.get_reg(value, mode)
+
+
+@pytest.mark.parametrize("mode", Mode)
+def test_data_info_decoders(mode):
+    decoders = regmap.get_data_info_decoders(mode)
+
+    for reg in regmap.get_data_info_regs(mode):
+        k, decoder_reg = decoders[reg.addr]
+        assert decoder_reg == reg
+        assert k == regmap.STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+
+
+@pytest.mark.parametrize("mode", Mode)
+def test_result_info_decoder(mode):
+    test_vals = {
+        regmap.DataType.BOOL: [True, False],
+        regmap.DataType.UINT16: [0, 1234],
+        regmap.DataType.UINT32: [0, 123456],
+        regmap.DataType.INT32: [-12, 34],
+    }
+
+    for i in range(2):
+        packed = bytearray()
+        expected = {}
+
+        for reg in regmap.get_data_info_regs(mode):
+            val = test_vals[reg.data_type][i]
+            enc_val = reg.encode(val)
+            packed.append(reg.addr)
+            packed.extend(enc_val)
+
+            k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+            if k is not None:
+                expected[k] = reg.decode(enc_val)
+
+        packed.append(255)  # unknown
+        packed.extend(b"\x01\x00\x00\x00")
+
+        records = np.frombuffer(packed, dtype=ptcl.RESULT_INFO_DTYPE)
+        info, unknown = regmap.get_result_info_decoder(mode).decode(records)
+
+        assert info == expected
+        assert [type(v) for v in info.values()] == [type(v) for v in expected.values()]
+        assert unknown["addr"].tolist() == [255]
+
+
 def test_config_to_reg_map_completeness():
     all_param_keys = set()
 
@@ -26,7 +26,14 @@ def is_test(member_name, modules):
 
 @pytest.mark.parametrize(
     "client_type",
-    ["UARTClient", "SPIClient", "SocketClient", "PollingUARTClient", "MockClient"],
+    [
+        "UARTClient",
+        "SPIClient",
+        "SocketClient",
+        "AsyncSocketClient",
+        "PollingUARTClient",
+        "MockClient",
+    ],
 )
 def test_top_module_clients(client_type):
     assert pet.clients == clients
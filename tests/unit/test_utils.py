@@ -1,5 +1,6 @@
 import sys
 
+import numpy as np
 import pytest
 import serial
 from serial.tools.list_ports_common import ListPortInfo
@@ -80,3 +81,47 @@ def test_port_tagging_finds_all_acconeer_devices(mock_comports, pyserial_version
     tagged_ports = utils.tag_serial_ports(mock_comports)
     only_acconeer = _only_acconeer_devices(tagged_ports)
     assert len(only_acconeer) == expected
+
+
+@pytest.mark.parametrize("size", [1, 2, 7])
+def test_ring_buffer(size):
+    rng = np.random.default_rng(0)
+    expected = np.full((size, 3), np.nan)
+    buffer = utils.RingBuffer(size, (3,), fill_value=np.nan)
+
+    for _ in range(20):
+        items = rng.standard_normal((rng.integers(0, 2 * size + 1), 3))
+
+        if len(items) == 1:
+            buffer.append(items[0])
+        else:
+            buffer.extend(items)
+
+        for item in items:
+            expected = np.roll(expected, -1, axis=0)
+            expected[-1] = item
+
+        np.testing.assert_array_equal(buffer.view(), expected)
+        np.testing.assert_array_equal(buffer[-1], expected[-1])
+
+    copy = buffer.copy()
+    buffer.append(np.zeros(3))
+    np.testing.assert_array_equal(copy, expected)
+
+    with pytest.raises(ValueError):
+        buffer.view()[0] = 1
+
+
+def test_exp_smooth():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((50, 4))
+    sfs = np.minimum(0.9, 1.0 - 1.0 / (1.0 + np.arange(50)))
+    y0 = rng.standard_normal(4)
+
+    expected = []
+    y = y0
+    for sf, xi in zip(sfs, x):
+        y = sf * y + (1.0 - sf) * xi
+        expected.append(y)
+
+    np.testing.assert_array_equal(utils.exp_smooth(x, sfs, y0), expected)
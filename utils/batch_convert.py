@@ -0,0 +1,321 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+import acconeer.exptool as et
+
+from convert_to_csv import check_sensor_index, get_sweep_metadata_rows
+
+
+DESCRIPTION = """This is a command line utility for converting many
+.h5/.npz files at once, in parallel. Files can be resaved
+as .h5/.npz (e.g. with another codec), or converted to .csv
+or, if pyarrow is installed, to .parquet.
+
+example usage:
+  python3 batch_convert.py -t csv -o ~/csv_files "~/recordings/**/*.h5"
+"""
+
+FORMATS = ["h5", "npz", "csv", "parquet"]
+CSV_DELIMITERS = {"c": ",", "t": "\t"}
+
+
+def convert_file(
+    input_file,
+    output_file,
+    codec=et.recording.DEFAULT_CODEC,
+    sensor_index=0,
+    add_sweep_metadata=False,
+    delimiter=",",
+):
+    """
+    Converts a record file to the format given by the extension of the output file, reading
+    the data a chunk at a time. Returns the number of frames converted.
+    """
+
+    input_file = str(input_file)
+    output_file = str(output_file)
+    ext = output_file.rsplit(".", 1)[-1].lower()
+
+    record = et.recording.open(input_file)
+
+    try:
+        if ext in ["h5", "npz"]:
+            et.recording.save(output_file, record, codec=codec)
+        elif ext == "csv":
+            write_csv(output_file, record, sensor_index, add_sweep_metadata, delimiter)
+        elif ext == "parquet":
+            write_parquet(output_file, record, sensor_index)
+        else:
+            raise ValueError("Unknown output format '.{}'".format(ext))
+    finally:
+        if isinstance(record.data, et.recording.LazyRecordData):
+            record.data.close()
+
+    return len(record.data)
+
+
+def write_csv(output_file, record, sensor_index=0, add_sweep_metadata=False, delimiter=","):
+    """Writes sweeps as rows, like convert_to_csv.py, but with all cells formatted at once"""
+
+    check_sensor_index(record, sensor_index)
+
+    with open(output_file, "w") as f:
+        if add_sweep_metadata:
+            for row in get_sweep_metadata_rows(record):
+                f.write(delimiter.join(str(v) for v in row) + "\n")
+
+        for chunk in _iter_data_chunks(record):
+            f.write(format_csv_rows(chunk[:, sensor_index], delimiter))
+
+
+def format_csv_rows(frames, delimiter=","):
+    """
+    Formats frames as csv rows, flattening each frame into one row. Numbers are formatted so
+    that they're read back exactly.
+    """
+
+    frames = np.asarray(frames)
+    rows = frames.reshape(len(frames), -1)
+
+    if rows.size == 0:
+        return "\n" * len(rows)
+
+    num_cols = rows.shape[1]
+
+    if np.iscomplexobj(rows):
+        fmt = delimiter.join(["%.17g%+.17gj"] * num_cols)
+        rows = np.ascontiguousarray(rows).view(rows.real.dtype)  # Real and imag interleaved
+    elif np.all(rows == np.round(rows)):
+        fmt = delimiter.join(["%d"] * num_cols)
+        rows = rows.astype("i8")
+    else:
+        fmt = delimiter.join(["%.17g"] * num_cols)
+
+    return "".join(fmt % tuple(row) + "\n" for row in rows.tolist())
+
+
+def write_parquet(output_file, record, sensor_index=0):
+    """
+    Writes one table row per frame, with the sample time and the flattened frame of the given
+    sensor. Complex data is stored as separate real and imaginary columns.
+    """
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("pyarrow is needed for parquet output") from e
+
+    check_sensor_index(record, sensor_index)
+
+    writer = None
+    start = 0
+
+    try:
+        for chunk in _iter_data_chunks(record):
+            frames = chunk[:, sensor_index].reshape(len(chunk), -1)
+            n = frames.shape[1]
+
+            columns = {}
+
+            if record.sample_times is not None:
+                columns["sample_time"] = pa.array(record.sample_times[start : start + len(chunk)])
+
+            if np.iscomplexobj(frames):
+                parts = {"data_real": frames.real, "data_imag": frames.imag}
+            else:
+                parts = {"data": frames}
+
+            for name, values in parts.items():
+                flat = pa.array(np.ascontiguousarray(values).ravel())
+                columns[name] = pa.FixedSizeListArray.from_arrays(flat, n)
+
+            table = pa.table(columns)
+
+            if writer is None:
+                writer = pq.ParquetWriter(output_file, table.schema)
+
+            writer.write_table(table)
+            start += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    _add_arguments(parser)
+    args = parser.parse_args()
+
+    input_files = _expand_patterns(args.patterns)
+
+    if not input_files:
+        print("No input files found.")
+        exit(1)
+
+    jobs = []
+    for input_file in input_files:
+        output_dir = Path(args.output_dir) if args.output_dir else input_file.parent
+        output_file = output_dir.joinpath(input_file.stem + "." + args.to)
+
+        if output_file.resolve() == input_file.resolve():
+            print(f'Skipping "{input_file}", it would be overwritten by its own output.')
+        elif output_file.exists() and not args.force:
+            print(
+                f'Skipping "{input_file}", "{output_file}" already exists (overwrite with "-f").'
+            )
+        else:
+            jobs.append((input_file, output_file))
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    kwargs = dict(
+        codec=args.codec,
+        sensor_index=args.index,
+        add_sweep_metadata=args.add_sweep_metadata,
+        delimiter=CSV_DELIMITERS[args.delimiter],
+    )
+
+    num_frames = 0
+    num_bytes = 0
+    num_failed = 0
+    t0 = time.time()
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(convert_file, input_file, output_file, **kwargs): input_file
+            for input_file, output_file in jobs
+        }
+
+        for future in as_completed(futures):
+            input_file = futures[future]
+
+            try:
+                n = future.result()
+            except Exception as e:
+                num_failed += 1
+                print(f'Failed to convert "{input_file}": {e}')
+                continue
+
+            num_frames += n
+            num_bytes += input_file.stat().st_size
+
+            if args.verbose:
+                print(f'Converted "{input_file}" ({n} frames)')
+
+    duration = max(time.time() - t0, 1e-9)
+
+    print(
+        f"Converted {len(jobs) - num_failed} file(s), {num_frames} frames, "
+        f"{num_bytes / 1e6:.1f} MB in {duration:.1f} s "
+        f"({num_bytes / 1e6 / duration:.1f} MB/s, {num_frames / duration:.0f} frames/s)"
+    )
+
+    if num_failed:
+        exit(1)
+
+
+def _iter_data_chunks(record, max_frames=1000):
+    if isinstance(record.data, et.recording.LazyRecordData):
+        yield from record.data.iter_chunks()
+    else:
+        for start in range(0, len(record.data), max_frames):
+            yield np.asarray(record.data[start : start + max_frames])
+
+
+def _expand_patterns(patterns):
+    files = []
+
+    for pattern in patterns:
+        for filename in sorted(glob.glob(os.path.expanduser(pattern), recursive=True)):
+            path = Path(filename)
+
+            if path.suffix.lower() in [".h5", ".npz"] and path not in files:
+                files.append(path)
+
+    return files
+
+
+def _add_arguments(parser):
+    parser.add_argument(
+        "patterns",
+        nargs="+",
+        help='Input files or glob patterns (quoted), e.g. "data/**/*.h5".',
+    )
+    parser.add_argument(
+        "-t",
+        "--to",
+        choices=FORMATS,
+        default="csv",
+        help="The output format (default=csv).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        dest="output_dir",
+        default=None,
+        help="Directory for the output files. Defaults to the directory of each input file.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default=number of CPUs).",
+    )
+    parser.add_argument(
+        "-c",
+        "--codec",
+        default=et.recording.DEFAULT_CODEC,
+        help="Codec for .h5/.npz output, e.g. none, gzip-1 or lzf+shuffle (default=gzip).",
+    )
+    parser.add_argument(
+        "-d",
+        "--delimiter",
+        choices=list(CSV_DELIMITERS.keys()),
+        default="c",
+        help="Delimiter for csv output. Default is comma. 't' is for tab, 'c' for comma",
+    )
+    parser.add_argument(
+        "--index",
+        metavar="index",
+        dest="index",
+        type=int,
+        default=0,
+        help="The sensor index for csv/parquet output (default=0).",
+    )
+    parser.add_argument(
+        "-m",
+        "--add_sweep_metadata",
+        action="store_true",
+        default=False,
+        help="Adds depth and sweep number info to csv files",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        default=False,
+        help="Forcefully overwrite output files that already exist.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help="Prints each converted file.",
+    )
+
+
+if __name__ == "__main__":
+    main()
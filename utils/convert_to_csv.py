@@ -44,37 +44,44 @@ def record_to_csv(
     for k, v in config_dump.items():
         print(f"{k:30} {v} ")
 
-    num_sensors = record.data.shape[1]
-    if sensor_index >= num_sensors:
-        raise ValueError(
-            f"Invalid sensor index specified (index={sensor_index}). "
-            f"Valid indices for this input file is one of {list(range(num_sensors))}"
-        )
+    check_sensor_index(record, sensor_index)
+
+    dest = np.array(list(iter_csv_rows(record, sensor_index, add_sweep_metadata)))
+    if sweep_as_column:
+        dest = dest.T
+    return dest
+
+
+def iter_csv_rows(
+    record: et.recording.Record,
+    sensor_index: int = 0,
+    add_sweep_metadata: bool = False,
+):
+    """Yields the csv rows with sweeps as rows, reading the record data a frame at a time"""
+
+    if add_sweep_metadata:
+        yield from get_sweep_metadata_rows(record)
 
-    # actual translation
-    data = record.data[:, sensor_index, :]
-    dest_rows = []
+    for x in record.data:
+        row = np.ndarray.flatten(x[sensor_index])
+        yield [format_cell_value(v) for v in row]
 
+
+def get_sweep_metadata_rows(record: et.recording.Record) -> list:
+    """Returns the sweep number (sparse only) and depth rows describing the csv columns"""
+
+    rows = []
     depths = et.utils.get_range_depths(record.sensor_config, record.session_info)
 
-    if record.mode == et.Mode.SPARSE and add_sweep_metadata:
+    if record.mode == et.Mode.SPARSE:
         depths = np.tile(depths, record.sensor_config.sweeps_per_frame)
         sweep_number = np.floor(
             np.linspace(0, record.sensor_config.sweeps_per_frame, num=len(depths), endpoint=False)
         )
-        dest_rows.append(sweep_number.astype(int))
+        rows.append(sweep_number.astype(int))
 
-    if add_sweep_metadata:
-        dest_rows.append(np.round(depths, decimals=6))
-
-    for x in data:
-        row = np.ndarray.flatten(x)
-        dest_rows.append([format_cell_value(v) for v in row])
-
-    dest = np.array(dest_rows)
-    if sweep_as_column:
-        dest = dest.T
-    return dest
+    rows.append(np.round(depths, decimals=6))
+    return rows
 
 
 def main():
@@ -103,7 +110,7 @@ def main():
     _check_files(input_file, output_file, force)
 
     print(f'Reading from "{input_file}" ... \n')
-    record = et.recording.load(input_file)
+    record = et.recording.open(input_file)
 
     if verbose:
         print("=== Session info " + "=" * 43)
@@ -112,13 +119,23 @@ def main():
         print()
 
     try:
-        csv_table = record_to_csv(
-            record,
-            sensor_index=sensor_index,
-            sweep_as_column=sweep_as_column,
-            add_sweep_metadata=add_sweep_metadata,
-        )
-        print(f"Writing data with dimensions {csv_table.shape} to {output_file} ...")
+        if sweep_as_column:
+            csv_table = record_to_csv(
+                record,
+                sensor_index=sensor_index,
+                sweep_as_column=sweep_as_column,
+                add_sweep_metadata=add_sweep_metadata,
+            )
+            print(f"Writing data with dimensions {csv_table.shape} to {output_file} ...")
+        else:
+            # Sweeps as rows can be written as they're read, without holding all data in memory
+            check_sensor_index(record, sensor_index)
+            csv_table = iter_csv_rows(
+                record,
+                sensor_index=sensor_index,
+                add_sweep_metadata=add_sweep_metadata,
+            )
+            print(f"Writing data to {output_file} ...")
 
         with open(output_file, "w") as f:
             writer = csv.writer(f, delimiter=delimiter)
@@ -131,6 +148,15 @@ def main():
         exit(1)
 
 
+def check_sensor_index(record, sensor_index):
+    num_sensors = record.data.shape[1]
+    if sensor_index >= num_sensors:
+        raise ValueError(
+            f"Invalid sensor index specified (index={sensor_index}). "
+            f"Valid indices for this input file is one of {list(range(num_sensors))}"
+        )
+
+
 def _check_files(input_file, output_file, force):
     if not os.path.exists(input_file):
         print(f'The input file ("{input_file}") can not be found.')
@@ -32,8 +32,18 @@ if ndims(data) == 3  % Not sparse
     ylabel("Depth")
 end
 
-data_info = jsondecode(string(h5read(filename, "/data_info")));
-first_data_info = data_info(1, 1)  % (frame, sensor)
+if any(strcmp({info.Datasets.Name}, "data_info_keys"))
+    % Columnar data info, one (frame, sensor) array per key
+    data_info_keys = jsondecode(string(h5read(filename, "/data_info_keys")));
+    for i = 1:numel(data_info_keys)
+        key = data_info_keys{i};
+        data_info.(key) = h5read(filename, "/data_info/" + key);
+    end
+    first_data_info = structfun(@(v) v(1, 1), data_info, "UniformOutput", false)
+else
+    data_info = jsondecode(string(h5read(filename, "/data_info")));
+    first_data_info = data_info(1, 1)  % (frame, sensor)
+end
 
 rss_version = string(h5read(filename, "/rss_version"))
 lib_version = string(h5read(filename, "/lib_version"))